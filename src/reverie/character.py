@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
-import random
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import List, Optional
 
+from .combat import roll_d20
+
 
 class PlayerClass(Enum):
     """Available player classes."""
@@ -194,11 +195,6 @@ def create_character(
     )
 
 
-def roll_d20() -> int:
-    """Roll a d20."""
-    return random.randint(1, 20)
-
-
 def roll_check(character: Character, stat: str) -> tuple[int, str]:
     """Roll a stat check and return (roll, result_description)."""
     roll = roll_d20()
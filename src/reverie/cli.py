@@ -7,6 +7,7 @@ from typing import Optional
 
 import typer
 
+from . import jsonutil
 from .config import load_config, get_config_path, ReverieConfig
 from .character import Character, Stats, Equipment, PlayerClass
 from .storage.database import Database
@@ -170,6 +171,9 @@ def list_saves() -> None:
 def export_save(
     save: str,
     output: str = typer.Option(None, "--output", "-o", help="Output file path"),
+    compact: bool = typer.Option(
+        False, "--compact", help="Write compact JSON, streamed row by row (faster for large saves)"
+    ),
 ) -> None:
     """Export a campaign to JSON."""
     db = get_database()
@@ -186,9 +190,6 @@ def export_save(
         typer.echo(f"Campaign not found: {save}")
         raise typer.Exit(code=1)
     
-    # Export data
-    data = db.export_campaign(campaign.id)
-    
     # Determine output path
     if output:
         out_path = Path(output)
@@ -196,9 +197,13 @@ def export_save(
         safe_name = campaign.name.replace(" ", "_").lower()
         out_path = Path(f"{safe_name}.json")
     
-    # Write file
-    with open(out_path, "w") as f:
-        json.dump(data, f, indent=2, default=str)
+    with open(out_path, "w", encoding="utf-8") as f:
+        if compact:
+            # Stream the export straight to the file
+            db.export_campaign_stream(campaign.id, f)
+        else:
+            # Indented for people reading or editing their saves
+            json.dump(db.export_campaign(campaign.id), f, indent=2, default=str)
     
     typer.echo(f"Exported campaign to: {out_path}")
 
@@ -213,8 +218,7 @@ def import_save(
         raise typer.Exit(code=1)
     
     # Read file
-    with open(file) as f:
-        data = json.load(f)
+    data = jsonutil.loads(file.read_bytes())
     
     # Import to database
     db = get_database()
@@ -178,9 +178,18 @@ def start_combat(
     return state
 
 
+# Dice are drawn in batches: one random.choices call fills the pool,
+# which is much cheaper than a random.randint call per roll.
+_D20_FACES = range(1, 21)
+_D20_POOL_SIZE = 4096
+_d20_pool: list[int] = []
+
+
 def roll_d20() -> int:
     """Roll a d20."""
-    return random.randint(1, 20)
+    if not _d20_pool:
+        _d20_pool.extend(random.choices(_D20_FACES, k=_D20_POOL_SIZE))
+    return _d20_pool.pop()
 
 
 def player_action(
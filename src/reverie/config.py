@@ -38,6 +38,7 @@ class LLMConfig:
     endpoint: str = "http://localhost:11434"
     timeout: int = 30
     api_key: Optional[str] = None
+    cache: bool = False  # Reuse responses to repeated deterministic prompts
 
 
 @dataclass
@@ -116,6 +117,7 @@ class ReverieConfig:
                 endpoint=llm_data.get("endpoint", "http://localhost:11434"),
                 timeout=llm_data.get("timeout", 30),
                 api_key=llm_data.get("api_key"),
+                cache=llm_data.get("cache", False),
             ),
             audio=AudioConfig(
                 enabled=audio_data.get("enabled", False),
@@ -166,6 +168,7 @@ class ReverieConfig:
                 "model": self.llm.model,
                 "endpoint": self.llm.endpoint,
                 "timeout": self.llm.timeout,
+                "cache": self.llm.cache,
             },
             "audio": {
                 "enabled": self.audio.enabled,
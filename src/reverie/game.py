@@ -13,7 +13,7 @@ from .character import Character, Stats, Equipment, PlayerClass, DangerLevel as
 from .world import Location, WorldElement, ElementType
 from .npc import NPC, NPCMemory, Disposition
 from .quest import Quest, QuestStatus
-from .combat import CombatState, CombatStatus
+from .combat import CombatState, CombatStatus, roll_d20
 from .storage.database import Database
 from .storage.models import (
     Campaign,
@@ -124,7 +124,7 @@ class GameState:
         """Check if player has an active quest."""
         return (
             self.active_quest is not None
-            and self.active_quest.status == QuestStatus.ACTIVE
+            and self.active_quest.status is QuestStatus.ACTIVE
         )
     
     def get_recent_history(self, count: int = 10) -> list[HistoryEntry]:
@@ -583,6 +583,10 @@ class Game:
         pass
 
 
+# Prefix stripped from "talk to <name>" / "speak to <name>"
+_TALK_PREFIX = re.compile(r"^(talk|speak) to ")
+
+
 def process_input(game: Game, user_input: str) -> str:
     """Process player input and return response.
     
@@ -624,7 +628,7 @@ def process_input(game: Game, user_input: str) -> str:
     
     # Check for talking to NPCs
     if lower_input.startswith("talk to ") or lower_input.startswith("speak to "):
-        npc_name = re.sub(r"^(talk|speak) to ", "", lower_input)
+        npc_name = _TALK_PREFIX.sub("", lower_input)
         return handle_dialogue_start(game, npc_name)
     
     # Default: treat as a free-form action
@@ -808,15 +812,16 @@ def handle_combat_action(game: Game, action: str) -> str:
         
         # Record NPC deaths to persistent world state
         if game.world_state and game.state.location:
-            for enemy in combat.enemies:
-                if enemy.is_defeated():
-                    death = NPCDeath.create(
-                        npc_name=enemy.name,
-                        location=game.state.location.name,
-                        cause="Defeated in combat by the player",
-                        campaign_id=game.state.campaign.id,
-                    )
-                    game.world_state.record_npc_death(death)
+            with game.world_state.transaction():
+                for enemy in combat.enemies:
+                    if enemy.is_defeated():
+                        death = NPCDeath.create(
+                            npc_name=enemy.name,
+                            location=game.state.location.name,
+                            cause="Defeated in combat by the player",
+                            campaign_id=game.state.campaign.id,
+                        )
+                        game.world_state.record_npc_death(death)
         
         game.state.combat_state = None
     elif combat.player_defeated():
@@ -885,7 +890,11 @@ def _cmd_look(game: Game) -> str:
     if game.state.location is None:
         return "You are nowhere in particular. This is concerning."
     
-    loc = game.state.location
+    return _format_location(game.state.location, game.state.npcs_present)
+
+
+def _format_location(loc: Location, npcs: list[NPC]) -> str:
+    """Describe a location and the NPCs in it."""
     parts = [f"**{loc.name}**", loc.description]
     
     # Exits
@@ -894,8 +903,8 @@ def _cmd_look(game: Game) -> str:
         parts.append(f"Exits: {exits_str}")
     
     # NPCs
-    if game.state.npcs_present:
-        npc_names = [npc.name for npc in game.state.npcs_present]
+    if npcs:
+        npc_names = [npc.name for npc in npcs]
         parts.append(f"You see: {', '.join(npc_names)}")
     
     # Revealed secrets
@@ -966,9 +975,7 @@ def _cmd_quests(game: Game) -> str:
     return "\n".join(parts)
 
 
-def _cmd_help() -> str:
-    """Show help text."""
-    return """**Commands**
+_HELP_TEXT = """**Commands**
 look - Examine your surroundings
 go <direction> - Move in a direction (north, south, east, west, etc.)
 inventory - Check your belongings
@@ -985,6 +992,11 @@ quit - Leave the game
 You can also type actions naturally, like "search the room" or "pick up the sword"."""
 
 
+def _cmd_help() -> str:
+    """Show help text."""
+    return _HELP_TEXT
+
+
 def _cmd_save(game: Game) -> str:
     """Save the game."""
     try:
@@ -1004,10 +1016,9 @@ def _cmd_roll(game: Game, stat: Optional[str] = None) -> str:
     Returns:
         Roll result description
     """
-    import random
     from .config import load_config
     
-    roll = random.randint(1, 20)
+    roll = roll_d20()
     config = load_config()
     verbose = config.gameplay.verbose_rolls
     
@@ -1040,8 +1051,9 @@ def _cmd_map(game: Game) -> str:
     
     # Load location names from database
     if game.db:
+        loc_records = game.db.load_world_elements(game.state.discovered_locations)
         for loc_id in game.state.discovered_locations:
-            loc_record = game.db.load_world_element(loc_id)
+            loc_record = loc_records.get(loc_id)
             if loc_record:
                 name = loc_record.name
                 # Mark current location
@@ -1066,11 +1078,8 @@ def _cmd_npcs(game: Game) -> str:
     
     # Load NPC data from database
     if game.db:
-        npc_records = game.db.list_npcs(game.state.campaign.id)
-        for record in npc_records:
-            npc = NPC.from_dict(record.data)
-            disposition_str = npc.disposition.value.capitalize()
-            parts.append(f"  - {npc.name} ({npc.occupation}): {disposition_str}")
+        for name, occupation, disposition in game.db.list_npc_summaries(game.state.campaign.id):
+            parts.append(f"  - {name} ({occupation}): {disposition.capitalize()}")
     else:
         parts.append(f"  {len(game.state.known_npcs)} NPCs known")
     
@@ -1110,7 +1119,8 @@ def handle_movement(game: Game, direction: str) -> str:
             
             # Update NPCs present
             npc_records = game.db.list_npcs(game.state.campaign.id, location_id=dest_id)
-            game.state.npcs_present = [NPC.from_dict(r.data) for r in npc_records]
+            npcs = [NPC.from_dict(r.data) for r in npc_records]
+            game.state.npcs_present = npcs
             
             add_to_history(
                 game.state,
@@ -1119,7 +1129,7 @@ def handle_movement(game: Game, direction: str) -> str:
                 {"from": old_location.id, "to": new_location.id},
             )
             
-            return f"You travel {direction}.\n\n" + _cmd_look(game)
+            return f"You travel {direction}.\n\n" + _format_location(new_location, npcs)
     
     return f"You travel {direction} into the unknown..."
 
@@ -1128,8 +1138,9 @@ def handle_dialogue_start(game: Game, npc_name: str) -> str:
     """Start dialogue with an NPC."""
     npc_name_lower = npc_name.lower()
     
+    # A substring test also covers the exact-name case
     for npc in game.state.npcs_present:
-        if npc.name.lower() == npc_name_lower or npc_name_lower in npc.name.lower():
+        if npc_name_lower in npc.name.lower():
             # Found the NPC - set up dialogue mode
             return f'{npc.name} turns to face you. "{_get_npc_greeting(npc)}"'
     
@@ -1154,7 +1165,6 @@ def _get_npc_greeting(npc: NPC) -> str:
 
 def _combat_attack(game: Game) -> str:
     """Player attacks."""
-    import random
     combat = game.state.combat_state
     if not combat:
         return "Not in combat."
@@ -1164,7 +1174,7 @@ def _combat_attack(game: Game) -> str:
         return "No enemies to attack."
     
     target = enemies[0]  # Attack first enemy
-    roll = random.randint(1, 20) + game.state.character.stats.might - 3
+    roll = roll_d20() + game.state.character.stats.might - 3
     
     if roll >= 10:
         target.take_damage(1)
@@ -1207,12 +1217,11 @@ def _combat_defend(game: Game) -> str:
 
 def _combat_retreat(game: Game) -> str:
     """Player attempts to retreat."""
-    import random
     combat = game.state.combat_state
     if not combat:
         return "Not in combat."
     
-    roll = random.randint(1, 20) + game.state.character.stats.spirit - 3
+    roll = roll_d20() + game.state.character.stats.spirit - 3
     
     if roll >= combat.retreat_difficulty:
         combat.status = CombatStatus.RETREAT
@@ -1243,7 +1252,6 @@ def _combat_generic_action(game: Game, action: str) -> str:
 
 def _enemy_turn(game: Game) -> str:
     """Process enemy turn."""
-    import random
     combat = game.state.combat_state
     if not combat:
         return ""
@@ -1254,7 +1262,7 @@ def _enemy_turn(game: Game) -> str:
     
     results = []
     for enemy in enemies:
-        roll = random.randint(1, 20)
+        roll = roll_d20()
         if roll >= 8:
             combat.player_take_damage(enemy.damage)
             results.append(f"{enemy.name} hits you! (Now: {combat.player_danger.name})")
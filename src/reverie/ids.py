@@ -0,0 +1,16 @@
+"""Record ID generation for Reverie."""
+
+import os
+
+
+def new_id() -> str:
+    """Generate a random UUID4 string without building a UUID object.
+
+    Produces the same format as str(uuid.uuid4()), so stored IDs stay
+    interchangeable with ones written by older versions.
+    """
+    raw = bytearray(os.urandom(16))
+    raw[6] = (raw[6] & 0x0F) | 0x40  # version 4
+    raw[8] = (raw[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = raw.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
@@ -70,29 +70,28 @@ class Item:
     
     def to_dict(self) -> dict:
         """Serialize to dictionary."""
-        data = {
+        effect = self.effect
+        return {
             "id": self.id,
             "name": self.name,
             "description": self.description,
             "item_type": self.item_type.value,
             "value": self.value,
             "equip_stat_bonus": self.equip_stat_bonus,
+            "effect": {
+                "stat": effect.stat,
+                "amount": effect.amount,
+                "duration": effect.duration,
+                "description": effect.description,
+            } if effect is not None else None,
         }
-        if self.effect:
-            data["effect"] = {
-                "stat": self.effect.stat,
-                "amount": self.effect.amount,
-                "duration": self.effect.duration,
-                "description": self.effect.description,
-            }
-        return data
     
     @classmethod
     def from_dict(cls, data: dict) -> "Item":
         """Deserialize from dictionary."""
         effect = None
-        if "effect" in data:
-            e = data["effect"]
+        e = data.get("effect")
+        if e is not None:
             effect = ItemEffect(
                 stat=e["stat"],
                 amount=e["amount"],
@@ -254,9 +253,12 @@ class Inventory:
     
     def to_dict(self) -> dict:
         """Serialize to dictionary."""
-        equipped_data = {}
-        for slot, item in self.equipped.items():
-            equipped_data[slot.value] = item.to_dict() if item else None
+        # Only occupied slots are written; from_dict fills in the rest
+        equipped_data = {
+            slot.value: item.to_dict()
+            for slot, item in self.equipped.items()
+            if item is not None
+        }
         
         return {
             "items": [item.to_dict() for item in self.items],
@@ -276,9 +278,10 @@ class Inventory:
             key_items=[Item.from_dict(i) for i in data.get("key_items", [])],
         )
         
+        # Slots missing from the data stay at the None set by __post_init__
         for slot_name, item_data in data.get("equipped", {}).items():
-            slot = EquipSlot(slot_name)
-            inv.equipped[slot] = Item.from_dict(item_data) if item_data else None
+            if item_data:
+                inv.equipped[EquipSlot(slot_name)] = Item.from_dict(item_data)
         
         return inv
 
@@ -0,0 +1,36 @@
+"""JSON encoding helpers for Reverie.
+
+Uses orjson when it is installed and falls back to the standard library.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# orjson.JSONDecodeError subclasses this, so one except clause covers both
+JSONDecodeError = json.JSONDecodeError
+
+
+def dumps(obj: Any) -> str:
+    """Serialize obj to a JSON string."""
+    return dumps_bytes(obj).decode("utf-8") if ORJSON_AVAILABLE else json.dumps(obj)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize obj to UTF-8 encoded JSON, e.g. for an HTTP request body."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj).encode("utf-8")
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Deserialize a JSON string or UTF-8 bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -3,6 +3,7 @@
 from typing import Optional, Any
 
 from .client import LLMClient, LLMResponse, MockLLMClient
+from .cache import CachingLLMClient
 from .ollama import OllamaClient
 from .openai import OpenAIClient
 from .prompts import (
@@ -18,12 +19,23 @@ from .prompts import (
 def create_client(config: Any) -> LLMClient:
     """Create an LLM client based on configuration.
     
+    With a true `cache` setting, the client is wrapped in a
+    CachingLLMClient.
+    
     Args:
         config: Configuration object with provider, model, endpoint, etc.
         
     Returns:
         Configured LLM client
     """
+    client = _create_base_client(config)
+    if getattr(config, "cache", False):
+        return CachingLLMClient(client)
+    return client
+
+
+def _create_base_client(config: Any) -> LLMClient:
+    """Create the provider's client, without any caching wrapper."""
     provider = getattr(config, "provider", "ollama")
     model = getattr(config, "model", None)
     endpoint = getattr(config, "endpoint", None)
@@ -82,6 +94,7 @@ __all__ = [
     "LLMClient",
     "LLMResponse",
     "MockLLMClient",
+    "CachingLLMClient",
     "OllamaClient",
     "OpenAIClient",
     "create_client",
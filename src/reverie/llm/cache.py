@@ -0,0 +1,180 @@
+"""Response caching for LLM clients."""
+
+import hashlib
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from .client import EMPTY_CONTEXT, LLMClient, LLMResponse
+
+
+EmbedFn = Callable[[str], list[float]]
+
+
+class CachingLLMClient(LLMClient):
+    """Wrap an LLM client and reuse responses for repeated prompts.
+    
+    Only deterministic requests (temperature unset or 0) are cached, and
+    failed responses are never stored. Lookups first try an exact match
+    on the model, prompt and every context option (system prompt,
+    max_tokens and so on). If an embed_fn is given, a miss then falls
+    back to the most similar cached prompt sent with the same options
+    whose cosine similarity is at least `threshold`.
+    """
+    
+    def __init__(
+        self,
+        base: LLMClient,
+        embed_fn: Optional[EmbedFn] = None,
+        threshold: float = 0.92,
+        ttl: float = 3600.0,
+        maxsize: int = 256,
+    ):
+        """Initialize the caching wrapper.
+        
+        Args:
+            base: Client that performs the actual requests
+            embed_fn: Optional function mapping a prompt to an embedding
+            threshold: Minimum cosine similarity for a semantic hit
+            ttl: Seconds a cached response stays valid
+            maxsize: Maximum number of cached responses
+        """
+        self.base = base
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.ttl = ttl
+        self.maxsize = maxsize
+        # key -> (expires_at, options key, response, unit embedding or None)
+        self._entries: OrderedDict[str, tuple[float, str, LLMResponse, Optional[list[float]]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def generate(self, prompt: str, context: Optional[dict] = None) -> LLMResponse:
+        """Return a cached response or generate a new one."""
+        if not _is_cacheable(context):
+            return self.base.generate(prompt, context)
+        
+        options = self._options_key(context)
+        key = _hash(options, prompt)
+        cached, embedding = self._lookup(key, options, prompt)
+        if cached is not None:
+            return cached
+        
+        response = self.base.generate(prompt, context)
+        if response.success:
+            self._store(key, options, response, embedding)
+        return response
+    
+    async def agenerate(self, prompt: str, context: Optional[dict] = None) -> LLMResponse:
+        """Return a cached response or generate a new one asynchronously."""
+        if not _is_cacheable(context):
+            return await self.base.agenerate(prompt, context)
+        
+        options = self._options_key(context)
+        key = _hash(options, prompt)
+        cached, embedding = self._lookup(key, options, prompt)
+        if cached is not None:
+            return cached
+        
+        response = await self.base.agenerate(prompt, context)
+        if response.success:
+            self._store(key, options, response, embedding)
+        return response
+    
+    async def aclose(self) -> None:
+        """Close the wrapped client's async resources."""
+        await self.base.aclose()
+    
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._entries.clear()
+    
+    def is_available(self) -> bool:
+        """Check if the wrapped client is available."""
+        return self.base.is_available()
+    
+    @property
+    def model_name(self) -> str:
+        """Get the wrapped client's model name."""
+        return self.base.model_name
+    
+    def _options_key(self, context: Optional[dict]) -> str:
+        """Hash the model and every generation option, apart from the prompt."""
+        context = context if context is not None else EMPTY_CONTEXT
+        options = json.dumps(dict(context), sort_keys=True, default=str)
+        return _hash(self.base.model_name, options)
+    
+    def _lookup(
+        self, key: str, options: str, prompt: str
+    ) -> tuple[Optional[LLMResponse], Optional[list[float]]]:
+        """Look up a response, returning it and the prompt embedding if computed."""
+        embedding = None
+        cached = self._lookup_exact(key)
+        if cached is None and self.embed_fn is not None:
+            embedding = _normalize(self.embed_fn(prompt))
+            cached = self._lookup_similar(embedding, options)
+        
+        if cached is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return cached, embedding
+    
+    def _lookup_exact(self, key: str) -> Optional[LLMResponse]:
+        """Find an unexpired entry with this exact key."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[2]
+    
+    def _lookup_similar(self, embedding: list[float], options: str) -> Optional[LLMResponse]:
+        """Find the most similar unexpired entry with these options above the threshold."""
+        now = time.monotonic()
+        best_key = None
+        best_score = self.threshold
+        for other_key, (expires_at, other_options, _, other) in self._entries.items():
+            if other is None or expires_at < now or other_options != options:
+                continue
+            score = math.fsum(a * b for a, b in zip(embedding, other))
+            if score >= best_score:
+                best_key, best_score = other_key, score
+        
+        if best_key is None:
+            return None
+        self._entries.move_to_end(best_key)
+        return self._entries[best_key][2]
+    
+    def _store(
+        self, key: str, options: str, response: LLMResponse, embedding: Optional[list[float]]
+    ) -> None:
+        """Add a response, evicting the least recently used entry if full."""
+        self._entries[key] = (time.monotonic() + self.ttl, options, response, embedding)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+def _hash(*parts: str) -> str:
+    """Hash strings into a cache key."""
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def _is_cacheable(context: Optional[dict]) -> bool:
+    """Only deterministic requests can safely reuse a response."""
+    if not context:
+        return True
+    return context.get("temperature") in (None, 0)
+
+
+def _normalize(vector: list[float]) -> list[float]:
+    """Scale a vector to unit length so a dot product is cosine similarity."""
+    norm = math.sqrt(math.fsum(x * x for x in vector))
+    if norm == 0:
+        return list(vector)
+    return [x / norm for x in vector]
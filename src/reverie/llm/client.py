@@ -1,8 +1,14 @@
 """Abstract LLM client interface."""
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional, Any
+from types import MappingProxyType
+from typing import Mapping, Optional, Any
+
+
+# Shared read-only stand-in for a missing context dict
+EMPTY_CONTEXT: Mapping[str, Any] = MappingProxyType({})
 
 
 @dataclass
@@ -35,6 +41,79 @@ class LLMClient(ABC):
         """
         pass
     
+    async def agenerate(self, prompt: str, context: Optional[dict] = None) -> LLMResponse:
+        """Generate a response without blocking the event loop.
+        
+        Independent requests can be run together with asyncio.gather.
+        The default runs generate() in a worker thread; HTTP clients
+        override this with a native async request.
+        
+        Args:
+            prompt: The prompt to send
+            context: Optional context dict with system prompt, temperature, etc.
+            
+        Returns:
+            LLMResponse with the result
+        """
+        return await asyncio.to_thread(self.generate, prompt, context)
+    
+    async def agenerate_many(
+        self,
+        prompts: list[str],
+        contexts: Optional[list[Optional[dict]]] = None,
+    ) -> list[LLMResponse]:
+        """Generate responses for several prompts concurrently.
+        
+        Args:
+            prompts: The prompts to send
+            contexts: Optional per-prompt contexts, parallel to prompts
+            
+        Returns:
+            Responses in the same order as prompts
+        """
+        if contexts is None:
+            contexts = [None] * len(prompts)
+        return list(await asyncio.gather(
+            *(self.agenerate(prompt, context) for prompt, context in zip(prompts, contexts))
+        ))
+    
+    def generate_many(
+        self,
+        prompts: list[str],
+        contexts: Optional[list[Optional[dict]]] = None,
+    ) -> list[LLMResponse]:
+        """Generate responses for several prompts concurrently.
+        
+        Blocking wrapper around agenerate_many(), so total latency is
+        roughly that of the slowest request rather than the sum. From
+        async code, await agenerate_many() instead.
+        
+        Args:
+            prompts: The prompts to send
+            contexts: Optional per-prompt contexts, parallel to prompts
+            
+        Returns:
+            Responses in the same order as prompts
+        """
+        return asyncio.run(self._generate_many_and_close(prompts, contexts))
+    
+    async def _generate_many_and_close(
+        self,
+        prompts: list[str],
+        contexts: Optional[list[Optional[dict]]],
+    ) -> list[LLMResponse]:
+        """Run agenerate_many, then release async resources before the loop ends."""
+        try:
+            return await self.agenerate_many(prompts, contexts)
+        finally:
+            await self.aclose()
+    
+    async def aclose(self) -> None:
+        """Release resources held for async requests.
+        
+        The default holds none; HTTP clients close their async client.
+        """
+    
     @abstractmethod
     def is_available(self) -> bool:
         """Check if the LLM service is available."""
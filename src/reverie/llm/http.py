@@ -0,0 +1,182 @@
+"""Shared HTTP settings for the LLM clients."""
+
+import asyncio
+import atexit
+import contextlib
+import importlib.util
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+from .client import LLMResponse
+
+# HTTP/2 needs the optional h2 package (pip install "reverie[http2]")
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Cap on how long establishing a connection may take
+CONNECT_TIMEOUT = 5.0
+
+# Default timeout of the shared client; LLM clients pass their own per request
+DEFAULT_TIMEOUT = 30.0
+
+# Transient failures worth retrying: rate limiting and temporary overload
+RETRY_STATUS_CODES = frozenset({429, 503})
+MAX_ATTEMPTS = 3
+MAX_RETRY_DELAY = 10.0
+
+_SHARED_CLIENT: Optional[httpx.Client] = None
+_SHARED_CLIENT_LOCK = threading.Lock()
+
+
+def request_timeout(timeout: float) -> httpx.Timeout:
+    """Build an httpx timeout with a short connect phase.
+    
+    Args:
+        timeout: Overall request timeout in seconds
+        
+    Returns:
+        Timeout to pass to a client or a single request
+    """
+    return httpx.Timeout(timeout, connect=min(timeout, CONNECT_TIMEOUT))
+
+
+def client_options(timeout: float) -> dict:
+    """Build keyword arguments for httpx.Client / httpx.AsyncClient.
+    
+    Connections are kept alive between requests and multiplexed over
+    HTTP/2 when h2 is installed, so repeated LLM calls skip the TCP and
+    TLS handshake.
+    
+    Args:
+        timeout: Overall request timeout in seconds
+        
+    Returns:
+        Dict of client keyword arguments
+    """
+    return {
+        "http2": HTTP2_AVAILABLE,
+        "timeout": request_timeout(timeout),
+        "limits": httpx.Limits(
+            max_connections=20,
+            max_keepalive_connections=10,
+            keepalive_expiry=60.0,
+        ),
+    }
+
+
+def get_shared_client() -> httpx.Client:
+    """Get the process-wide sync client, creating it on first use.
+    
+    All LLM client instances share one connection pool, so creating
+    clients on demand doesn't open fresh connections each time.
+    """
+    global _SHARED_CLIENT
+    with _SHARED_CLIENT_LOCK:
+        if _SHARED_CLIENT is None:
+            _SHARED_CLIENT = httpx.Client(**client_options(DEFAULT_TIMEOUT))
+        return _SHARED_CLIENT
+
+
+def close_shared_client() -> None:
+    """Close the shared client. The next get_shared_client() opens a new one."""
+    global _SHARED_CLIENT
+    with _SHARED_CLIENT_LOCK:
+        if _SHARED_CLIENT is not None:
+            _SHARED_CLIENT.close()
+            _SHARED_CLIENT = None
+
+
+def error_response(error: Exception) -> LLMResponse:
+    """Convert a request failure to an error LLMResponse."""
+    if isinstance(error, httpx.TimeoutException):
+        return LLMResponse(
+            text="",
+            error="Request timed out",
+        )
+    if isinstance(error, httpx.HTTPStatusError):
+        return LLMResponse(
+            text="",
+            error=f"HTTP error: {error.response.status_code}",
+        )
+    return LLMResponse(
+        text="",
+        error=str(error),
+    )
+
+
+def send_with_retry(send: Callable[[], httpx.Response]) -> httpx.Response:
+    """Send a request, retrying transient failures with backoff.
+    
+    Connection errors, timeouts and RETRY_STATUS_CODES responses are
+    retried up to MAX_ATTEMPTS times in total. Other responses, including
+    4xx errors, are returned as-is for the caller to handle.
+    
+    Args:
+        send: Callable that performs the request
+        
+    Returns:
+        The final response
+        
+    Raises:
+        httpx.TransportError: If the last attempt fails to connect or times out
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        last = attempt == MAX_ATTEMPTS - 1
+        try:
+            response = send()
+        except httpx.TransportError:
+            if last:
+                raise
+            time.sleep(_retry_delay(attempt))
+            continue
+        if last or response.status_code not in RETRY_STATUS_CODES:
+            return response
+        time.sleep(_retry_delay(attempt, response))
+
+
+async def asend_with_retry(
+    send: Callable[[], Awaitable[httpx.Response]],
+    limit: Optional[asyncio.Semaphore] = None,
+) -> httpx.Response:
+    """Async version of send_with_retry.
+    
+    Args:
+        send: Callable that performs the request
+        limit: Optional semaphore held only while an attempt is in flight,
+            so a request waiting out its backoff doesn't take a slot
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        last = attempt == MAX_ATTEMPTS - 1
+        try:
+            async with limit or contextlib.nullcontext():
+                response = await send()
+        except httpx.TransportError:
+            if last:
+                raise
+            await asyncio.sleep(_retry_delay(attempt))
+            continue
+        if last or response.status_code not in RETRY_STATUS_CODES:
+            return response
+        await asyncio.sleep(_retry_delay(attempt, response))
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """Seconds to wait before the next attempt.
+    
+    Honors a numeric Retry-After header, otherwise uses exponential
+    backoff with a little jitter so concurrent callers spread out.
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(max(float(retry_after), 0.0), MAX_RETRY_DELAY)
+            except ValueError:
+                pass
+    return 0.1 * (2 ** attempt) + random.random() * 0.05
+
+
+atexit.register(close_shared_client)
@@ -1,9 +1,23 @@
 """Ollama LLM client for local models."""
 
-from typing import Optional
+import asyncio
+import time
+from typing import Iterator, Optional
 import httpx
 
-from .client import LLMClient, LLMResponse
+from .. import jsonutil
+from .client import EMPTY_CONTEXT, LLMClient, LLMResponse
+from .http import (
+    asend_with_retry,
+    client_options,
+    error_response,
+    get_shared_client,
+    request_timeout,
+    send_with_retry,
+)
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
 
 class OllamaClient(LLMClient):
@@ -11,6 +25,8 @@ class OllamaClient(LLMClient):
     
     DEFAULT_MODEL = "llama2"
     DEFAULT_ENDPOINT = "http://localhost:11434"
+    MAX_CONCURRENT_REQUESTS = 8
+    AVAILABILITY_TTL = 5.0  # Seconds to reuse an is_available() result
     
     def __init__(
         self,
@@ -28,7 +44,14 @@ class OllamaClient(LLMClient):
         self.model = model
         self.endpoint = endpoint.rstrip("/")
         self.timeout = timeout
-        self._client = httpx.Client(timeout=timeout)
+        self._client = get_shared_client()
+        self._timeout = request_timeout(timeout)
+        # Created by agenerate() inside the running event loop
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        # (checked_at, available) from the last is_available() probe
+        self._avail_cache: Optional[tuple[float, bool]] = None
     
     def generate(self, prompt: str, context: Optional[dict] = None) -> LLMResponse:
         """Generate a response from Ollama.
@@ -40,7 +63,90 @@ class OllamaClient(LLMClient):
         Returns:
             LLMResponse with the result
         """
-        context = context or {}
+        try:
+            body = jsonutil.dumps_bytes(self._build_payload(prompt, context))
+            response = send_with_retry(lambda: self._client.post(
+                f"{self.endpoint}/api/generate",
+                content=body,
+                headers=_JSON_HEADERS,
+                timeout=self._timeout,
+            ))
+            response.raise_for_status()
+            return self._parse_response(jsonutil.loads(response.content))
+        except Exception as e:
+            return error_response(e)
+    
+    def generate_stream(self, prompt: str, context: Optional[dict] = None) -> Iterator[str]:
+        """Generate a response from Ollama, yielding text as it arrives.
+        
+        Lets callers start rendering the first sentence while the rest
+        is still being generated.
+        
+        Args:
+            prompt: The prompt to send
+            context: Optional context with 'system', 'temperature', etc.
+            
+        Yields:
+            Chunks of generated text
+            
+        Raises:
+            httpx.HTTPError: If the request fails
+        """
+        payload = self._build_payload(prompt, context)
+        payload["stream"] = True
+        
+        with self._client.stream(
+            "POST",
+            f"{self.endpoint}/api/generate",
+            content=jsonutil.dumps_bytes(payload),
+            headers=_JSON_HEADERS,
+            timeout=self._timeout,
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = jsonutil.loads(line)
+                text = chunk.get("response")
+                if text:
+                    yield text
+                if chunk.get("done"):
+                    break
+    
+    async def agenerate(self, prompt: str, context: Optional[dict] = None) -> LLMResponse:
+        """Generate a response from Ollama asynchronously.
+        
+        At most MAX_CONCURRENT_REQUESTS requests are in flight at once
+        so concurrent callers don't overload the local server.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            # Async clients can't outlive their event loop; close the one
+            # left by an earlier loop before opening another
+            if self._async_client is not None:
+                try:
+                    await self.aclose()
+                except RuntimeError:
+                    pass  # Its loop is closed; nothing left to release
+            self._async_client = httpx.AsyncClient(**client_options(self.timeout))
+            self._semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+            self._async_loop = loop
+        
+        try:
+            body = jsonutil.dumps_bytes(self._build_payload(prompt, context))
+            response = await asend_with_retry(lambda: self._async_client.post(
+                f"{self.endpoint}/api/generate",
+                content=body,
+                headers=_JSON_HEADERS,
+            ), limit=self._semaphore)
+            response.raise_for_status()
+            return self._parse_response(jsonutil.loads(response.content))
+        except Exception as e:
+            return error_response(e)
+    
+    def _build_payload(self, prompt: str, context: Optional[dict]) -> dict:
+        """Build the /api/generate request body."""
+        context = context if context is not None else EMPTY_CONTEXT
         
         payload = {
             "model": self.model,
@@ -54,54 +160,54 @@ class OllamaClient(LLMClient):
         if "temperature" in context:
             payload["options"] = {"temperature": context["temperature"]}
         
-        try:
-            response = self._client.post(
-                f"{self.endpoint}/api/generate",
-                json=payload,
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            return LLMResponse(
-                text=data.get("response", ""),
-                tokens_used=data.get("eval_count", 0),
-                finish_reason="stop",
-            )
-        except httpx.TimeoutException:
-            return LLMResponse(
-                text="",
-                error="Request timed out",
-            )
-        except httpx.HTTPStatusError as e:
-            return LLMResponse(
-                text="",
-                error=f"HTTP error: {e.response.status_code}",
-            )
-        except Exception as e:
-            return LLMResponse(
-                text="",
-                error=str(e),
-            )
+        return payload
+    
+    def _parse_response(self, data: dict) -> LLMResponse:
+        """Convert an /api/generate response body to an LLMResponse."""
+        return LLMResponse(
+            text=data.get("response", ""),
+            tokens_used=data.get("eval_count", 0),
+            finish_reason="stop",
+        )
     
     def is_available(self) -> bool:
-        """Check if Ollama server is available."""
+        """Check if Ollama server is available.
+        
+        The result is reused for AVAILABILITY_TTL seconds so callers can
+        check before every request without an extra round trip.
+        """
+        now = time.monotonic()
+        if self._avail_cache is not None and now - self._avail_cache[0] < self.AVAILABILITY_TTL:
+            return self._avail_cache[1]
+        
         try:
-            response = self._client.get(f"{self.endpoint}/api/tags")
-            return response.status_code == 200
+            response = self._client.get(f"{self.endpoint}/api/tags", timeout=self._timeout)
+            available = response.status_code == 200
         except Exception:
-            return False
+            available = False
+        self._avail_cache = (now, available)
+        return available
     
     @property
     def model_name(self) -> str:
         """Get the model name."""
         return self.model
     
+    async def aclose(self) -> None:
+        """Close the async client; the next agenerate() opens a new one."""
+        client = self._async_client
+        self._async_client = None
+        self._semaphore = None
+        self._async_loop = None
+        if client is not None:
+            await client.aclose()
+    
     def list_models(self) -> list[str]:
         """List available models on the Ollama server."""
         try:
-            response = self._client.get(f"{self.endpoint}/api/tags")
+            response = self._client.get(f"{self.endpoint}/api/tags", timeout=self._timeout)
             response.raise_for_status()
-            data = response.json()
+            data = jsonutil.loads(response.content)
             return [model["name"] for model in data.get("models", [])]
         except Exception:
             return []
@@ -1,10 +1,21 @@
 """OpenAI LLM client."""
 
+import asyncio
 import os
+import time
 from typing import Optional
 import httpx
 
-from .client import LLMClient, LLMResponse
+from .. import jsonutil
+from .client import EMPTY_CONTEXT, LLMClient, LLMResponse
+from .http import (
+    asend_with_retry,
+    client_options,
+    error_response,
+    get_shared_client,
+    request_timeout,
+    send_with_retry,
+)
 
 
 class OpenAIClient(LLMClient):
@@ -12,6 +23,8 @@ class OpenAIClient(LLMClient):
     
     DEFAULT_MODEL = "gpt-3.5-turbo"
     DEFAULT_ENDPOINT = "https://api.openai.com/v1"
+    MAX_CONCURRENT_REQUESTS = 8
+    AVAILABILITY_TTL = 5.0  # Seconds to reuse an is_available() result
     
     def __init__(
         self,
@@ -32,7 +45,14 @@ class OpenAIClient(LLMClient):
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY", "")
         self.endpoint = endpoint.rstrip("/")
         self.timeout = timeout
-        self._client = httpx.Client(timeout=timeout)
+        self._client = get_shared_client()
+        self._timeout = request_timeout(timeout)
+        # Created by agenerate() inside the running event loop
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        # (checked_at, available) from the last is_available() probe
+        self._avail_cache: Optional[tuple[float, bool]] = None
     
     def generate(self, prompt: str, context: Optional[dict] = None) -> LLMResponse:
         """Generate a response from OpenAI.
@@ -50,7 +70,74 @@ class OpenAIClient(LLMClient):
                 error="No API key provided",
             )
         
-        context = context or {}
+        try:
+            body = jsonutil.dumps_bytes(self._build_payload(prompt, context))
+            response = send_with_retry(lambda: self._client.post(
+                f"{self.endpoint}/chat/completions",
+                content=body,
+                headers=self._headers(),
+                timeout=self._timeout,
+            ))
+            response.raise_for_status()
+            return self._parse_response(jsonutil.loads(response.content))
+        except Exception as e:
+            return error_response(e)
+    
+    async def agenerate(self, prompt: str, context: Optional[dict] = None) -> LLMResponse:
+        """Generate a response from OpenAI asynchronously.
+        
+        At most MAX_CONCURRENT_REQUESTS requests are in flight at once.
+        """
+        if not self.api_key:
+            return LLMResponse(
+                text="",
+                error="No API key provided",
+            )
+        
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            # Async clients can't outlive their event loop; close the one
+            # left by an earlier loop before opening another
+            if self._async_client is not None:
+                try:
+                    await self.aclose()
+                except RuntimeError:
+                    pass  # Its loop is closed; nothing left to release
+            self._async_client = httpx.AsyncClient(**client_options(self.timeout))
+            self._semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+            self._async_loop = loop
+        
+        try:
+            body = jsonutil.dumps_bytes(self._build_payload(prompt, context))
+            response = await asend_with_retry(lambda: self._async_client.post(
+                f"{self.endpoint}/chat/completions",
+                content=body,
+                headers=self._headers(),
+            ), limit=self._semaphore)
+            response.raise_for_status()
+            return self._parse_response(jsonutil.loads(response.content))
+        except Exception as e:
+            return error_response(e)
+    
+    async def aclose(self) -> None:
+        """Close the async client; the next agenerate() opens a new one."""
+        client = self._async_client
+        self._async_client = None
+        self._semaphore = None
+        self._async_loop = None
+        if client is not None:
+            await client.aclose()
+    
+    def _headers(self) -> dict:
+        """Build request headers."""
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+    
+    def _build_payload(self, prompt: str, context: Optional[dict]) -> dict:
+        """Build the /chat/completions request body."""
+        context = context if context is not None else EMPTY_CONTEXT
         
         messages = []
         if "system" in context:
@@ -68,55 +155,44 @@ class OpenAIClient(LLMClient):
         if "max_tokens" in context:
             payload["max_tokens"] = context["max_tokens"]
         
-        try:
-            response = self._client.post(
-                f"{self.endpoint}/chat/completions",
-                json=payload,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            choice = data.get("choices", [{}])[0]
-            message = choice.get("message", {})
-            usage = data.get("usage", {})
-            
-            return LLMResponse(
-                text=message.get("content", ""),
-                tokens_used=usage.get("total_tokens", 0),
-                finish_reason=choice.get("finish_reason", "stop"),
-            )
-        except httpx.TimeoutException:
-            return LLMResponse(
-                text="",
-                error="Request timed out",
-            )
-        except httpx.HTTPStatusError as e:
-            return LLMResponse(
-                text="",
-                error=f"HTTP error: {e.response.status_code}",
-            )
-        except Exception as e:
-            return LLMResponse(
-                text="",
-                error=str(e),
-            )
+        return payload
+    
+    def _parse_response(self, data: dict) -> LLMResponse:
+        """Convert a /chat/completions response body to an LLMResponse."""
+        choice = data.get("choices", [{}])[0]
+        message = choice.get("message", {})
+        usage = data.get("usage", {})
+        
+        return LLMResponse(
+            text=message.get("content", ""),
+            tokens_used=usage.get("total_tokens", 0),
+            finish_reason=choice.get("finish_reason", "stop"),
+        )
     
     def is_available(self) -> bool:
-        """Check if OpenAI API is accessible."""
+        """Check if OpenAI API is accessible.
+        
+        The result is reused for AVAILABILITY_TTL seconds so callers can
+        check before every request without an extra round trip.
+        """
         if not self.api_key:
             return False
+        
+        now = time.monotonic()
+        if self._avail_cache is not None and now - self._avail_cache[0] < self.AVAILABILITY_TTL:
+            return self._avail_cache[1]
+        
         try:
             response = self._client.get(
                 f"{self.endpoint}/models",
                 headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=self._timeout,
             )
-            return response.status_code == 200
+            available = response.status_code == 200
         except Exception:
-            return False
+            available = False
+        self._avail_cache = (now, available)
+        return available
     
     @property
     def model_name(self) -> str:
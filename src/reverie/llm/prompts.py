@@ -1,9 +1,12 @@
 """Prompt templates for Reverie LLM interactions."""
 
-from typing import Optional, Any
+from functools import lru_cache
+from typing import Any, Mapping, Optional
 import json
 import re
 
+from .client import EMPTY_CONTEXT
+
 
 # System prompts
 DM_SYSTEM_PROMPT = """You are a skilled dungeon master running a solo tabletop RPG.
@@ -23,6 +26,9 @@ Rules:
 GENERATION_SYSTEM_PROMPT = """You are a creative writing assistant generating game content.
 Output in valid JSON format only. Be creative but concise."""
 
+# Markdown code fences around JSON output
+_FENCE = re.compile(r'```(?:json)?\s*', re.IGNORECASE)
+
 
 def build_scene_prompt(
     location: Any,
@@ -39,37 +45,55 @@ def build_scene_prompt(
     Returns:
         Formatted prompt string
     """
-    context = context or {}
-    
-    parts = []
-    
-    # Location context
-    loc_name = getattr(location, "name", str(location))
-    loc_desc = getattr(location, "description", "")
-    parts.append(f"Location: {loc_name}")
-    if loc_desc:
-        parts.append(f"Description: {loc_desc}")
+    context = context if context is not None else EMPTY_CONTEXT
     
     # Character context
+    char_name = None
     if "character" in context:
         char = context["character"]
         char_name = getattr(char, "name", str(char))
-        parts.append(f"Player Character: {char_name}")
     
     # NPCs present
-    if "npcs" in context and context["npcs"]:
-        npc_names = [getattr(n, "name", str(n)) for n in context["npcs"]]
-        parts.append(f"NPCs Present: {', '.join(npc_names)}")
+    npc_names = ()
+    npcs = context.get("npcs")
+    if npcs:
+        npc_names = tuple(getattr(n, "name", str(n)) for n in npcs)
+    
+    prompt = _scene_prefix(
+        getattr(location, "name", str(location)),
+        getattr(location, "description", ""),
+        char_name,
+        npc_names,
+    )
     
     # Recent history
-    if "history" in context and context["history"]:
-        recent = context["history"][-3:]  # Last 3 events
-        parts.append(f"Recent Events: {'; '.join(recent)}")
+    history = context.get("history")
+    if history:
+        recent = history[-3:]  # Last 3 events
+        prompt = f"{prompt}\nRecent Events: {'; '.join(recent)}"
     
-    # The action
-    parts.append(f"\nPlayer Action: {action}")
-    parts.append("\nNarrate what happens next in 2-3 sentences:")
+    return f"{prompt}\n\nPlayer Action: {action}\n\nNarrate what happens next in 2-3 sentences:"
+
+
+@lru_cache(maxsize=256)
+def _scene_prefix(
+    loc_name: str,
+    loc_desc: str,
+    char_name: Optional[str],
+    npc_names: tuple[str, ...],
+) -> str:
+    """Build the location, character and NPC block of a scene prompt.
     
+    These rarely change between turns, so the block is memoized and the
+    prompt starts with an identical prefix that the LLM server can reuse.
+    """
+    parts = [f"Location: {loc_name}"]
+    if loc_desc:
+        parts.append(f"Description: {loc_desc}")
+    if char_name is not None:
+        parts.append(f"Player Character: {char_name}")
+    if npc_names:
+        parts.append(f"NPCs Present: {', '.join(npc_names)}")
     return "\n".join(parts)
 
 
@@ -88,50 +112,81 @@ def build_dialogue_prompt(
     Returns:
         Formatted prompt string
     """
-    context = context or {}
-    
-    parts = []
+    context = context if context is not None else EMPTY_CONTEXT
     
     # NPC info
     npc_name = getattr(npc, "name", str(npc))
-    npc_occupation = getattr(npc, "occupation", "")
-    npc_traits = getattr(npc, "traits", [])
     npc_disposition = getattr(npc, "disposition", None)
-    
-    parts.append(f"NPC: {npc_name}")
-    if npc_occupation:
-        parts.append(f"Occupation: {npc_occupation}")
-    if npc_traits:
-        parts.append(f"Personality: {', '.join(npc_traits)}")
+    disp_value = None
     if npc_disposition:
         disp_value = getattr(npc_disposition, "value", str(npc_disposition))
-        parts.append(f"Attitude toward player: {disp_value}")
-    
-    # Motivation and secret (if any)
-    motivation = getattr(npc, "motivation", "")
-    if motivation:
-        parts.append(f"Motivation: {motivation}")
     
     # Player character context
+    char_name = None
+    class_value = None
+    class_hints = ""
     if "character" in context:
         char = context["character"]
         char_name = getattr(char, "name", str(char))
-        parts.append(f"\nSpeaking to: {char_name}")
         
         # Add class context for class-specific interactions
         player_class = getattr(char, "player_class", None)
         if player_class:
             class_value = getattr(player_class, "value", str(player_class))
+            class_hints = _get_class_dialogue_hints(player_class)
+    
+    prompt = _dialogue_prefix(
+        npc_name,
+        getattr(npc, "occupation", ""),
+        tuple(getattr(npc, "traits", None) or ()),
+        disp_value,
+        getattr(npc, "motivation", ""),
+        char_name,
+        class_value,
+        class_hints,
+    )
+    
+    # The player's words
+    return (
+        f'{prompt}\n\nPlayer says: "{player_input}"'
+        f"\n\nWrite {npc_name}'s response (1-2 sentences, in character):"
+    )
+
+
+@lru_cache(maxsize=256)
+def _dialogue_prefix(
+    npc_name: str,
+    occupation: str,
+    traits: tuple[str, ...],
+    disposition: Optional[str],
+    motivation: str,
+    char_name: Optional[str],
+    class_value: Optional[str],
+    class_hints: str,
+) -> str:
+    """Build the NPC and speaker block of a dialogue prompt.
+    
+    Memoized like _scene_prefix: it only changes when the NPC's attitude
+    or the speaking character does.
+    """
+    parts = [f"NPC: {npc_name}"]
+    if occupation:
+        parts.append(f"Occupation: {occupation}")
+    if traits:
+        parts.append(f"Personality: {', '.join(traits)}")
+    if disposition:
+        parts.append(f"Attitude toward player: {disposition}")
+    if motivation:
+        parts.append(f"Motivation: {motivation}")
+    
+    if char_name is not None:
+        parts.append(f"\nSpeaking to: {char_name}")
+        if class_value:
             parts.append(f"Player's profession: {class_value}")
             # Add class-specific interaction hints
-            class_hints = _get_class_dialogue_hints(player_class)
             if class_hints:
                 parts.append(f"Class dynamics: {class_hints}")
     
-    # The player's words
-    parts.append(f'\nPlayer says: "{player_input}"')
-    parts.append(f"\nWrite {npc_name}'s response (1-2 sentences, in character):")
-    
     return "\n".join(parts)
 
 
@@ -174,84 +229,66 @@ def build_generation_prompt(
     Returns:
         Formatted prompt string
     """
-    constraints = constraints or {}
-    
-    templates = {
-        "npc": _build_npc_generation_prompt,
-        "location": _build_location_generation_prompt,
-        "quest": _build_quest_generation_prompt,
-        "item": _build_item_generation_prompt,
-    }
-    
-    builder = templates.get(element_type, _build_generic_generation_prompt)
-    return builder(constraints)
+    builder = _GEN_BUILDERS.get(element_type, _build_generic_generation_prompt)
+    return builder(constraints if constraints is not None else EMPTY_CONTEXT)
 
 
-def _build_npc_generation_prompt(constraints: dict) -> str:
+def _build_npc_generation_prompt(constraints: Mapping[str, Any]) -> str:
     """Build NPC generation prompt."""
-    parts = ["Generate an NPC with the following properties:"]
-    
-    if "race" in constraints:
-        parts.append(f"- Race: {constraints['race']}")
-    if "occupation" in constraints:
-        parts.append(f"- Occupation: {constraints['occupation']}")
-    if "location" in constraints:
-        parts.append(f"- Found in: {constraints['location']}")
-    
-    parts.append("\nOutput as JSON with keys: name, race, occupation, traits (2 words), motivation, secret (optional)")
-    return "\n".join(parts)
+    race = f"\n- Race: {constraints['race']}" if "race" in constraints else ""
+    occupation = f"\n- Occupation: {constraints['occupation']}" if "occupation" in constraints else ""
+    location = f"\n- Found in: {constraints['location']}" if "location" in constraints else ""
+    return (
+        f"Generate an NPC with the following properties:{race}{occupation}{location}"
+        "\n\nOutput as JSON with keys: name, race, occupation, traits (2 words), motivation, secret (optional)"
+    )
 
 
-def _build_location_generation_prompt(constraints: dict) -> str:
+def _build_location_generation_prompt(constraints: Mapping[str, Any]) -> str:
     """Build location generation prompt."""
-    parts = ["Generate a location with the following properties:"]
-    
-    if "type" in constraints:
-        parts.append(f"- Type: {constraints['type']}")
-    if "climate" in constraints:
-        parts.append(f"- Climate: {constraints['climate']}")
-    if "culture" in constraints:
-        parts.append(f"- Culture: {constraints['culture']}")
-    
-    parts.append("\nOutput as JSON with keys: name, description (2 sentences), tags (3 words), exits (directions)")
-    return "\n".join(parts)
+    loc_type = f"\n- Type: {constraints['type']}" if "type" in constraints else ""
+    climate = f"\n- Climate: {constraints['climate']}" if "climate" in constraints else ""
+    culture = f"\n- Culture: {constraints['culture']}" if "culture" in constraints else ""
+    return (
+        f"Generate a location with the following properties:{loc_type}{climate}{culture}"
+        "\n\nOutput as JSON with keys: name, description (2 sentences), tags (3 words), exits (directions)"
+    )
 
 
-def _build_quest_generation_prompt(constraints: dict) -> str:
+def _build_quest_generation_prompt(constraints: Mapping[str, Any]) -> str:
     """Build quest generation prompt."""
-    parts = ["Generate a quest with the following properties:"]
-    
-    if "giver" in constraints:
-        parts.append(f"- Quest giver: {constraints['giver']}")
-    if "type" in constraints:
-        parts.append(f"- Quest type: {constraints['type']}")
-    if "difficulty" in constraints:
-        parts.append(f"- Difficulty: {constraints['difficulty']}")
-    
-    parts.append("\nOutput as JSON with keys: title, hook, objective, complications (2), resolutions (2), rewards")
-    return "\n".join(parts)
+    giver = f"\n- Quest giver: {constraints['giver']}" if "giver" in constraints else ""
+    quest_type = f"\n- Quest type: {constraints['type']}" if "type" in constraints else ""
+    difficulty = f"\n- Difficulty: {constraints['difficulty']}" if "difficulty" in constraints else ""
+    return (
+        f"Generate a quest with the following properties:{giver}{quest_type}{difficulty}"
+        "\n\nOutput as JSON with keys: title, hook, objective, complications (2), resolutions (2), rewards"
+    )
 
 
-def _build_item_generation_prompt(constraints: dict) -> str:
+def _build_item_generation_prompt(constraints: Mapping[str, Any]) -> str:
     """Build item generation prompt."""
-    parts = ["Generate an item with the following properties:"]
-    
-    if "type" in constraints:
-        parts.append(f"- Item type: {constraints['type']}")
-    if "rarity" in constraints:
-        parts.append(f"- Rarity: {constraints['rarity']}")
-    
-    parts.append("\nOutput as JSON with keys: name, description, type, value, effect (if any)")
-    return "\n".join(parts)
+    item_type = f"\n- Item type: {constraints['type']}" if "type" in constraints else ""
+    rarity = f"\n- Rarity: {constraints['rarity']}" if "rarity" in constraints else ""
+    return (
+        f"Generate an item with the following properties:{item_type}{rarity}"
+        "\n\nOutput as JSON with keys: name, description, type, value, effect (if any)"
+    )
 
 
-def _build_generic_generation_prompt(constraints: dict) -> str:
+def _build_generic_generation_prompt(constraints: Mapping[str, Any]) -> str:
     """Build generic generation prompt."""
-    parts = ["Generate game content with these constraints:"]
-    for key, value in constraints.items():
-        parts.append(f"- {key}: {value}")
-    parts.append("\nOutput as JSON.")
-    return "\n".join(parts)
+    lines = "".join(f"\n- {key}: {value}" for key, value in constraints.items())
+    return f"Generate game content with these constraints:{lines}\n\nOutput as JSON."
+
+
+# Prompt builders by element type; anything else uses the generic builder
+_GEN_BUILDERS = {
+    "npc": _build_npc_generation_prompt,
+    "location": _build_location_generation_prompt,
+    "quest": _build_quest_generation_prompt,
+    "item": _build_item_generation_prompt,
+}
 
 
 def parse_generation_response(response: str) -> dict:
@@ -263,28 +300,61 @@ def parse_generation_response(response: str) -> dict:
     Returns:
         Parsed dictionary (may be empty if parsing fails)
     """
-    # Try to find JSON in the response
-    # First try: parse the whole thing
+    # First try: parse the whole thing, minus any code fences
+    text = _FENCE.sub("", response)
     try:
-        return json.loads(response)
+        return json.loads(text)
     except json.JSONDecodeError:
         pass
     
-    # Second try: find JSON block
-    json_match = re.search(r'\{[^{}]*\}', response, re.DOTALL)
-    if json_match:
-        try:
-            return json.loads(json_match.group())
-        except json.JSONDecodeError:
-            pass
-    
-    # Third try: find JSON in code block
-    code_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response, re.DOTALL)
-    if code_match:
+    # Second try: each balanced {...} block in turn
+    pos = 0
+    while (span := _find_json_span(text, pos)) is not None:
+        begin, end = span
         try:
-            return json.loads(code_match.group(1))
+            return json.loads(text[begin:end])
         except json.JSONDecodeError:
-            pass
+            pos = begin + 1
     
     # Failed to parse
     return {}
+
+
+def _find_json_span(text: str, start: int = 0) -> Optional[tuple[int, int]]:
+    """Find the first balanced {...} block at or after start.
+    
+    Tracks nesting depth and skips braces inside JSON strings, so nested
+    objects are returned whole.
+    
+    Args:
+        text: Text to scan
+        start: Index to start scanning from
+        
+    Returns:
+        (begin, end) slice bounds, or None if no balanced block is found
+    """
+    begin = text.find("{", start)
+    if begin < 0:
+        return None
+    
+    depth = 0
+    in_str = False
+    escape = False
+    for i in range(begin, len(text)):
+        ch = text[i]
+        if in_str:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return begin, i + 1
+    return None
@@ -3,10 +3,14 @@
 NPCs with memory, relationships, and personality.
 """
 
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from enum import Enum
+from itertools import starmap
+from operator import itemgetter
 from typing import Optional, Any
-from uuid import uuid4
+
+from .ids import new_id
 
 
 class Disposition(Enum):
@@ -18,69 +22,130 @@ class Disposition(Enum):
     ALLIED = "allied"
 
 
-@dataclass
+# Disposition bands by total reputation: <= -10 hostile, -9..-5 unfriendly,
+# -4..4 neutral, 5..9 friendly, >= 10 allied. Each threshold is the lowest
+# total of the next band, for use with bisect_right.
+_DISPOSITION_THRESHOLDS = (-9, -4, 5, 10)
+_DISPOSITION_BANDS = (
+    Disposition.HOSTILE,
+    Disposition.UNFRIENDLY,
+    Disposition.NEUTRAL,
+    Disposition.FRIENDLY,
+    Disposition.ALLIED,
+)
+
+_DISPOSITION_BY_VALUE = {d.value: d for d in Disposition}
+
+
+@dataclass(slots=True)
 class Promise:
     """A promise made by the player to an NPC."""
     description: str
     fulfilled: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class Gift:
     """A gift given to an NPC."""
     item_name: str
     value: int
 
 
-@dataclass
+@dataclass(slots=True)
 class ReputationChange:
     """A change in reputation with an NPC."""
     amount: int  # Positive or negative
     reason: str
 
 
-@dataclass
+@dataclass(slots=True)
 class NPCMemory:
     """NPC's memory of interactions with the player."""
     conversations: list[str] = field(default_factory=list)
     promises: list[Promise] = field(default_factory=list)
     gifts: list[Gift] = field(default_factory=list)
     reputation_changes: list[ReputationChange] = field(default_factory=list)
+    # Running totals so lookups don't re-sum the lists
+    _rep_total: int = field(default=0, init=False, repr=False, compare=False)
+    _gift_total: int = field(default=0, init=False, repr=False, compare=False)
+    # Indices into promises that are not yet fulfilled
+    _unfulfilled: set[int] = field(default_factory=set, init=False, repr=False, compare=False)
+    # Cached get_summary() result, cleared by every mutator
+    _summary_cache: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Compute running totals and the promise index from any initial records."""
+        self._unfulfilled = {i for i, p in enumerate(self.promises) if not p.fulfilled}
+        self._rep_total = sum(change.amount for change in self.reputation_changes)
+        self._gift_total = sum(gift.value for gift in self.gifts)
 
     def add_conversation(self, summary: str) -> None:
         """Add a conversation summary."""
         self.conversations.append(summary)
+        self._summary_cache = None
 
     def add_promise(self, description: str, fulfilled: bool = False) -> None:
         """Add a promise."""
+        if not fulfilled:
+            self._unfulfilled.add(len(self.promises))
         self.promises.append(Promise(description=description, fulfilled=fulfilled))
+        self._summary_cache = None
 
     def fulfill_promise(self, index: int) -> bool:
         """Mark a promise as fulfilled. Returns True if successful."""
         if 0 <= index < len(self.promises):
             self.promises[index].fulfilled = True
+            self._unfulfilled.discard(index)
+            self._summary_cache = None
             return True
         return False
 
     def get_unfulfilled_promises(self) -> list[Promise]:
         """Get all unfulfilled promises."""
-        return [p for p in self.promises if not p.fulfilled]
+        return [self.promises[i] for i in sorted(self._unfulfilled)]
+
+    def get_unfulfilled_count(self) -> int:
+        """Get the number of unfulfilled promises."""
+        return len(self._unfulfilled)
 
     def add_gift(self, item_name: str, value: int) -> None:
         """Record a gift."""
         self.gifts.append(Gift(item_name=item_name, value=value))
+        self._gift_total += value
+        self._summary_cache = None
 
     def add_reputation_change(self, amount: int, reason: str) -> None:
         """Record a reputation change."""
         self.reputation_changes.append(ReputationChange(amount=amount, reason=reason))
+        self._rep_total += amount
+        self._summary_cache = None
 
     def get_total_reputation(self) -> int:
         """Calculate total reputation from all changes."""
-        return sum(change.amount for change in self.reputation_changes)
+        return self._rep_total
 
     def get_gift_value_total(self) -> int:
         """Get total value of gifts given."""
-        return sum(gift.value for gift in self.gifts)
+        return self._gift_total
+
+    def get_summary(self) -> str:
+        """Summarize reputation, promises, gifts and conversations.
+        
+        Returns:
+            " | "-separated details, or an empty string if there are none
+        """
+        if self._summary_cache is None:
+            parts = []
+            if self._rep_total != 0:
+                parts.append(f"Reputation: {self._rep_total:+d}")
+            if self._unfulfilled:
+                parts.append(f"Unfulfilled promises: {len(self._unfulfilled)}")
+            if self.gifts:
+                parts.append(f"Gifts received: {len(self.gifts)}")
+            if self.conversations:
+                parts.append(f"Conversations: {len(self.conversations)}")
+            self._summary_cache = " | ".join(parts)
+        return self._summary_cache
 
     def to_dict(self) -> dict:
         """Serialize to dictionary."""
@@ -94,24 +159,24 @@ class NPCMemory:
     @classmethod
     def from_dict(cls, data: dict) -> "NPCMemory":
         """Deserialize from dictionary."""
-        memory = cls()
-        memory.conversations = data.get("conversations", [])
-        memory.promises = [
-            Promise(description=p["description"], fulfilled=p["fulfilled"])
-            for p in data.get("promises", [])
-        ]
-        memory.gifts = [
-            Gift(item_name=g["item_name"], value=g["value"])
-            for g in data.get("gifts", [])
-        ]
-        memory.reputation_changes = [
-            ReputationChange(amount=r["amount"], reason=r["reason"])
-            for r in data.get("reputation_changes", [])
-        ]
-        return memory
-
-
-@dataclass
+        return cls(
+            conversations=data.get("conversations", []),
+            promises=list(starmap(Promise, map(_promise_fields, data.get("promises", ())))),
+            gifts=list(starmap(Gift, map(_gift_fields, data.get("gifts", ())))),
+            reputation_changes=list(starmap(
+                ReputationChange,
+                map(_reputation_fields, data.get("reputation_changes", ())),
+            )),
+        )
+
+
+# Positional field extractors for NPCMemory.from_dict
+_promise_fields = itemgetter("description", "fulfilled")
+_gift_fields = itemgetter("item_name", "value")
+_reputation_fields = itemgetter("amount", "reason")
+
+
+@dataclass(slots=True)
 class NPC:
     """A non-player character."""
     id: str
@@ -140,38 +205,17 @@ class NPC:
         # Calculate new disposition based on total reputation
         total = self.memory.get_total_reputation()
         
-        if total <= -10:
-            self.disposition = Disposition.HOSTILE
-        elif total <= -5:
-            self.disposition = Disposition.UNFRIENDLY
-        elif total < 5:
-            self.disposition = Disposition.NEUTRAL
-        elif total < 10:
-            self.disposition = Disposition.FRIENDLY
-        else:
-            self.disposition = Disposition.ALLIED
+        self.disposition = _DISPOSITION_BANDS[bisect_right(_DISPOSITION_THRESHOLDS, total)]
             
         return self.disposition
 
     def get_relationship_summary(self) -> str:
         """Get a summary of the NPC's relationship with the player."""
-        parts = [f"{self.name} ({self.disposition.value})"]
-        
-        total_rep = self.memory.get_total_reputation()
-        if total_rep != 0:
-            parts.append(f"Reputation: {total_rep:+d}")
-        
-        unfulfilled = self.memory.get_unfulfilled_promises()
-        if unfulfilled:
-            parts.append(f"Unfulfilled promises: {len(unfulfilled)}")
-            
-        if self.memory.gifts:
-            parts.append(f"Gifts received: {len(self.memory.gifts)}")
-            
-        if self.memory.conversations:
-            parts.append(f"Conversations: {len(self.memory.conversations)}")
-            
-        return " | ".join(parts)
+        header = f"{self.name} ({self.disposition.value})"
+        details = self.memory.get_summary()
+        if details:
+            return f"{header} | {details}"
+        return header
 
     def to_dict(self) -> dict:
         """Serialize to dictionary."""
@@ -198,11 +242,19 @@ class NPC:
             traits=data.get("traits", []),
             motivation=data.get("motivation", ""),
             secret=data.get("secret"),
-            disposition=Disposition(data.get("disposition", "neutral")),
+            disposition=_parse_disposition(data.get("disposition", "neutral")),
             memory=NPCMemory.from_dict(data.get("memory", {})),
         )
 
 
+def _parse_disposition(value: str) -> Disposition:
+    """Look up a Disposition by value, raising ValueError if unknown."""
+    disposition = _DISPOSITION_BY_VALUE.get(value)
+    if disposition is None:
+        return Disposition(value)
+    return disposition
+
+
 # Generation functions
 
 def generate_npc(
@@ -233,7 +285,7 @@ def generate_npc(
         disposition = Disposition(disposition)
     
     return NPC(
-        id=str(uuid4()),
+        id=new_id(),
         name=name,
         race=race,
         occupation=occupation,
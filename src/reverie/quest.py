@@ -5,8 +5,10 @@ Quest generation, progression, and completion tracking.
 
 from dataclasses import dataclass, field
 from enum import Enum
+from types import MappingProxyType
 from typing import Optional, Any
-from uuid import uuid4
+
+from .ids import new_id
 
 
 class QuestStatus(Enum):
@@ -17,7 +19,16 @@ class QuestStatus(Enum):
     ABANDONED = "abandoned"
 
 
-@dataclass
+# Plain dict lookup is much cheaper than QuestStatus(value)
+_STATUS_BY_VALUE = {s.value: s for s in QuestStatus}
+
+# Read-only default for a missing nested dict, so from_dict doesn't
+# allocate a throwaway {} per call. Missing lists use `or []` for the
+# same reason: the fallback is only built when it's needed.
+_NO_DATA = MappingProxyType({})
+
+
+@dataclass(slots=True)
 class QuestStage:
     """A stage or objective within a quest."""
     description: str
@@ -43,7 +54,7 @@ class QuestStage:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class QuestReward:
     """Reward for completing a quest."""
     gold: int = 0
@@ -65,13 +76,13 @@ class QuestReward:
         """Deserialize from dictionary."""
         return cls(
             gold=data.get("gold", 0),
-            items=data.get("items", []),
+            items=data.get("items") or [],
             reputation=data.get("reputation", 0),
             description=data.get("description", ""),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Quest:
     """A quest with objectives and rewards."""
     id: str
@@ -86,16 +97,31 @@ class Quest:
     giver_id: Optional[str] = None  # NPC who gave quest
     failure_reason: Optional[str] = None
     chosen_resolution: Optional[int] = None
+    # Progress counters kept in step by advance_stage()
+    _completed_count: int = field(default=0, init=False, repr=False, compare=False)
+    _first_incomplete_idx: int = field(default=0, init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        """Compute progress counters from the initial stages."""
+        self._completed_count = sum(1 for s in self.stages if s.completed)
+        self._first_incomplete_idx = self._next_incomplete(0)
+    
+    def _next_incomplete(self, start: int) -> int:
+        """Index of the first incomplete stage at or after start."""
+        stages = self.stages
+        idx = start
+        while idx < len(stages) and stages[idx].completed:
+            idx += 1
+        return idx
     
     def is_active(self) -> bool:
         """Check if quest is still active."""
-        return self.status == QuestStatus.ACTIVE
+        return self.status is QuestStatus.ACTIVE
     
     def get_current_stage(self) -> Optional[QuestStage]:
         """Get the first incomplete stage."""
-        for stage in self.stages:
-            if not stage.completed:
-                return stage
+        if self._first_incomplete_idx < len(self.stages):
+            return self.stages[self._first_incomplete_idx]
         return None
     
     def get_completed_stages(self) -> list[QuestStage]:
@@ -104,8 +130,7 @@ class Quest:
     
     def get_progress(self) -> tuple[int, int]:
         """Get (completed, total) stage counts."""
-        completed = len([s for s in self.stages if s.completed])
-        return completed, len(self.stages)
+        return self._completed_count, len(self.stages)
     
     def advance_stage(self, stage_index: int) -> bool:
         """Mark a specific stage as completed.
@@ -115,7 +140,12 @@ class Quest:
         if not self.is_active():
             return False
         if 0 <= stage_index < len(self.stages):
-            self.stages[stage_index].complete()
+            stage = self.stages[stage_index]
+            if not stage.completed:
+                stage.complete()
+                self._completed_count += 1
+                if stage_index == self._first_incomplete_idx:
+                    self._first_incomplete_idx = self._next_incomplete(stage_index + 1)
             return True
         return False
     
@@ -162,7 +192,11 @@ class Quest:
             "complications": self.complications,
             "resolutions": self.resolutions,
             "rewards": self.rewards.to_dict(),
-            "stages": [s.to_dict() for s in self.stages],
+            # Inlined QuestStage.to_dict(); keep the two in sync
+            "stages": [
+                {"description": s.description, "completed": s.completed}
+                for s in self.stages
+            ],
             "status": self.status.value,
             "giver_id": self.giver_id,
             "failure_reason": self.failure_reason,
@@ -177,17 +211,29 @@ class Quest:
             title=data["title"],
             hook=data.get("hook", ""),
             objective=data.get("objective", ""),
-            complications=data.get("complications", []),
-            resolutions=data.get("resolutions", []),
-            rewards=QuestReward.from_dict(data.get("rewards", {})),
-            stages=[QuestStage.from_dict(s) for s in data.get("stages", [])],
-            status=QuestStatus(data.get("status", "active")),
+            complications=data.get("complications") or [],
+            resolutions=data.get("resolutions") or [],
+            rewards=QuestReward.from_dict(data.get("rewards", _NO_DATA)),
+            # Inlined QuestStage.from_dict(); keep the two in sync
+            stages=[
+                QuestStage(s["description"], s.get("completed", False))
+                for s in data.get("stages", ())
+            ],
+            status=_parse_status(data.get("status", "active")),
             giver_id=data.get("giver_id"),
             failure_reason=data.get("failure_reason"),
             chosen_resolution=data.get("chosen_resolution"),
         )
 
 
+def _parse_status(value: str) -> QuestStatus:
+    """Look up a QuestStatus by value, raising ValueError if unknown."""
+    status = _STATUS_BY_VALUE.get(value)
+    if status is None:
+        return QuestStatus(value)
+    return status
+
+
 # Generation and helper functions
 
 def generate_quest(
@@ -236,7 +282,7 @@ def generate_quest(
         giver_id = getattr(npc, "id", None)
     
     return Quest(
-        id=str(uuid4()),
+        id=new_id(),
         title=title,
         hook=hook,
         objective=objective,
@@ -296,7 +342,7 @@ def get_active_quests(quests: list[Quest]) -> list[Quest]:
     Returns:
         List of active quests only
     """
-    return [q for q in quests if q.is_active()]
+    return [q for q in quests if q.status is QuestStatus.ACTIVE]
 
 
 def get_completed_quests(quests: list[Quest]) -> list[Quest]:
@@ -308,7 +354,7 @@ def get_completed_quests(quests: list[Quest]) -> list[Quest]:
     Returns:
         List of completed quests only
     """
-    return [q for q in quests if q.status == QuestStatus.COMPLETED]
+    return [q for q in quests if q.status is QuestStatus.COMPLETED]
 
 
 def get_failed_quests(quests: list[Quest]) -> list[Quest]:
@@ -320,4 +366,22 @@ def get_failed_quests(quests: list[Quest]) -> list[Quest]:
     Returns:
         List of failed quests only
     """
-    return [q for q in quests if q.status == QuestStatus.FAILED]
+    return [q for q in quests if q.status is QuestStatus.FAILED]
+
+
+def partition_quests_by_status(quests: list[Quest]) -> dict[QuestStatus, list[Quest]]:
+    """Group quests by status in a single pass.
+    
+    Cheaper than calling several get_*_quests helpers when more than
+    one subset is needed, e.g. for the quest journal.
+    
+    Args:
+        quests: List of all quests
+        
+    Returns:
+        Dict with a list (possibly empty) for every QuestStatus
+    """
+    buckets: dict[QuestStatus, list[Quest]] = {status: [] for status in QuestStatus}
+    for quest in quests:
+        buckets[quest.status].append(quest)
+    return buckets
@@ -21,6 +21,7 @@ from .database import (
 from .migrations import (
     SCHEMA_VERSION,
     run_migrations,
+    reset_data,
     reset_schema,
 )
 from .world_state import (
@@ -30,6 +31,7 @@ from .world_state import (
     WorldEvent,
     get_world_state_path,
     open_world_state,
+    close_world_state,
 )
 
 __all__ = [
@@ -52,6 +54,7 @@ __all__ = [
     # Migrations
     "SCHEMA_VERSION",
     "run_migrations",
+    "reset_data",
     "reset_schema",
     # World State
     "WorldStateDB",
@@ -60,4 +63,5 @@ __all__ = [
     "WorldEvent",
     "get_world_state_path",
     "open_world_state",
+    "close_world_state",
 ]
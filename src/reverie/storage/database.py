@@ -1,11 +1,12 @@
 """Database operations for Reverie."""
 
-import json
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Any
+from typing import Optional, Any, Iterable, Iterator, TextIO
 
+from .. import jsonutil
 from .models import (
     Campaign,
     CharacterRecord,
@@ -16,6 +17,78 @@ from .models import (
 )
 from .migrations import run_migrations, reset_schema
 
+# JSON codec for the data columns (orjson when installed). Encodes to str
+# so the columns stay TEXT and json_extract() keeps working on them.
+_dumps = jsonutil.dumps
+_loads = jsonutil.loads
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+_CACHED_STATEMENTS = 256
+
+# Column-name converter for ISO-8601 timestamp columns
+_TIMESTAMP = "reverie_timestamp"
+
+# Keep IN (...) lists well under SQLite's bound-parameter limit
+_MAX_IN_PARAMS = 500
+
+# SQL statements. Each is a single module-level string so repeated calls
+# hit the connection's prepared-statement cache.
+_INSERT_CAMPAIGN = """INSERT OR REPLACE INTO campaigns
+               (id, name, created_at, updated_at, character_id, current_location_id, playtime_seconds)
+               VALUES (?, ?, ?, ?, ?, ?, ?)"""
+# Timestamp columns are tagged for the _TIMESTAMP converter so they come
+# back as datetimes without a per-row fromisoformat() call in Python
+_CAMPAIGN_COLUMNS = f"""id, name,
+               created_at AS "created_at [{_TIMESTAMP}]",
+               updated_at AS "updated_at [{_TIMESTAMP}]",
+               character_id, current_location_id, playtime_seconds"""
+_SELECT_CAMPAIGN = f"SELECT {_CAMPAIGN_COLUMNS} FROM campaigns WHERE id = ?"
+_LIST_CAMPAIGNS = f"SELECT {_CAMPAIGN_COLUMNS} FROM campaigns ORDER BY updated_at DESC"
+_DELETE_CAMPAIGN = "DELETE FROM campaigns WHERE id = ?"
+
+_SELECT_CHARACTER = "SELECT * FROM characters WHERE id = ?"
+_SELECT_CAMPAIGN_CHARACTER = "SELECT * FROM characters WHERE campaign_id = ?"
+
+# Record columns in dataclass field order, for the *_from_row factories
+_WORLD_ELEMENT_COLUMNS = "id, campaign_id, element_type, name, data"
+_NPC_COLUMNS = "id, campaign_id, name, location_id, data"
+_QUEST_COLUMNS = "id, campaign_id, title, status, data"
+
+_SELECT_WORLD_ELEMENT = f"SELECT {_WORLD_ELEMENT_COLUMNS} FROM world_elements WHERE id = ?"
+_LIST_WORLD_ELEMENTS = f"SELECT {_WORLD_ELEMENT_COLUMNS} FROM world_elements WHERE campaign_id = ?"
+_LIST_WORLD_ELEMENTS_BY_TYPE = (
+    f"SELECT {_WORLD_ELEMENT_COLUMNS} FROM world_elements WHERE campaign_id = ? AND element_type = ?"
+)
+
+_SELECT_NPC = f"SELECT {_NPC_COLUMNS} FROM npcs WHERE id = ?"
+_LIST_NPCS = f"SELECT {_NPC_COLUMNS} FROM npcs WHERE campaign_id = ?"
+_LIST_NPCS_AT_LOCATION = f"SELECT {_NPC_COLUMNS} FROM npcs WHERE campaign_id = ? AND location_id = ?"
+_LIST_NPC_SUMMARIES = """SELECT name,
+                      json_extract(data, '$.occupation'),
+                      COALESCE(json_extract(data, '$.disposition'), 'neutral')
+               FROM npcs WHERE campaign_id = ?"""
+
+_SELECT_QUEST = f"SELECT {_QUEST_COLUMNS} FROM quests WHERE id = ?"
+_LIST_QUESTS = f"SELECT {_QUEST_COLUMNS} FROM quests WHERE campaign_id = ?"
+_LIST_QUESTS_BY_STATUS = f"SELECT {_QUEST_COLUMNS} FROM quests WHERE campaign_id = ? AND status = ?"
+
+_LIST_EVENTS = f"""SELECT id, campaign_id, timestamp AS "timestamp [{_TIMESTAMP}]",
+                      event_type, description, data
+               FROM events WHERE campaign_id = ? ORDER BY timestamp DESC LIMIT ?"""
+# Export copies stored timestamps through as text
+_EXPORT_EVENTS = "SELECT * FROM events WHERE campaign_id = ? ORDER BY timestamp DESC LIMIT ?"
+
+_INSERT_CHARACTER = """INSERT OR REPLACE INTO characters (id, campaign_id, name, data)
+               VALUES (?, ?, ?, ?)"""
+_INSERT_WORLD_ELEMENT = """INSERT OR REPLACE INTO world_elements (id, campaign_id, element_type, name, data)
+               VALUES (?, ?, ?, ?, ?)"""
+_INSERT_NPC = """INSERT OR REPLACE INTO npcs (id, campaign_id, name, location_id, data)
+               VALUES (?, ?, ?, ?, ?)"""
+_INSERT_QUEST = """INSERT OR REPLACE INTO quests (id, campaign_id, title, status, data)
+               VALUES (?, ?, ?, ?, ?)"""
+_INSERT_EVENT = """INSERT INTO events (id, campaign_id, timestamp, event_type, description, data)
+               VALUES (?, ?, ?, ?, ?, ?)"""
+
 
 class Database:
     """SQLite database wrapper for Reverie."""
@@ -29,16 +102,32 @@ class Database:
     def open(cls, path: Path) -> "Database":
         """Open or create database at path."""
         path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(str(path))
-        conn.execute("PRAGMA foreign_keys = ON")
+        # The UI runs game turns in a worker thread, one at a time
+        conn = sqlite3.connect(
+            str(path),
+            detect_types=sqlite3.PARSE_COLNAMES,
+            cached_statements=_CACHED_STATEMENTS,
+            check_same_thread=False,
+        )
+        # WAL with synchronous=NORMAL makes each commit an append to the
+        # log instead of two fsyncs of the main database file
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA mmap_size = 268435456")
+        _apply_pragmas(conn)
         run_migrations(conn)
         return cls(conn)
     
     @classmethod
     def open_memory(cls) -> "Database":
         """Open in-memory database for testing."""
-        conn = sqlite3.connect(":memory:")
-        conn.execute("PRAGMA foreign_keys = ON")
+        conn = sqlite3.connect(
+            ":memory:",
+            detect_types=sqlite3.PARSE_COLNAMES,
+            cached_statements=_CACHED_STATEMENTS,
+            check_same_thread=False,
+        )
+        _apply_pragmas(conn)
         run_migrations(conn)
         return cls(conn)
     
@@ -48,13 +137,14 @@ class Database:
     
     # === Campaign Operations ===
     
-    def save_campaign(self, campaign: Campaign) -> None:
-        """Save or update a campaign."""
+    def save_campaign(self, campaign: Campaign, commit: bool = True) -> None:
+        """Save or update a campaign.
+        
+        Pass commit=False to batch several writes into one transaction.
+        """
         campaign.updated_at = datetime.now()
         self.conn.execute(
-            """INSERT OR REPLACE INTO campaigns 
-               (id, name, created_at, updated_at, character_id, current_location_id, playtime_seconds)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            _INSERT_CAMPAIGN,
             (
                 campaign.id,
                 campaign.name,
@@ -65,12 +155,13 @@ class Database:
                 campaign.playtime_seconds,
             ),
         )
-        self.conn.commit()
+        if commit:
+            self.conn.commit()
     
     def load_campaign(self, campaign_id: str) -> Optional[Campaign]:
         """Load a campaign by ID."""
         cursor = self.conn.execute(
-            "SELECT * FROM campaigns WHERE id = ?", (campaign_id,)
+            _SELECT_CAMPAIGN, (campaign_id,)
         )
         row = cursor.fetchone()
         if row is None:
@@ -78,8 +169,8 @@ class Database:
         return Campaign(
             id=row["id"],
             name=row["name"],
-            created_at=datetime.fromisoformat(row["created_at"]),
-            updated_at=datetime.fromisoformat(row["updated_at"]),
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
             character_id=row["character_id"],
             current_location_id=row["current_location_id"],
             playtime_seconds=row["playtime_seconds"],
@@ -88,44 +179,32 @@ class Database:
     def list_campaigns(self) -> list[Campaign]:
         """List all campaigns."""
         cursor = self.conn.execute(
-            "SELECT * FROM campaigns ORDER BY updated_at DESC"
+            _LIST_CAMPAIGNS
         )
-        campaigns = []
-        for row in cursor:
-            campaigns.append(Campaign(
-                id=row["id"],
-                name=row["name"],
-                created_at=datetime.fromisoformat(row["created_at"]),
-                updated_at=datetime.fromisoformat(row["updated_at"]),
-                character_id=row["character_id"],
-                current_location_id=row["current_location_id"],
-                playtime_seconds=row["playtime_seconds"],
-            ))
-        return campaigns
+        # Build records as rows are fetched, skipping Row's name lookups
+        cursor.row_factory = _campaign_from_row
+        return list(cursor)
     
     def delete_campaign(self, campaign_id: str) -> bool:
         """Delete a campaign and all related data."""
         cursor = self.conn.execute(
-            "DELETE FROM campaigns WHERE id = ?", (campaign_id,)
+            _DELETE_CAMPAIGN, (campaign_id,)
         )
         self.conn.commit()
         return cursor.rowcount > 0
     
     # === Character Operations ===
     
-    def save_character(self, record: CharacterRecord) -> None:
+    def save_character(self, record: CharacterRecord, commit: bool = True) -> None:
         """Save or update a character."""
-        self.conn.execute(
-            """INSERT OR REPLACE INTO characters (id, campaign_id, name, data)
-               VALUES (?, ?, ?, ?)""",
-            (record.id, record.campaign_id, record.name, json.dumps(record.data)),
-        )
-        self.conn.commit()
+        self.conn.execute(_INSERT_CHARACTER, _character_row(record))
+        if commit:
+            self.conn.commit()
     
     def load_character(self, character_id: str) -> Optional[CharacterRecord]:
         """Load a character by ID."""
         cursor = self.conn.execute(
-            "SELECT * FROM characters WHERE id = ?", (character_id,)
+            _SELECT_CHARACTER, (character_id,)
         )
         row = cursor.fetchone()
         if row is None:
@@ -134,13 +213,13 @@ class Database:
             id=row["id"],
             campaign_id=row["campaign_id"],
             name=row["name"],
-            data=json.loads(row["data"]),
+            data=_loads(row["data"]),
         )
     
     def get_campaign_character(self, campaign_id: str) -> Optional[CharacterRecord]:
         """Get the character for a campaign."""
         cursor = self.conn.execute(
-            "SELECT * FROM characters WHERE campaign_id = ?", (campaign_id,)
+            _SELECT_CAMPAIGN_CHARACTER, (campaign_id,)
         )
         row = cursor.fetchone()
         if row is None:
@@ -149,24 +228,21 @@ class Database:
             id=row["id"],
             campaign_id=row["campaign_id"],
             name=row["name"],
-            data=json.loads(row["data"]),
+            data=_loads(row["data"]),
         )
     
     # === World Element Operations ===
     
-    def save_world_element(self, record: WorldElementRecord) -> None:
+    def save_world_element(self, record: WorldElementRecord, commit: bool = True) -> None:
         """Save or update a world element."""
-        self.conn.execute(
-            """INSERT OR REPLACE INTO world_elements (id, campaign_id, element_type, name, data)
-               VALUES (?, ?, ?, ?, ?)""",
-            (record.id, record.campaign_id, record.element_type, record.name, json.dumps(record.data)),
-        )
-        self.conn.commit()
+        self.conn.execute(_INSERT_WORLD_ELEMENT, _world_element_row(record))
+        if commit:
+            self.conn.commit()
     
     def load_world_element(self, element_id: str) -> Optional[WorldElementRecord]:
         """Load a world element by ID."""
         cursor = self.conn.execute(
-            "SELECT * FROM world_elements WHERE id = ?", (element_id,)
+            _SELECT_WORLD_ELEMENT, (element_id,)
         )
         row = cursor.fetchone()
         if row is None:
@@ -176,47 +252,55 @@ class Database:
             campaign_id=row["campaign_id"],
             element_type=row["element_type"],
             name=row["name"],
-            data=json.loads(row["data"]),
+            data=_loads(row["data"]),
         )
     
+    def load_world_elements(self, element_ids: Iterable[str]) -> dict[str, WorldElementRecord]:
+        """Load several world elements by ID in batched queries.
+        
+        Returns a dict keyed by ID; missing IDs are left out.
+        """
+        ids = list(dict.fromkeys(element_ids))
+        elements = {}
+        for start in range(0, len(ids), _MAX_IN_PARAMS):
+            chunk = ids[start:start + _MAX_IN_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            cursor = self.conn.execute(
+                f"SELECT {_WORLD_ELEMENT_COLUMNS} FROM world_elements WHERE id IN ({placeholders})",
+                chunk,
+            )
+            cursor.row_factory = _world_element_from_row
+            for element in cursor:
+                elements[element.id] = element
+        return elements
+    
     def list_world_elements(self, campaign_id: str, element_type: Optional[str] = None) -> list[WorldElementRecord]:
         """List world elements for a campaign."""
         if element_type:
             cursor = self.conn.execute(
-                "SELECT * FROM world_elements WHERE campaign_id = ? AND element_type = ?",
+                _LIST_WORLD_ELEMENTS_BY_TYPE,
                 (campaign_id, element_type),
             )
         else:
             cursor = self.conn.execute(
-                "SELECT * FROM world_elements WHERE campaign_id = ?", (campaign_id,)
+                _LIST_WORLD_ELEMENTS, (campaign_id,)
             )
         
-        elements = []
-        for row in cursor:
-            elements.append(WorldElementRecord(
-                id=row["id"],
-                campaign_id=row["campaign_id"],
-                element_type=row["element_type"],
-                name=row["name"],
-                data=json.loads(row["data"]),
-            ))
-        return elements
+        cursor.row_factory = _world_element_from_row
+        return list(cursor)
     
     # === NPC Operations ===
     
-    def save_npc(self, record: NPCRecord) -> None:
+    def save_npc(self, record: NPCRecord, commit: bool = True) -> None:
         """Save or update an NPC."""
-        self.conn.execute(
-            """INSERT OR REPLACE INTO npcs (id, campaign_id, name, location_id, data)
-               VALUES (?, ?, ?, ?, ?)""",
-            (record.id, record.campaign_id, record.name, record.location_id, json.dumps(record.data)),
-        )
-        self.conn.commit()
+        self.conn.execute(_INSERT_NPC, _npc_row(record))
+        if commit:
+            self.conn.commit()
     
     def load_npc(self, npc_id: str) -> Optional[NPCRecord]:
         """Load an NPC by ID."""
         cursor = self.conn.execute(
-            "SELECT * FROM npcs WHERE id = ?", (npc_id,)
+            _SELECT_NPC, (npc_id,)
         )
         row = cursor.fetchone()
         if row is None:
@@ -226,47 +310,48 @@ class Database:
             campaign_id=row["campaign_id"],
             name=row["name"],
             location_id=row["location_id"],
-            data=json.loads(row["data"]),
+            data=_loads(row["data"]),
         )
     
     def list_npcs(self, campaign_id: str, location_id: Optional[str] = None) -> list[NPCRecord]:
         """List NPCs for a campaign, optionally filtered by location."""
         if location_id:
             cursor = self.conn.execute(
-                "SELECT * FROM npcs WHERE campaign_id = ? AND location_id = ?",
+                _LIST_NPCS_AT_LOCATION,
                 (campaign_id, location_id),
             )
         else:
             cursor = self.conn.execute(
-                "SELECT * FROM npcs WHERE campaign_id = ?", (campaign_id,)
+                _LIST_NPCS, (campaign_id,)
             )
         
-        npcs = []
-        for row in cursor:
-            npcs.append(NPCRecord(
-                id=row["id"],
-                campaign_id=row["campaign_id"],
-                name=row["name"],
-                location_id=row["location_id"],
-                data=json.loads(row["data"]),
-            ))
-        return npcs
+        cursor.row_factory = _npc_from_row
+        return list(cursor)
+    
+    def list_npc_summaries(self, campaign_id: str) -> list[tuple[str, str, str]]:
+        """List (name, occupation, disposition) for a campaign's NPCs.
+        
+        Reads only the fields needed for display instead of decoding
+        the full NPC data.
+        """
+        cursor = self.conn.execute(
+            _LIST_NPC_SUMMARIES,
+            (campaign_id,),
+        )
+        return [(row[0], row[1], row[2]) for row in cursor]
     
     # === Quest Operations ===
     
-    def save_quest(self, record: QuestRecord) -> None:
+    def save_quest(self, record: QuestRecord, commit: bool = True) -> None:
         """Save or update a quest."""
-        self.conn.execute(
-            """INSERT OR REPLACE INTO quests (id, campaign_id, title, status, data)
-               VALUES (?, ?, ?, ?, ?)""",
-            (record.id, record.campaign_id, record.title, record.status, json.dumps(record.data)),
-        )
-        self.conn.commit()
+        self.conn.execute(_INSERT_QUEST, _quest_row(record))
+        if commit:
+            self.conn.commit()
     
     def load_quest(self, quest_id: str) -> Optional[QuestRecord]:
         """Load a quest by ID."""
         cursor = self.conn.execute(
-            "SELECT * FROM quests WHERE id = ?", (quest_id,)
+            _SELECT_QUEST, (quest_id,)
         )
         row = cursor.fetchone()
         if row is None:
@@ -276,87 +361,118 @@ class Database:
             campaign_id=row["campaign_id"],
             title=row["title"],
             status=row["status"],
-            data=json.loads(row["data"]),
+            data=_loads(row["data"]),
         )
     
     def list_quests(self, campaign_id: str, status: Optional[str] = None) -> list[QuestRecord]:
         """List quests for a campaign, optionally filtered by status."""
         if status:
             cursor = self.conn.execute(
-                "SELECT * FROM quests WHERE campaign_id = ? AND status = ?",
+                _LIST_QUESTS_BY_STATUS,
                 (campaign_id, status),
             )
         else:
             cursor = self.conn.execute(
-                "SELECT * FROM quests WHERE campaign_id = ?", (campaign_id,)
+                _LIST_QUESTS, (campaign_id,)
             )
         
-        quests = []
-        for row in cursor:
-            quests.append(QuestRecord(
-                id=row["id"],
-                campaign_id=row["campaign_id"],
-                title=row["title"],
-                status=row["status"],
-                data=json.loads(row["data"]),
-            ))
-        return quests
+        cursor.row_factory = _quest_from_row
+        return list(cursor)
     
     # === Event Operations ===
     
-    def save_event(self, record: EventRecord) -> None:
+    def save_event(self, record: EventRecord, commit: bool = True) -> None:
         """Save an event."""
-        self.conn.execute(
-            """INSERT INTO events (id, campaign_id, timestamp, event_type, description, data)
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            (
-                record.id,
-                record.campaign_id,
-                record.timestamp.isoformat(),
-                record.event_type,
-                record.description,
-                json.dumps(record.data),
-            ),
-        )
-        self.conn.commit()
+        self.conn.execute(_INSERT_EVENT, _event_row(record))
+        if commit:
+            self.conn.commit()
     
     def list_events(self, campaign_id: str, limit: int = 100) -> list[EventRecord]:
         """List events for a campaign, most recent first."""
         cursor = self.conn.execute(
-            "SELECT * FROM events WHERE campaign_id = ? ORDER BY timestamp DESC LIMIT ?",
+            _LIST_EVENTS,
             (campaign_id, limit),
         )
         
-        events = []
-        for row in cursor:
-            events.append(EventRecord(
-                id=row["id"],
-                campaign_id=row["campaign_id"],
-                timestamp=datetime.fromisoformat(row["timestamp"]),
-                event_type=row["event_type"],
-                description=row["description"],
-                data=json.loads(row["data"]),
-            ))
-        return events
+        cursor.row_factory = _event_from_row
+        return list(cursor)
     
     # === Export/Import ===
     
     def export_campaign(self, campaign_id: str) -> dict:
         """Export a campaign and all related data."""
-        campaign = self.load_campaign(campaign_id)
-        if campaign is None:
-            return {}
+        with self._read_snapshot():
+            campaign = self.load_campaign(campaign_id)
+            if campaign is None:
+                return {}
+            
+            character = self.get_campaign_character(campaign_id)
+            
+            return {
+                "campaign": campaign.to_dict(),
+                "character": character.to_dict() if character else None,
+                "world_elements": [e.to_dict() for e in self.list_world_elements(campaign_id)],
+                "npcs": [n.to_dict() for n in self.list_npcs(campaign_id)],
+                "quests": [q.to_dict() for q in self.list_quests(campaign_id)],
+                "events": [e.to_dict() for e in self.list_events(campaign_id, limit=1000)],
+            }
+    
+    def export_campaign_stream(self, campaign_id: str, fp: TextIO) -> bool:
+        """Write a campaign export to a text file as JSON, row by row.
         
-        character = self.get_campaign_character(campaign_id)
+        Produces the same document as export_campaign() without building
+        it in memory first. Data columns are copied through as stored
+        instead of being decoded and re-encoded.
         
-        return {
-            "campaign": campaign.to_dict(),
-            "character": character.to_dict() if character else None,
-            "world_elements": [e.to_dict() for e in self.list_world_elements(campaign_id)],
-            "npcs": [n.to_dict() for n in self.list_npcs(campaign_id)],
-            "quests": [q.to_dict() for q in self.list_quests(campaign_id)],
-            "events": [e.to_dict() for e in self.list_events(campaign_id, limit=1000)],
-        }
+        Args:
+            campaign_id: Campaign to export
+            fp: Writable text file
+            
+        Returns:
+            False if the campaign doesn't exist (nothing is written)
+        """
+        with self._read_snapshot():
+            campaign = self.load_campaign(campaign_id)
+            if campaign is None:
+                return False
+            
+            character = self.get_campaign_character(campaign_id)
+            
+            write = fp.write
+            write('{"campaign":')
+            write(_dumps(campaign.to_dict()))
+            write(',"character":')
+            write(_dumps(character.to_dict()) if character else "null")
+            for key, sql, params in (
+                ("world_elements", _LIST_WORLD_ELEMENTS, (campaign_id,)),
+                ("npcs", _LIST_NPCS, (campaign_id,)),
+                ("quests", _LIST_QUESTS, (campaign_id,)),
+                ("events", _EXPORT_EVENTS, (campaign_id, 1000)),
+            ):
+                write(f',"{key}":[')
+                separator = ""
+                for row in self.conn.execute(sql, params):
+                    write(separator)
+                    write(_row_json(row))
+                    separator = ","
+                write("]")
+            write("}")
+            return True
+    
+    @contextmanager
+    def _read_snapshot(self) -> Iterator[None]:
+        """Run several reads in one transaction so they see a single snapshot.
+        
+        Joins the current transaction if one is already open.
+        """
+        if self.conn.in_transaction:
+            yield
+            return
+        self.conn.execute("BEGIN DEFERRED")
+        try:
+            yield
+        finally:
+            self.conn.rollback()  # Read-only, nothing to commit
     
     def import_campaign(self, data: dict) -> Optional[str]:
         """Import a campaign from exported data.
@@ -367,31 +483,110 @@ class Database:
             return None
         
         campaign = Campaign.from_dict(data["campaign"])
-        self.save_campaign(campaign)
-        
-        if data.get("character"):
-            character = CharacterRecord.from_dict(data["character"])
-            self.save_character(character)
         
-        for elem_data in data.get("world_elements", []):
-            elem = WorldElementRecord.from_dict(elem_data)
-            self.save_world_element(elem)
-        
-        for npc_data in data.get("npcs", []):
-            npc = NPCRecord.from_dict(npc_data)
-            self.save_npc(npc)
-        
-        for quest_data in data.get("quests", []):
-            quest = QuestRecord.from_dict(quest_data)
-            self.save_quest(quest)
-        
-        for event_data in data.get("events", []):
-            event = EventRecord.from_dict(event_data)
-            self.save_event(event)
+        # One transaction for the whole import; rolled back on error
+        with self.conn:
+            self.save_campaign(campaign, commit=False)
+            
+            if data.get("character"):
+                character = CharacterRecord.from_dict(data["character"])
+                self.save_character(character, commit=False)
+            
+            self.conn.executemany(_INSERT_WORLD_ELEMENT, [
+                _world_element_row(WorldElementRecord.from_dict(d))
+                for d in data.get("world_elements", [])
+            ])
+            self.conn.executemany(_INSERT_NPC, [
+                _npc_row(NPCRecord.from_dict(d)) for d in data.get("npcs", [])
+            ])
+            self.conn.executemany(_INSERT_QUEST, [
+                _quest_row(QuestRecord.from_dict(d)) for d in data.get("quests", [])
+            ])
+            self.conn.executemany(_INSERT_EVENT, [
+                _event_row(EventRecord.from_dict(d)) for d in data.get("events", [])
+            ])
         
         return campaign.id
 
 
+def _parse_timestamp(value: bytes) -> datetime:
+    """Convert a stored ISO-8601 timestamp to a datetime."""
+    return datetime.fromisoformat(value.decode())
+
+
+sqlite3.register_converter(_TIMESTAMP, _parse_timestamp)
+
+
+def _apply_pragmas(conn: sqlite3.Connection) -> None:
+    """Apply connection settings shared by file and in-memory databases."""
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -64000")  # 64 MB
+
+
+def _row_json(row: sqlite3.Row) -> str:
+    """Encode a record row as JSON, splicing in the stored data column."""
+    fields = dict(row)
+    data = fields.pop("data")
+    # Columns match the record's to_dict() keys, so fields is never empty
+    return f'{_dumps(fields)[:-1]},"data":{data}}}'
+
+
+# Row factories for the list methods; columns arrive in field order
+
+def _campaign_from_row(cursor: sqlite3.Cursor, row: tuple) -> Campaign:
+    return Campaign(*row)
+
+
+def _world_element_from_row(cursor: sqlite3.Cursor, row: tuple) -> WorldElementRecord:
+    id_, campaign_id, element_type, name, data = row
+    return WorldElementRecord(id_, campaign_id, element_type, name, _loads(data))
+
+
+def _npc_from_row(cursor: sqlite3.Cursor, row: tuple) -> NPCRecord:
+    id_, campaign_id, name, location_id, data = row
+    return NPCRecord(id_, campaign_id, name, location_id, _loads(data))
+
+
+def _quest_from_row(cursor: sqlite3.Cursor, row: tuple) -> QuestRecord:
+    id_, campaign_id, title, status, data = row
+    return QuestRecord(id_, campaign_id, title, status, _loads(data))
+
+
+def _event_from_row(cursor: sqlite3.Cursor, row: tuple) -> EventRecord:
+    id_, campaign_id, timestamp, event_type, description, data = row
+    return EventRecord(id_, campaign_id, timestamp, event_type, description, _loads(data))
+
+
+# Row builders shared by single and bulk inserts
+
+def _character_row(record: CharacterRecord) -> tuple:
+    return (record.id, record.campaign_id, record.name, _dumps(record.data))
+
+
+def _world_element_row(record: WorldElementRecord) -> tuple:
+    return (record.id, record.campaign_id, record.element_type, record.name, _dumps(record.data))
+
+
+def _npc_row(record: NPCRecord) -> tuple:
+    return (record.id, record.campaign_id, record.name, record.location_id, _dumps(record.data))
+
+
+def _quest_row(record: QuestRecord) -> tuple:
+    return (record.id, record.campaign_id, record.title, record.status, _dumps(record.data))
+
+
+def _event_row(record: EventRecord) -> tuple:
+    return (
+        record.id,
+        record.campaign_id,
+        record.timestamp.isoformat(),
+        record.event_type,
+        record.description,
+        _dumps(record.data),
+    )
+
+
 # Helper functions
 
 def create_database(path: Path) -> Database:
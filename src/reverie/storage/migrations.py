@@ -3,7 +3,7 @@
 import sqlite3
 
 # Current schema version
-SCHEMA_VERSION = 1
+SCHEMA_VERSION = 2
 
 # Schema creation SQL
 SCHEMA_SQL = """
@@ -85,6 +85,21 @@ CREATE INDEX IF NOT EXISTS idx_events_campaign ON events(campaign_id);
 CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events(timestamp);
 """
 
+# Migration 2: composite indexes for the filtered list queries. Each one
+# also serves plain campaign_id lookups, so the single-column campaign
+# indexes they replace are dropped.
+MIGRATION_2_SQL = """
+CREATE INDEX IF NOT EXISTS idx_world_elements_campaign_type ON world_elements(campaign_id, element_type);
+CREATE INDEX IF NOT EXISTS idx_npcs_campaign_location ON npcs(campaign_id, location_id);
+CREATE INDEX IF NOT EXISTS idx_quests_campaign_status ON quests(campaign_id, status);
+CREATE INDEX IF NOT EXISTS idx_events_campaign_timestamp ON events(campaign_id, timestamp DESC);
+
+DROP INDEX IF EXISTS idx_world_elements_campaign;
+DROP INDEX IF EXISTS idx_npcs_campaign;
+DROP INDEX IF EXISTS idx_quests_campaign;
+DROP INDEX IF EXISTS idx_events_campaign;
+"""
+
 
 def get_schema_version(conn: sqlite3.Connection) -> int:
     """Get current schema version from database."""
@@ -116,15 +131,36 @@ def run_migrations(conn: sqlite3.Connection) -> int:
         set_schema_version(conn, 1)
         current_version = 1
     
+    if current_version < 2:
+        conn.executescript(MIGRATION_2_SQL)
+        set_schema_version(conn, 2)
+        current_version = 2
+    
     # Future migrations would go here:
-    # if current_version < 2:
-    #     run_migration_2(conn)
-    #     set_schema_version(conn, 2)
-    #     current_version = 2
+    # if current_version < 3:
+    #     run_migration_3(conn)
+    #     set_schema_version(conn, 3)
+    #     current_version = 3
     
     return current_version
 
 
+# Tables holding campaign data, children before the campaigns they reference
+DATA_TABLES = ("events", "quests", "npcs", "world_elements", "characters", "campaigns")
+
+
+def reset_data(conn: sqlite3.Connection) -> None:
+    """Delete all campaign data, keeping the schema.
+    
+    Runs in one transaction. An unqualified DELETE lets SQLite truncate
+    each table instead of removing rows one at a time, which is much
+    cheaper than reset_schema() when only the data needs to go.
+    """
+    with conn:
+        for table in DATA_TABLES:
+            conn.execute(f"DELETE FROM {table}")
+
+
 def reset_schema(conn: sqlite3.Connection) -> None:
     """Drop all tables and recreate schema.
     
@@ -3,10 +3,11 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, Any
-from uuid import uuid4
 
+from ..ids import new_id
 
-@dataclass
+
+@dataclass(slots=True)
 class Campaign:
     """A campaign save file."""
     id: str
@@ -22,7 +23,7 @@ class Campaign:
         """Create a new campaign."""
         now = datetime.now()
         return cls(
-            id=str(uuid4()),
+            id=new_id(),
             name=name,
             created_at=now,
             updated_at=now,
@@ -54,7 +55,7 @@ class Campaign:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CharacterRecord:
     """Character storage record."""
     id: str
@@ -82,7 +83,7 @@ class CharacterRecord:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class WorldElementRecord:
     """World element storage record."""
     id: str
@@ -113,7 +114,7 @@ class WorldElementRecord:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class NPCRecord:
     """NPC storage record."""
     id: str
@@ -144,7 +145,7 @@ class NPCRecord:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class QuestRecord:
     """Quest storage record."""
     id: str
@@ -175,7 +176,7 @@ class QuestRecord:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class EventRecord:
     """Event/history storage record."""
     id: str
@@ -189,7 +190,7 @@ class EventRecord:
     def create(cls, campaign_id: str, event_type: str, description: str, data: Optional[dict] = None) -> "EventRecord":
         """Create a new event."""
         return cls(
-            id=str(uuid4()),
+            id=new_id(),
             campaign_id=campaign_id,
             timestamp=datetime.now(),
             event_type=event_type,
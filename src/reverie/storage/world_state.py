@@ -9,16 +9,27 @@ This creates a separate database from campaign saves, allowing
 new campaigns to reference previous world history.
 """
 
-import json
+import queue
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
-from uuid import uuid4
+from typing import Iterator, Optional
 
+from .. import jsonutil
+from ..ids import new_id
+from .database import _TIMESTAMP
 
-@dataclass
+# JSON codec for the event data column (orjson when installed). Encodes to
+# str so the column stays TEXT and readable with json_extract().
+_dumps = jsonutil.dumps
+_loads = jsonutil.loads
+
+
+@dataclass(slots=True)
 class FactionStanding:
     """Standing with a faction (-100 to +100)."""
     faction_id: str
@@ -44,7 +55,7 @@ class FactionStanding:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class NPCDeath:
     """Record of an NPC's death."""
     id: str
@@ -65,7 +76,7 @@ class NPCDeath:
         npc_id: Optional[str] = None,
     ) -> "NPCDeath":
         return cls(
-            id=str(uuid4()),
+            id=new_id(),
             npc_name=npc_name,
             npc_id=npc_id,
             location=location,
@@ -97,7 +108,7 @@ class NPCDeath:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class WorldEvent:
     """A major world event that persists across campaigns."""
     id: str
@@ -120,7 +131,7 @@ class WorldEvent:
         data: Optional[dict] = None,
     ) -> "WorldEvent":
         return cls(
-            id=str(uuid4()),
+            id=new_id(),
             event_type=event_type,
             title=title,
             description=description,
@@ -185,210 +196,381 @@ CREATE TABLE IF NOT EXISTS world_events (
 );
 
 CREATE INDEX IF NOT EXISTS idx_npc_deaths_name ON npc_deaths(npc_name);
-CREATE INDEX IF NOT EXISTS idx_world_events_type ON world_events(event_type);
+CREATE INDEX IF NOT EXISTS idx_world_events_type_timestamp ON world_events(event_type, timestamp DESC);
+-- Superseded by idx_world_events_type_timestamp
+DROP INDEX IF EXISTS idx_world_events_type;
 CREATE INDEX IF NOT EXISTS idx_world_events_timestamp ON world_events(timestamp);
+CREATE INDEX IF NOT EXISTS idx_npc_deaths_campaign ON npc_deaths(campaign_id);
+CREATE INDEX IF NOT EXISTS idx_world_events_campaign ON world_events(campaign_id);
 """
 
 
+# Prepared statements kept per connection (sqlite3 default is 128)
+_CACHED_STATEMENTS = 256
+
+# Record columns in dataclass field order, for the *_from_row factories.
+# Timestamps are tagged for the shared timestamp converter so they come
+# back as datetimes.
+_FACTION_COLUMNS = f'faction_id, faction_name, standing, updated_at AS "updated_at [{_TIMESTAMP}]"'
+_NPC_DEATH_COLUMNS = (
+    f'id, npc_name, npc_id, location, cause, campaign_id, timestamp AS "timestamp [{_TIMESTAMP}]"'
+)
+_WORLD_EVENT_COLUMNS = (
+    "id, event_type, title, description, location, campaign_id, "
+    f'timestamp AS "timestamp [{_TIMESTAMP}]", data'
+)
+# Same record shape, leaving the data JSON in the table
+_WORLD_EVENT_COLUMNS_NO_DATA = _WORLD_EVENT_COLUMNS.replace(", data", ", NULL AS data")
+
+_SELECT_FACTION = f"SELECT {_FACTION_COLUMNS} FROM faction_standings WHERE faction_id = ?"
+_SELECT_NPC_DEATH = (
+    f"SELECT {_NPC_DEATH_COLUMNS} FROM npc_deaths WHERE npc_name = ? ORDER BY timestamp DESC LIMIT 1"
+)
+
+_LIST_FACTIONS = f"SELECT {_FACTION_COLUMNS} FROM faction_standings ORDER BY standing DESC"
+_LIST_NPC_DEATHS = f"SELECT {_NPC_DEATH_COLUMNS} FROM npc_deaths ORDER BY timestamp DESC LIMIT ?"
+_LIST_WORLD_EVENTS = f"SELECT {_WORLD_EVENT_COLUMNS} FROM world_events ORDER BY timestamp DESC LIMIT ?"
+_LIST_WORLD_EVENTS_BY_TYPE = (
+    f"SELECT {_WORLD_EVENT_COLUMNS} FROM world_events WHERE event_type = ? ORDER BY timestamp DESC LIMIT ?"
+)
+_LIST_WORLD_EVENTS_NO_DATA = _LIST_WORLD_EVENTS.replace(_WORLD_EVENT_COLUMNS, _WORLD_EVENT_COLUMNS_NO_DATA)
+_LIST_WORLD_EVENTS_BY_TYPE_NO_DATA = _LIST_WORLD_EVENTS_BY_TYPE.replace(
+    _WORLD_EVENT_COLUMNS, _WORLD_EVENT_COLUMNS_NO_DATA
+)
+
+# export_all has SQLite build each table's JSON array directly. Every
+# key matches the record's to_dict(); the event data column is stored
+# JSON, so json() embeds it as an object rather than a string.
+_EXPORT_FACTIONS = """
+SELECT json_group_array(json_object(
+    'faction_id', faction_id, 'faction_name', faction_name,
+    'standing', standing, 'updated_at', updated_at))
+FROM (SELECT * FROM faction_standings ORDER BY standing DESC)
+"""
+_EXPORT_NPC_DEATHS = """
+SELECT json_group_array(json_object(
+    'id', id, 'npc_name', npc_name, 'npc_id', npc_id, 'location', location,
+    'cause', cause, 'campaign_id', campaign_id, 'timestamp', timestamp))
+FROM (SELECT * FROM npc_deaths ORDER BY timestamp DESC LIMIT ?)
+"""
+_EXPORT_WORLD_EVENTS = """
+SELECT json_group_array(json_object(
+    'id', id, 'event_type', event_type, 'title', title, 'description', description,
+    'location', location, 'campaign_id', campaign_id, 'timestamp', timestamp,
+    'data', json(data)))
+FROM (SELECT * FROM world_events ORDER BY timestamp DESC LIMIT ?)
+"""
+
+_NPC_IS_DEAD = "SELECT EXISTS (SELECT 1 FROM npc_deaths WHERE npc_name = ?)"
+
+# SQLite stamps updated_at itself as local time, padded to the
+# microsecond form datetime.isoformat() writes
+_NOW = "strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime') || '000'"
+_INSERT_FACTION = f"""INSERT OR REPLACE INTO faction_standings
+               (faction_id, faction_name, standing, updated_at)
+               VALUES (?, ?, ?, {_NOW})"""
+# Hands the stored timestamp back for the caller's record
+_SET_FACTION = _INSERT_FACTION + f' RETURNING updated_at AS "updated_at [{_TIMESTAMP}]"'
+# Add to a standing, creating it if needed, clamped to -100..+100 in one
+# statement. An existing faction keeps its stored name.
+_ADJUST_FACTION = f"""INSERT INTO faction_standings
+               (faction_id, faction_name, standing, updated_at)
+               VALUES (?1, ?2, max(-100, min(100, ?3)), {_NOW})
+               ON CONFLICT(faction_id) DO UPDATE SET
+                   standing = max(-100, min(100, faction_standings.standing + ?3)),
+                   updated_at = excluded.updated_at
+               RETURNING {_FACTION_COLUMNS}"""
+_INSERT_NPC_DEATH = """INSERT INTO npc_deaths
+               (id, npc_name, npc_id, location, cause, campaign_id, timestamp)
+               VALUES (?, ?, ?, ?, ?, ?, ?)"""
+# Import variant: skip NPCs that already have a death record
+_IMPORT_NPC_DEATH = """INSERT INTO npc_deaths
+               (id, npc_name, npc_id, location, cause, campaign_id, timestamp)
+               SELECT ?, ?, ?, ?, ?, ?, ?
+               WHERE NOT EXISTS (SELECT 1 FROM npc_deaths WHERE npc_name = ?2)"""
+_INSERT_WORLD_EVENT = """INSERT INTO world_events
+               (id, event_type, title, description, location, campaign_id, timestamp, data)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
+# Import variant: skip events already recorded, so re-importing is harmless
+_IMPORT_WORLD_EVENT = _INSERT_WORLD_EVENT.replace("INSERT INTO", "INSERT OR IGNORE INTO")
+
+
 class WorldStateDB:
     """Database for persistent world state."""
     
-    def __init__(self, conn: sqlite3.Connection):
+    SUMMARY_ITEMS = 5  # Events and deaths shown by get_world_history_summary()
+    EXPORT_LIMIT = 1000  # Deaths and events written by export_all()
+    OPTIMIZE_INTERVAL = 3600.0  # Seconds between PRAGMA optimize runs while open
+    READER_CONNECTIONS = 4  # Most read-only connections pooled for a file database
+    
+    def __init__(self, conn: sqlite3.Connection, path: Optional[Path] = None):
+        """Wrap the writer connection.
+        
+        Args:
+            conn: Connection used for all writes, from any thread
+            path: Database file; when given, reads go through a pool of
+                read-only connections that WAL lets run alongside writes
+        """
         self.conn = conn
         self.conn.row_factory = sqlite3.Row
+        # Held around each write, and by transaction() for its whole block
+        self._writer_lock = threading.RLock()
+        # Per-thread transaction() state
+        self._local = threading.local()
+        self._last_optimize = time.monotonic()
+        self._path = path
+        self.closed = False
+        # Idle readers; _reader_conns holds every one opened so far
+        self._readers: queue.SimpleQueue[sqlite3.Connection] = queue.SimpleQueue()
+        self._reader_conns: list[sqlite3.Connection] = []
+        self._reader_lock = threading.Lock()
     
     @classmethod
     def open(cls, path: Path) -> "WorldStateDB":
         """Open or create world state database."""
-        path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(str(path))
-        conn.executescript(WORLD_STATE_SCHEMA)
-        conn.commit()
-        return cls(conn)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+        conn = _connect_writer(path)
+        # WAL with synchronous=NORMAL turns each recorded death or event
+        # into a log append instead of two fsyncs, and doesn't block readers
+        conn.execute("PRAGMA journal_mode = WAL")
+        _create_schema(conn)
+        return cls(conn, path)
     
     @classmethod
     def open_memory(cls) -> "WorldStateDB":
         """Open in-memory database for testing."""
-        conn = sqlite3.connect(":memory:")
-        conn.executescript(WORLD_STATE_SCHEMA)
-        conn.commit()
+        # Every thread shares this connection; a second one would see
+        # a separate, empty database
+        conn = sqlite3.connect(
+            ":memory:",
+            detect_types=sqlite3.PARSE_COLNAMES,
+            cached_statements=_CACHED_STATEMENTS,
+            check_same_thread=False,
+        )
+        _apply_pragmas(conn)
+        _create_schema(conn)
         return cls(conn)
     
+    @property
+    def _batching(self) -> bool:
+        """True inside this thread's transaction(); writes leave committing to it."""
+        return getattr(self._local, "batching", False)
+    
+    @_batching.setter
+    def _batching(self, value: bool) -> None:
+        self._local.batching = value
+    
     def close(self) -> None:
-        """Close the database connection."""
-        self.conn.close()
+        """Close the database connection.
+        
+        Runs PRAGMA optimize first so SQLite can refresh query planner
+        statistics gathered during the session.
+        """
+        with self._writer_lock:
+            try:
+                self.conn.execute("PRAGMA optimize")
+            except sqlite3.ProgrammingError:
+                pass  # Already closed
+            self.conn.close()
+        with self._reader_lock:
+            for reader in self._reader_conns:
+                reader.close()
+            self._reader_conns.clear()
+            self._readers = queue.SimpleQueue()
+        self.closed = True
+    
+    def optimize(self) -> None:
+        """Let SQLite refresh planner statistics for the tables it has seen queried."""
+        with self._writer_lock:
+            self.conn.execute("PRAGMA optimize")
+        self._last_optimize = time.monotonic()
+    
+    def _commit(self) -> None:
+        self.conn.commit()
+        self._maybe_optimize()
+    
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """Check out a read connection for the duration of the block.
+        
+        Uses the writer for in-memory databases, and while the writer has
+        uncommitted changes that a reader's snapshot wouldn't include.
+        Other threads then wait for those changes to commit.
+        """
+        if self._path is None or self._batching or self.conn.in_transaction:
+            with self._writer_lock:
+                yield self.conn
+            return
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            conn = self._open_reader()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+    
+    def _open_reader(self) -> sqlite3.Connection:
+        """Open another reader, or wait for one if the pool is full."""
+        with self._reader_lock:
+            if len(self._reader_conns) < self.READER_CONNECTIONS:
+                conn = _connect_reader(self._path)
+                self._reader_conns.append(conn)
+                return conn
+        return self._readers.get()
+    
+    def _maybe_optimize(self) -> None:
+        """Optimize after a commit once OPTIMIZE_INTERVAL has passed.
+        
+        Long sessions get fresh statistics without a background timer,
+        which couldn't share this connection with its own thread anyway.
+        """
+        if time.monotonic() - self._last_optimize >= self.OPTIMIZE_INTERVAL:
+            self.optimize()
+    
+    @contextmanager
+    def transaction(self) -> Iterator["WorldStateDB"]:
+        """Group a burst of writes into a single commit.
+        
+        Writes inside the block skip their own commit. Everything is
+        committed when the block exits, or rolled back if it raises.
+        Nested blocks join the outer transaction.
+        
+        Example:
+            with world_state.transaction():
+                for death in deaths:
+                    world_state.record_npc_death(death)
+        """
+        if self._batching:
+            yield self
+            return
+        with self._writer_lock:
+            self._batching = True
+            try:
+                with self.conn:
+                    yield self
+            finally:
+                self._batching = False
+            self._maybe_optimize()
     
     # === Faction Operations ===
     
     def get_faction_standing(self, faction_id: str) -> Optional[FactionStanding]:
         """Get standing with a faction."""
-        cursor = self.conn.execute(
-            "SELECT * FROM faction_standings WHERE faction_id = ?",
-            (faction_id,)
-        )
-        row = cursor.fetchone()
-        if row is None:
-            return None
-        return FactionStanding(
-            faction_id=row["faction_id"],
-            faction_name=row["faction_name"],
-            standing=row["standing"],
-            updated_at=datetime.fromisoformat(row["updated_at"]),
-        )
+        with self._reader() as conn:
+            cursor = conn.execute(_SELECT_FACTION, (faction_id,))
+            cursor.row_factory = _faction_from_row
+            return cursor.fetchone()
     
-    def set_faction_standing(self, standing: FactionStanding) -> None:
-        """Set or update faction standing."""
-        standing.updated_at = datetime.now()
-        self.conn.execute(
-            """INSERT OR REPLACE INTO faction_standings 
-               (faction_id, faction_name, standing, updated_at)
-               VALUES (?, ?, ?, ?)""",
-            (standing.faction_id, standing.faction_name, standing.standing, standing.updated_at.isoformat()),
-        )
-        self.conn.commit()
+    def set_faction_standing(self, standing: FactionStanding, commit: bool = True) -> None:
+        """Set or update faction standing.
+        
+        Pass commit=False, or use transaction(), to batch several writes
+        into one commit.
+        """
+        with self._writer_lock:
+            cursor = self.conn.execute(
+                _SET_FACTION, (standing.faction_id, standing.faction_name, standing.standing)
+            )
+            standing.updated_at = cursor.fetchone()[0]
+            if commit and not self._batching:
+                self._commit()
     
     def adjust_faction_standing(self, faction_id: str, faction_name: str, delta: int) -> FactionStanding:
         """Adjust faction standing by delta. Creates if doesn't exist."""
-        existing = self.get_faction_standing(faction_id)
-        if existing:
-            new_standing = max(-100, min(100, existing.standing + delta))
-            existing.standing = new_standing
-            self.set_faction_standing(existing)
-            return existing
-        else:
-            standing = FactionStanding(
-                faction_id=faction_id,
-                faction_name=faction_name,
-                standing=max(-100, min(100, delta)),
-            )
-            self.set_faction_standing(standing)
-            return standing
+        with self._writer_lock:
+            cursor = self.conn.execute(_ADJUST_FACTION, (faction_id, faction_name, delta))
+            cursor.row_factory = _faction_from_row
+            standing = cursor.fetchone()
+            if not self._batching:
+                self._commit()
+        return standing
     
     def list_faction_standings(self) -> list[FactionStanding]:
         """List all faction standings."""
-        cursor = self.conn.execute(
-            "SELECT * FROM faction_standings ORDER BY standing DESC"
-        )
-        return [
-            FactionStanding(
-                faction_id=row["faction_id"],
-                faction_name=row["faction_name"],
-                standing=row["standing"],
-                updated_at=datetime.fromisoformat(row["updated_at"]),
-            )
-            for row in cursor
-        ]
+        with self._reader() as conn:
+            cursor = conn.execute(_LIST_FACTIONS)
+            # Build records as rows are fetched, skipping Row's name lookups
+            cursor.row_factory = _faction_from_row
+            return list(cursor)
     
     # === NPC Death Operations ===
     
-    def record_npc_death(self, death: NPCDeath) -> None:
+    def record_npc_death(self, death: NPCDeath, commit: bool = True) -> None:
         """Record an NPC death."""
-        self.conn.execute(
-            """INSERT INTO npc_deaths 
-               (id, npc_name, npc_id, location, cause, campaign_id, timestamp)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (death.id, death.npc_name, death.npc_id, death.location, 
-             death.cause, death.campaign_id, death.timestamp.isoformat()),
-        )
-        self.conn.commit()
+        with self._writer_lock:
+            self.conn.execute(_INSERT_NPC_DEATH, _npc_death_row(death))
+            if commit and not self._batching:
+                self._commit()
     
     def is_npc_dead(self, npc_name: str) -> bool:
         """Check if an NPC (by name) has died in any campaign."""
-        cursor = self.conn.execute(
-            "SELECT 1 FROM npc_deaths WHERE npc_name = ? LIMIT 1",
-            (npc_name,)
-        )
-        return cursor.fetchone() is not None
+        with self._reader() as conn:
+            return bool(conn.execute(_NPC_IS_DEAD, (npc_name,)).fetchone()[0])
     
     def get_npc_death(self, npc_name: str) -> Optional[NPCDeath]:
         """Get death record for an NPC."""
-        cursor = self.conn.execute(
-            "SELECT * FROM npc_deaths WHERE npc_name = ? ORDER BY timestamp DESC LIMIT 1",
-            (npc_name,)
-        )
-        row = cursor.fetchone()
-        if row is None:
-            return None
-        return NPCDeath(
-            id=row["id"],
-            npc_name=row["npc_name"],
-            npc_id=row["npc_id"],
-            location=row["location"],
-            cause=row["cause"],
-            campaign_id=row["campaign_id"],
-            timestamp=datetime.fromisoformat(row["timestamp"]),
-        )
+        with self._reader() as conn:
+            cursor = conn.execute(_SELECT_NPC_DEATH, (npc_name,))
+            cursor.row_factory = _npc_death_from_row
+            return cursor.fetchone()
     
     def list_npc_deaths(self, limit: int = 100) -> list[NPCDeath]:
         """List recent NPC deaths."""
-        cursor = self.conn.execute(
-            "SELECT * FROM npc_deaths ORDER BY timestamp DESC LIMIT ?",
-            (limit,)
-        )
-        return [
-            NPCDeath(
-                id=row["id"],
-                npc_name=row["npc_name"],
-                npc_id=row["npc_id"],
-                location=row["location"],
-                cause=row["cause"],
-                campaign_id=row["campaign_id"],
-                timestamp=datetime.fromisoformat(row["timestamp"]),
-            )
-            for row in cursor
-        ]
+        with self._reader() as conn:
+            cursor = conn.execute(_LIST_NPC_DEATHS, (limit,))
+            cursor.row_factory = _npc_death_from_row
+            return list(cursor)
     
     # === World Event Operations ===
     
-    def record_world_event(self, event: WorldEvent) -> None:
+    def record_world_event(self, event: WorldEvent, commit: bool = True) -> None:
         """Record a world event."""
-        self.conn.execute(
-            """INSERT INTO world_events 
-               (id, event_type, title, description, location, campaign_id, timestamp, data)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-            (event.id, event.event_type, event.title, event.description,
-             event.location, event.campaign_id, event.timestamp.isoformat(),
-             json.dumps(event.data)),
-        )
-        self.conn.commit()
+        with self._writer_lock:
+            self.conn.execute(_INSERT_WORLD_EVENT, _world_event_row(event))
+            if commit and not self._batching:
+                self._commit()
     
-    def list_world_events(self, event_type: Optional[str] = None, limit: int = 100) -> list[WorldEvent]:
-        """List world events, optionally filtered by type."""
-        if event_type:
-            cursor = self.conn.execute(
-                "SELECT * FROM world_events WHERE event_type = ? ORDER BY timestamp DESC LIMIT ?",
-                (event_type, limit)
-            )
-        else:
-            cursor = self.conn.execute(
-                "SELECT * FROM world_events ORDER BY timestamp DESC LIMIT ?",
-                (limit,)
-            )
-        return [
-            WorldEvent(
-                id=row["id"],
-                event_type=row["event_type"],
-                title=row["title"],
-                description=row["description"],
-                location=row["location"],
-                campaign_id=row["campaign_id"],
-                timestamp=datetime.fromisoformat(row["timestamp"]),
-                data=json.loads(row["data"]),
-            )
-            for row in cursor
-        ]
+    def list_world_events(
+        self,
+        event_type: Optional[str] = None,
+        limit: int = 100,
+        include_data: bool = True,
+    ) -> list[WorldEvent]:
+        """List world events, optionally filtered by type.
+        
+        Args:
+            event_type: Only list events of this type
+            limit: Most events to return, newest first
+            include_data: Load each event's data; when False, data is left
+                empty and the JSON is never read or parsed
+        """
+        with self._reader() as conn:
+            if event_type:
+                sql = _LIST_WORLD_EVENTS_BY_TYPE if include_data else _LIST_WORLD_EVENTS_BY_TYPE_NO_DATA
+                cursor = conn.execute(sql, (event_type, limit))
+            else:
+                sql = _LIST_WORLD_EVENTS if include_data else _LIST_WORLD_EVENTS_NO_DATA
+                cursor = conn.execute(sql, (limit,))
+            cursor.row_factory = _world_event_from_row
+            return list(cursor)
     
     def get_world_history_summary(self, limit: int = 10) -> str:
-        """Get a summary of recent world history for LLM context."""
-        events = self.list_world_events(limit=limit)
-        deaths = self.list_npc_deaths(limit=5)
+        """Get a summary of recent world history for LLM context.
+        
+        Lists at most SUMMARY_ITEMS events (fewer if limit is lower) and
+        SUMMARY_ITEMS deaths; only those rows are read.
+        """
+        events = self.list_world_events(limit=min(limit, self.SUMMARY_ITEMS), include_data=False)
+        deaths = self.list_npc_deaths(limit=self.SUMMARY_ITEMS)
         factions = self.list_faction_standings()
         
         summary_parts = []
         
         if events:
             summary_parts.append("Recent world events:")
-            for event in events[:5]:
+            for event in events:
                 summary_parts.append(f"- {event.title}: {event.description}")
         
         if deaths:
@@ -415,26 +597,123 @@ class WorldStateDB:
     
     def export_all(self) -> dict:
         """Export entire world state."""
-        return {
-            "factions": [f.to_dict() for f in self.list_faction_standings()],
-            "npc_deaths": [d.to_dict() for d in self.list_npc_deaths(limit=1000)],
-            "world_events": [e.to_dict() for e in self.list_world_events(limit=1000)],
-        }
+        limit = (self.EXPORT_LIMIT,)
+        with self._reader() as conn:
+            return {
+                "factions": _loads(conn.execute(_EXPORT_FACTIONS).fetchone()[0]),
+                "npc_deaths": _loads(conn.execute(_EXPORT_NPC_DEATHS, limit).fetchone()[0]),
+                "world_events": _loads(conn.execute(_EXPORT_WORLD_EVENTS, limit).fetchone()[0]),
+            }
     
     def import_all(self, data: dict) -> None:
-        """Import world state from exported data."""
-        for f_data in data.get("factions", []):
-            self.set_faction_standing(FactionStanding.from_dict(f_data))
+        """Import world state from exported data.
         
-        for d_data in data.get("npc_deaths", []):
-            death = NPCDeath.from_dict(d_data)
-            # Skip if already exists
-            if not self.is_npc_dead(death.npc_name):
-                self.record_npc_death(death)
-        
-        for e_data in data.get("world_events", []):
-            event = WorldEvent.from_dict(e_data)
-            self.record_world_event(event)
+        Runs as a single transaction, rolled back if any record fails;
+        inside transaction() it joins the outer block instead. NPCs that
+        already have a death record, and events already recorded, are
+        skipped. Rows are bound straight from the exported dicts, whose
+        timestamps are already in the stored format.
+        """
+        conn = self.conn
+        with self.transaction():
+            conn.executemany(_INSERT_FACTION, [
+                (f["faction_id"], f["faction_name"], f["standing"])
+                for f in data.get("factions", [])
+            ])
+            conn.executemany(_IMPORT_NPC_DEATH, [
+                (d["id"], d["npc_name"], d.get("npc_id"), d["location"],
+                 d["cause"], d["campaign_id"], d["timestamp"])
+                for d in data.get("npc_deaths", [])
+            ])
+            conn.executemany(_IMPORT_WORLD_EVENT, [
+                (e["id"], e["event_type"], e["title"], e["description"], e.get("location"),
+                 e["campaign_id"], e["timestamp"], _dumps(e.get("data", {})))
+                for e in data.get("world_events", [])
+            ])
+
+
+# Row factories for the list methods; columns arrive in field order
+
+def _faction_from_row(cursor: sqlite3.Cursor, row: tuple) -> FactionStanding:
+    return FactionStanding(*row)
+
+
+def _npc_death_from_row(cursor: sqlite3.Cursor, row: tuple) -> NPCDeath:
+    return NPCDeath(*row)
+
+
+def _world_event_from_row(cursor: sqlite3.Cursor, row: tuple) -> WorldEvent:
+    id_, event_type, title, description, location, campaign_id, timestamp, data = row
+    return WorldEvent(
+        id_, event_type, title, description, location, campaign_id, timestamp,
+        _loads(data) if data is not None else {},
+    )
+
+
+# Row builders shared by single and bulk inserts
+
+def _npc_death_row(death: NPCDeath) -> tuple:
+    return (death.id, death.npc_name, death.npc_id, death.location,
+            death.cause, death.campaign_id, death.timestamp.isoformat())
+
+
+def _world_event_row(event: WorldEvent) -> tuple:
+    return (event.id, event.event_type, event.title, event.description,
+            event.location, event.campaign_id, event.timestamp.isoformat(),
+            _dumps(event.data))
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    """Create missing tables, analyzing a new database once.
+    
+    The initial ANALYZE gives the planner statistics from the first query
+    on; close() and periodic optimize() keep them current afterwards.
+    """
+    conn.executescript(WORLD_STATE_SCHEMA)
+    analyzed = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+    ).fetchone()
+    if analyzed is None:
+        conn.execute("ANALYZE")
+    conn.commit()
+
+
+def _apply_pragmas(conn: sqlite3.Connection) -> None:
+    """Apply connection settings shared by file and in-memory databases."""
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -20000")  # 20 MB
+
+
+def _connect_writer(path: Path) -> sqlite3.Connection:
+    """Open a write connection to a file database.
+    
+    Every thread writes through this one connection, taking the
+    database's writer lock, so check_same_thread is off.
+    """
+    conn = sqlite3.connect(
+        str(path),
+        detect_types=sqlite3.PARSE_COLNAMES,
+        cached_statements=_CACHED_STATEMENTS,
+        check_same_thread=False,
+    )
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA mmap_size = 268435456")
+    _apply_pragmas(conn)
+    return conn
+
+
+def _connect_reader(path: Path) -> sqlite3.Connection:
+    """Open a read-only connection that the reader pool can hand to any thread."""
+    conn = sqlite3.connect(
+        str(path),
+        detect_types=sqlite3.PARSE_COLNAMES,
+        cached_statements=_CACHED_STATEMENTS,
+        check_same_thread=False,
+    )
+    conn.execute("PRAGMA query_only = ON")
+    conn.execute("PRAGMA mmap_size = 268435456")
+    _apply_pragmas(conn)
+    return conn
 
 
 def get_world_state_path() -> Path:
@@ -442,6 +721,40 @@ def get_world_state_path() -> Path:
     return Path.home() / ".config" / "reverie" / "world_state.db"
 
 
-def open_world_state() -> WorldStateDB:
-    """Open the world state database at the default location."""
-    return WorldStateDB.open(get_world_state_path())
+# Process-wide database returned by open_world_state()
+_world_state: Optional[WorldStateDB] = None
+_world_state_lock = threading.Lock()
+
+
+def open_world_state(path: Optional[Path] = None) -> WorldStateDB:
+    """Open the shared world state database.
+    
+    Every caller shares one instance, opened on first use. The module
+    owns it: callers must not close() it, but use close_world_state().
+    Asking for a different path closes the current instance and opens
+    the new one.
+    
+    Args:
+        path: Database file (default: get_world_state_path())
+    
+    Returns:
+        The shared WorldStateDB
+    """
+    global _world_state
+    path = path or get_world_state_path()
+    with _world_state_lock:
+        db = _world_state
+        if db is not None and not db.closed and db._path != path:
+            db.close()
+        if db is None or db.closed or db._path != path:
+            db = _world_state = WorldStateDB.open(path)
+        return db
+
+
+def close_world_state() -> None:
+    """Close the shared database. The next open_world_state() opens a new one."""
+    global _world_state
+    with _world_state_lock:
+        if _world_state is not None:
+            _world_state.close()
+            _world_state = None
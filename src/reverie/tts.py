@@ -4,14 +4,26 @@ Uses edge-tts for high-quality async speech synthesis.
 """
 
 import asyncio
+import hashlib
 import os
+import platform
+import re
+import secrets
+import shutil
+import socket
 import tempfile
 import threading
+import time
+from concurrent.futures import Future
+from contextlib import aclosing
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Callable
+from typing import AsyncIterator, Optional, Callable
 import subprocess
 
+from . import jsonutil
+
 try:
     import edge_tts
     EDGE_TTS_AVAILABLE = True
@@ -19,6 +31,143 @@ except ImportError:
     EDGE_TTS_AVAILABLE = False
 
 
+# Sentence boundaries used to split long narration for pipelined playback
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# Sentences synthesized ahead of the one playing
+SYNTH_AHEAD = 2
+
+# Synthesized audio kept for replay; oldest files go first past this size
+CACHE_MAX_BYTES = 100 * 1024 * 1024
+
+# Seconds a stopped player gets to exit before it is killed
+STOP_TIMEOUT = 0.5
+
+# Partial files older than this were left behind by a crashed synthesis
+STALE_PARTIAL_SECONDS = 6 * 3600
+
+# Players that can decode MP3 from stdin, so audio plays while it streams
+STREAM_PLAYERS = {
+    "mpv": ["mpv", "--no-video", "--cache=no", "--really-quiet", "-"],
+    "ffplay": ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", "-i", "-"],
+}
+
+
+class MpvPlayer:
+    """A long-lived mpv process that plays files sent over its IPC socket.
+    
+    Starting mpv and opening the audio device once per session avoids a
+    fork/exec and device setup for every line of narration.
+    """
+
+    # Seconds to wait for mpv to create its socket
+    START_TIMEOUT = 2.0
+
+    def __init__(self, socket_path: Path):
+        """Prepare the player; mpv starts on the first play().
+        
+        Args:
+            socket_path: Where mpv should create its IPC socket
+        """
+        self.socket_path = socket_path
+        self._process: Optional[subprocess.Popen] = None
+        self._sock: Optional[socket.socket] = None
+        self._events = None
+        self._send_lock = threading.Lock()
+        # One play() reads events at a time, so each sees its own end-file
+        self._play_lock = threading.Lock()
+
+    @staticmethod
+    def supported() -> bool:
+        """Check that mpv is installed and IPC sockets are available."""
+        return hasattr(socket, "AF_UNIX") and shutil.which("mpv") is not None
+
+    def _ensure_started(self):
+        """Launch mpv and connect to its socket if not already running."""
+        if self._process is not None and self._process.poll() is None:
+            return
+        self.socket_path.unlink(missing_ok=True)
+        self._process = subprocess.Popen(
+            [
+                "mpv", "--idle=yes", "--no-video", "--no-terminal", "--cache=no",
+                f"--input-ipc-server={self.socket_path}",
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + self.START_TIMEOUT
+        while True:
+            try:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.connect(str(self.socket_path))
+                break
+            except OSError:
+                sock.close()
+                if time.monotonic() >= deadline:
+                    self.close()
+                    raise
+                time.sleep(0.02)
+        self._sock = sock
+        self._events = sock.makefile("rb")
+
+    def _send(self, *command: str):
+        """Send one IPC command."""
+        message = jsonutil.dumps_bytes({"command": list(command)}) + b"\n"
+        with self._send_lock:
+            self._sock.sendall(message)
+
+    def play(self, path: Path):
+        """Play a file, returning when it ends or stop() is called.
+        
+        Calls from several threads take turns; a stopped call returns
+        before the next one loads its file.
+        """
+        with self._play_lock:
+            self._ensure_started()
+            self._send("loadfile", str(path), "replace")
+            # Skip events left over from earlier files until this one starts
+            entry = None
+            started = False
+            for line in self._events:
+                message = jsonutil.loads(line)
+                event = message.get("event")
+                if event == "start-file":
+                    entry = message.get("playlist_entry_id")
+                    started = True
+                elif (event == "end-file" and started
+                        and message.get("playlist_entry_id") == entry):
+                    return
+            raise ConnectionError("mpv exited")
+
+    def stop(self):
+        """Stop the current file, leaving mpv running."""
+        if self._sock is not None:
+            try:
+                self._send("stop")
+            except OSError:
+                pass
+
+    def close(self):
+        """Quit mpv and remove its socket."""
+        if self._sock is not None:
+            try:
+                self._send("quit")
+            except OSError:
+                pass
+            self._events.close()
+            self._sock.close()
+            self._sock = None
+            self._events = None
+        if self._process is not None:
+            try:
+                self._process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+            self._process = None
+        self.socket_path.unlink(missing_ok=True)
+
+
 @dataclass
 class TTSConfig:
     """TTS configuration."""
@@ -44,9 +193,29 @@ class TTSEngine:
         """
         self.config = config or TTSConfig()
         self._current_process: Optional[subprocess.Popen] = None
-        self._playback_thread: Optional[threading.Thread] = None
+        # One event loop, started on first use, runs every utterance
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._future: Optional[Future] = None
+        # File player argv with a {path} placeholder, None if none is installed
+        self._player_cmd: Optional[list[str]] = find_file_player()
+        # Stdin player argv, looked up on first use
+        self._stream_cmd: Optional[list[str]] = None
+        self._stream_cmd_checked = False
+        # Shared mpv for file playback, when mpv is installed
+        self._mpv: Optional[MpvPlayer] = None
+        self._mpv_checked = False
+        # Bumped by stop() so a sentence pipeline knows to give up
+        self._generation = 0
+        # Also the audio cache, keyed by text and voice settings
         self._temp_dir = Path(tempfile.gettempdir()) / "reverie_tts"
         self._temp_dir.mkdir(exist_ok=True)
+        threading.Thread(
+            target=sweep_cache,
+            args=(self._temp_dir, CACHE_MAX_BYTES),
+            name="reverie-tts-sweep",
+            daemon=True,
+        ).start()
 
     @property
     def available(self) -> bool:
@@ -69,20 +238,24 @@ class TTSEngine:
         # Cancel any current playback
         self.stop()
 
-        # Start playback in background thread
-        self._playback_thread = threading.Thread(
-            target=self._speak_async,
-            args=(text, callback),
-            daemon=True,
+        # Run on the background loop
+        self._future = asyncio.run_coroutine_threadsafe(
+            self._speak_async(text, callback), self._ensure_loop()
         )
-        self._playback_thread.start()
         return True
 
-    def _speak_async(self, text: str, callback: Optional[Callable[[], None]] = None):
-        """Synthesize and play speech (runs in thread)."""
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background event loop if it isn't running yet."""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+            self._loop_thread.start()
+        return self._loop
+
+    async def _speak_async(self, text: str, callback: Optional[Callable[[], None]] = None):
+        """Synthesize and play speech (runs on the background loop)."""
         try:
-            # Run async synthesis
-            asyncio.run(self._synthesize_and_play(text))
+            await self._synthesize_and_play(text)
         except Exception:
             pass  # Silently ignore TTS errors
         finally:
@@ -90,58 +263,160 @@ class TTSEngine:
                 callback()
 
     async def _synthesize_and_play(self, text: str):
-        """Synthesize text to audio and play it."""
-        # Generate unique temp file
-        audio_path = self._temp_dir / f"speech_{id(text)}.mp3"
+        """Synthesize text to audio and play it.
+        
+        Streams audio into a stdin-capable player when one is installed,
+        so playback starts with the first chunk; otherwise synthesizes to
+        a temp file for the system player. Audio synthesized before is
+        replayed from the cache without contacting edge-tts.
+        """
+        cmd = self._stream_command()
+        if cmd is None:
+            await self._play_sentences(text)
+            return
+        audio_path = self._cache_path(text)
+        if _is_cached(audio_path):
+            if self._file_player() is not None:
+                # A complete file can go straight to the running mpv
+                await asyncio.to_thread(self._play_audio, audio_path)
+                return
+            chunks = _read_cached(audio_path)
+        else:
+            chunks = self._stream_to_cache(self._communicate(text), audio_path)
+        await self._stream_audio(chunks, cmd)
+
+    def _cache_path(self, text: str) -> Path:
+        """Get the cache file for text spoken with the current voice settings."""
+        config = self.config
+        key = f"{config.voice}|{config.rate}|{config.volume}|{config.pitch}|{text}"
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        return self._temp_dir / f"{digest}.mp3"
 
+    async def _synthesize(self, text: str) -> Path:
+        """Synthesize text into the cache, unless it is already there."""
+        audio_path = self._cache_path(text)
+        if not _is_cached(audio_path):
+            # Written aside and renamed, so a partial file is never cached
+            partial = _partial_path(audio_path)
+            await self._communicate(text).save(str(partial))
+            os.replace(partial, audio_path)
+        return audio_path
+
+    async def _stream_to_cache(self, communicate, audio_path: Path) -> AsyncIterator[bytes]:
+        """Yield audio from edge-tts, caching it once the stream completes."""
+        partial = _partial_path(audio_path)
         try:
-            # Synthesize with edge-tts
-            communicate = edge_tts.Communicate(
-                text,
-                self.config.voice,
-                rate=self.config.rate,
-                volume=self.config.volume,
-                pitch=self.config.pitch,
+            with open(partial, "wb") as f:
+                async for chunk in communicate.stream():
+                    if chunk["type"] == "audio":
+                        f.write(chunk["data"])
+                        yield chunk["data"]
+            os.replace(partial, audio_path)
+        finally:
+            partial.unlink(missing_ok=True)
+
+    def _communicate(self, text: str):
+        """Create an edge-tts synthesis request using the configured voice."""
+        return edge_tts.Communicate(
+            text,
+            self.config.voice,
+            rate=self.config.rate,
+            volume=self.config.volume,
+            pitch=self.config.pitch,
+        )
+
+    def _stream_command(self) -> Optional[list[str]]:
+        """Get the command for the first installed streaming player."""
+        if not self._stream_cmd_checked:
+            self._stream_cmd = next(
+                (cmd for player, cmd in STREAM_PLAYERS.items() if shutil.which(player)), None
             )
-            await communicate.save(str(audio_path))
+            self._stream_cmd_checked = True
+        return self._stream_cmd
 
-            # Play audio
-            self._play_audio(audio_path)
+    async def _stream_audio(self, chunks: AsyncIterator[bytes], cmd: list[str]):
+        """Pipe audio chunks into the player as they arrive."""
+        process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self._current_process = process
+        try:
+            async with aclosing(chunks):
+                async for data in chunks:
+                    if self._current_process is not process:
+                        return  # Stopped or replaced
+                    try:
+                        # A full pipe blocks until the player catches up
+                        await asyncio.to_thread(process.stdin.write, data)
+                    except (BrokenPipeError, ValueError):
+                        return  # Player exited or was stopped
+            # End of input lets the player finish what it has buffered
+            self._close_stdin(process)
+            await asyncio.to_thread(process.wait)
         finally:
-            # Cleanup temp file
+            self._close_stdin(process)
+            if self._current_process is process:
+                self._current_process = None
+
+    @staticmethod
+    def _close_stdin(process: subprocess.Popen):
+        """Close a player's stdin, ignoring a player that already exited."""
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+
+    async def _play_sentences(self, text: str):
+        """Synthesize into the cache sentence by sentence, playing as they're ready.
+        
+        The next SYNTH_AHEAD sentences synthesize while the current one
+        plays, so the first sentence is heard without waiting for the rest.
+        """
+        generation = self._generation
+        ready: asyncio.Queue[Optional[Path]] = asyncio.Queue(maxsize=SYNTH_AHEAD)
+
+        async def produce():
             try:
-                audio_path.unlink(missing_ok=True)
-            except Exception:
-                pass
+                for sentence in split_sentences(text):
+                    if self._generation != generation:
+                        break
+                    await ready.put(await self._synthesize(sentence))
+            finally:
+                await ready.put(None)
+
+        async def consume():
+            # Drains the queue even after stop(), so produce() never blocks
+            while (audio_path := await ready.get()) is not None:
+                if self._generation == generation:
+                    await asyncio.to_thread(self._play_audio, audio_path)
+
+        await asyncio.gather(produce(), consume())
+
+    def _file_player(self) -> Optional[MpvPlayer]:
+        """Get the shared mpv player, or None if it can't be used."""
+        if not self._mpv_checked:
+            if MpvPlayer.supported():
+                self._mpv = MpvPlayer(self._temp_dir / f"mpv-{os.getpid()}.sock")
+            self._mpv_checked = True
+        return self._mpv
 
     def _play_audio(self, path: Path):
-        """Play audio file using system player."""
-        import platform
-
-        system = platform.system()
-
-        if system == "Darwin":  # macOS
-            cmd = ["afplay", str(path)]
-        elif system == "Linux":
-            # Try different players
-            for player in ["aplay", "paplay", "mpv", "ffplay"]:
-                if self._command_exists(player):
-                    if player in ("mpv", "ffplay"):
-                        cmd = [player, "-nodisp", "-autoexit", str(path)]
-                    else:
-                        cmd = [player, str(path)]
-                    break
-            else:
-                return  # No player found
-        elif system == "Windows":
-            # Use PowerShell to play audio
-            cmd = [
-                "powershell",
-                "-c",
-                f'(New-Object Media.SoundPlayer "{path}").PlaySync()',
-            ]
-        else:
-            return  # Unknown system
+        """Play audio file using the shared mpv, or else a system player."""
+        mpv = self._file_player()
+        if mpv is not None:
+            try:
+                mpv.play(path)
+                return
+            except (OSError, ValueError):
+                # mpv didn't start or went away; use a player per file
+                mpv.close()
+                self._mpv = None
+        if self._player_cmd is None:
+            return  # No player found
+        cmd = [arg.replace("{path}", str(path)) for arg in self._player_cmd]
 
         try:
             self._current_process = subprocess.Popen(
@@ -155,30 +430,39 @@ class TTSEngine:
         finally:
             self._current_process = None
 
-    def _command_exists(self, cmd: str) -> bool:
-        """Check if a command exists on the system."""
-        try:
-            subprocess.run(
-                ["which", cmd],
-                capture_output=True,
-                check=True,
-            )
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
-
     def stop(self):
         """Stop current playback."""
-        if self._current_process:
+        self._generation += 1
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+        process = self._current_process
+        self._current_process = None
+        if process:
             try:
-                self._current_process.terminate()
-                self._current_process.wait(timeout=1)
-            except Exception:
-                try:
-                    self._current_process.kill()
-                except Exception:
-                    pass
-            self._current_process = None
+                process.terminate()
+                # Closes a streaming player's stdin and reaps it in one call
+                process.communicate(timeout=STOP_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+            except (OSError, ValueError):
+                pass  # Already exited
+        if self._mpv is not None:
+            self._mpv.stop()
+
+    def close(self):
+        """Stop playback, quit mpv and shut down the background event loop."""
+        self.stop()
+        if self._mpv is not None:
+            self._mpv.close()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join(timeout=1)
+            if not self._loop_thread.is_alive():
+                self._loop.close()
+            self._loop = None
+            self._loop_thread = None
 
     def set_enabled(self, enabled: bool):
         """Enable or disable TTS."""
@@ -225,6 +509,119 @@ VOICES = {
 }
 
 
+def find_file_player() -> Optional[list[str]]:
+    """Find the system player for audio files.
+    
+    Returns:
+        Player argv with a {path} placeholder, or None if none is installed
+    """
+    system = platform.system()
+
+    if system == "Darwin":  # macOS
+        return ["afplay", "{path}"]
+    if system == "Linux":
+        # Try different players
+        for player in ["aplay", "paplay", "mpv", "ffplay"]:
+            if shutil.which(player):
+                if player in ("mpv", "ffplay"):
+                    return [player, "-nodisp", "-autoexit", "{path}"]
+                return [player, "{path}"]
+        return None
+    if system == "Windows":
+        # Use PowerShell to play audio
+        return [
+            "powershell",
+            "-c",
+            '(New-Object Media.SoundPlayer "{path}").PlaySync()',
+        ]
+    return None  # Unknown system
+
+
+def _partial_path(audio_path: Path) -> Path:
+    """Get a unique file to synthesize into before it is renamed to audio_path.
+    
+    The cache name is the same for every speaker of the same line, so
+    the process ID and a random token keep concurrent syntheses apart.
+    """
+    return audio_path.with_name(f"{audio_path.stem}.{os.getpid()}.{secrets.token_hex(3)}.tmp")
+
+
+def _is_cached(audio_path: Path) -> bool:
+    """Check for a complete cache file, marking it recently used."""
+    try:
+        if audio_path.stat().st_size == 0:
+            return False
+        os.utime(audio_path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+async def _read_cached(audio_path: Path) -> AsyncIterator[bytes]:
+    """Yield a cached file's audio as a single chunk."""
+    yield audio_path.read_bytes()
+
+
+def evict_cache(cache_dir: Path, max_bytes: int) -> None:
+    """Delete the least recently used cached audio until under max_bytes.
+    
+    Args:
+        cache_dir: Directory holding cached .mp3 files
+        max_bytes: Largest total size to keep
+    """
+    entries = []
+    for path in cache_dir.glob("*.mp3"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def sweep_cache(cache_dir: Path, max_bytes: int) -> None:
+    """Tidy the cache directory; run once at startup, off the main thread.
+    
+    Removes empty audio files and partial files abandoned by crashed
+    syntheses, then evicts cached audio down to max_bytes.
+    
+    Args:
+        cache_dir: Directory holding cached .mp3 and partial .tmp files
+        max_bytes: Largest total size of cached audio to keep
+    """
+    # Newer partials may belong to another process still synthesizing
+    cutoff = time.time() - STALE_PARTIAL_SECONDS
+    for path in cache_dir.iterdir():
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        if path.suffix == ".mp3" and stat.st_size == 0:
+            path.unlink(missing_ok=True)
+        elif path.suffix == ".tmp" and stat.st_mtime < cutoff:
+            path.unlink(missing_ok=True)
+    evict_cache(cache_dir, max_bytes)
+
+
+@lru_cache(maxsize=256)
+def split_sentences(text: str) -> tuple[str, ...]:
+    """Split text into sentences for pipelined synthesis.
+    
+    Memoized, since the same narration (a location's look text, say)
+    is often spoken more than once.
+    """
+    return tuple(s for s in _SENTENCE_END.split(text.strip()) if s)
+
+
+# Short names in the order list_voices() returns them
+_VOICE_NAMES = tuple(sorted(VOICES))
+
+
 def get_voice_name(short_name: str) -> str:
     """Get full voice name from short name."""
     return VOICES.get(short_name.lower(), short_name)
@@ -232,4 +629,4 @@ def get_voice_name(short_name: str) -> str:
 
 def list_voices() -> list[str]:
     """List available voice short names."""
-    return sorted(VOICES.keys())
+    return list(_VOICE_NAMES)
@@ -1,14 +1,51 @@
 """Main Textual application for Reverie."""
 
+from functools import partial
 from textual.app import App, ComposeResult
 from textual.binding import Binding
-from textual.widgets import Header, Footer, Input, Static
+from textual.widgets import Header, Footer, Input, RichLog, Static
 from textual.containers import Container, Vertical, Horizontal
 from typing import Optional, TYPE_CHECKING
 
+from .. import game as game_api
+
 if TYPE_CHECKING:
     from ..game import Game
 
+# Lines the narration log keeps on screen; entries often span several
+NARRATION_MAX_LINES = 1000
+
+HELP_TEXT = """HELP
+
+COMMANDS:
+  look      - Examine surroundings
+  go <dir>  - Move (north, south, etc.)
+  talk <n>  - Speak with NPC
+  roll [s]  - Roll d20 (with stat)
+  inventory - Check items
+  stats     - View character
+  quests    - View quests
+  map       - Discovered locations
+  npcs      - Known NPCs
+  save      - Save game
+  help      - Show this help
+  quit      - Exit game
+
+KEYS:
+  C - Character sheet
+  I - Inventory
+  Q - Quest log
+  M - Map/locations
+  N - NPC relationships
+  ? - Help
+  Ctrl+Q - Quit
+
+Type actions naturally:
+  "search the room"
+  "pick up the sword"
+  "attack the goblin"
+"""
+
 
 class ReverieApp(App):
     """The main Reverie TUI application."""
@@ -47,10 +84,6 @@ class ReverieApp(App):
         display: none;
     }
     
-    .side-panel.visible {
-        display: block;
-    }
-    
     #help-panel {
         border: solid yellow;
     }
@@ -94,9 +127,22 @@ class ReverieApp(App):
         """
         super().__init__(**kwargs)
         self.game = game
-        self._narration_history: list[str] = []
+        # True once the narration log has an entry to separate from
+        self._has_narration: bool = False
         self._auto_save_pending: bool = False
         self._auto_save_timer = None
+        # True while a turn is being processed in a worker thread
+        self._turn_running: bool = False
+        # Widgets looked up once in on_mount
+        self._narration: Optional[RichLog] = None
+        self._status: Optional[Static] = None
+        self._char_panel: Optional[Static] = None
+        self._inv_panel: Optional[Static] = None
+        self._quest_panel: Optional[Static] = None
+        self._map_panel: Optional[Static] = None
+        self._npcs_panel: Optional[Static] = None
+        self._help_panel: Optional[Static] = None
+        self._input: Optional[Input] = None
     
     def compose(self) -> ComposeResult:
         """Create the UI layout."""
@@ -104,7 +150,7 @@ class ReverieApp(App):
         
         with Horizontal(id="main-container"):
             with Vertical(id="game-area"):
-                yield Static("", id="narration-panel")
+                yield RichLog(id="narration-panel", wrap=True, markup=True, max_lines=NARRATION_MAX_LINES)
                 yield Static("", id="status-bar")
                 with Container(id="input-container"):
                     yield Input(placeholder="> What do you do?", id="player-input")
@@ -124,6 +170,16 @@ class ReverieApp(App):
         self.title = "REVERIE"
         self.sub_title = "An AI Dungeon Master"
         
+        self._narration = self.query_one("#narration-panel", RichLog)
+        self._status = self.query_one("#status-bar", Static)
+        self._char_panel = self.query_one("#character-panel", Static)
+        self._inv_panel = self.query_one("#inventory-panel", Static)
+        self._quest_panel = self.query_one("#quest-panel", Static)
+        self._map_panel = self.query_one("#map-panel", Static)
+        self._npcs_panel = self.query_one("#npcs-panel", Static)
+        self._help_panel = self.query_one("#help-panel", Static)
+        self._input = self.query_one("#player-input", Input)
+        
         # Show initial narration
         if self.game:
             self._show_initial_state()
@@ -131,11 +187,10 @@ class ReverieApp(App):
             self._add_narration("Welcome to Reverie. No game loaded.")
         
         # Update help panel
-        help_panel = self.query_one("#help-panel", Static)
-        help_panel.update(self._get_help_text())
+        self._help_panel.update(self._get_help_text())
         
         # Focus input
-        self.query_one("#player-input", Input).focus()
+        self._input.focus()
     
     def _show_initial_state(self) -> None:
         """Show the initial game state."""
@@ -144,8 +199,7 @@ class ReverieApp(App):
         
         # Show location if available
         if self.game.state.location:
-            from ..game import handle_command
-            look_result = handle_command(self.game, "look")
+            look_result = game_api.handle_command(self.game, "look")
             self._add_narration(look_result)
         else:
             self._add_narration("You find yourself... somewhere.")
@@ -153,16 +207,14 @@ class ReverieApp(App):
         self._update_status_bar()
     
     def _add_narration(self, text: str) -> None:
-        """Add text to the narration panel."""
-        self._narration_history.append(text)
-        
-        # Keep last 50 entries
-        if len(self._narration_history) > 50:
-            self._narration_history = self._narration_history[-50:]
+        """Add text to the narration panel.
         
-        # Update display
-        panel = self.query_one("#narration-panel", Static)
-        panel.update("\n\n".join(self._narration_history))
+        The log only renders the new entry; earlier ones stay as they are.
+        """
+        if self._has_narration:
+            self._narration.write("")  # Blank line between entries
+        self._narration.write(text)
+        self._has_narration = True
     
     def _update_status_bar(self) -> None:
         """Update the status bar with current state."""
@@ -185,52 +237,52 @@ class ReverieApp(App):
             status_parts.append("[COMBAT]")
         
         status = " | ".join(status_parts)
-        self.query_one("#status-bar", Static).update(status)
+        self._status.update(status)
     
     def _update_character_panel(self) -> None:
-        """Update the character panel."""
-        if not self.game:
+        """Update the character panel if it is showing."""
+        panel = self._char_panel
+        if not self.game or self._turn_running or not panel.display:
             return
         
-        from ..game import handle_command
-        stats_text = handle_command(self.game, "stats")
-        self.query_one("#character-panel", Static).update(stats_text)
+        stats_text = game_api.handle_command(self.game, "stats")
+        panel.update(stats_text)
     
     def _update_inventory_panel(self) -> None:
-        """Update the inventory panel."""
-        if not self.game:
+        """Update the inventory panel if it is showing."""
+        panel = self._inv_panel
+        if not self.game or self._turn_running or not panel.display:
             return
         
-        from ..game import handle_command
-        inv_text = handle_command(self.game, "inventory")
-        self.query_one("#inventory-panel", Static).update(inv_text)
+        inv_text = game_api.handle_command(self.game, "inventory")
+        panel.update(inv_text)
     
     def _update_quest_panel(self) -> None:
-        """Update the quest panel."""
-        if not self.game:
+        """Update the quest panel if it is showing."""
+        panel = self._quest_panel
+        if not self.game or self._turn_running or not panel.display:
             return
         
-        from ..game import handle_command
-        quest_text = handle_command(self.game, "quests")
-        self.query_one("#quest-panel", Static).update(quest_text)
+        quest_text = game_api.handle_command(self.game, "quests")
+        panel.update(quest_text)
     
     def _update_map_panel(self) -> None:
-        """Update the map panel."""
-        if not self.game:
+        """Update the map panel if it is showing."""
+        panel = self._map_panel
+        if not self.game or self._turn_running or not panel.display:
             return
         
-        from ..game import handle_command
-        map_text = handle_command(self.game, "map")
-        self.query_one("#map-panel", Static).update(map_text)
+        map_text = game_api.handle_command(self.game, "map")
+        panel.update(map_text)
     
     def _update_npcs_panel(self) -> None:
-        """Update the NPCs panel."""
-        if not self.game:
+        """Update the NPCs panel if it is showing."""
+        panel = self._npcs_panel
+        if not self.game or self._turn_running or not panel.display:
             return
         
-        from ..game import handle_command
-        npcs_text = handle_command(self.game, "npcs")
-        self.query_one("#npcs-panel", Static).update(npcs_text)
+        npcs_text = game_api.handle_command(self.game, "npcs")
+        panel.update(npcs_text)
     
     def _schedule_auto_save(self) -> None:
         """Schedule an auto-save with 5 second debounce."""
@@ -254,48 +306,26 @@ class ReverieApp(App):
         if not self._auto_save_pending or not self.game:
             return
         
+        # The running turn schedules another save when it finishes
+        if self._turn_running:
+            return
+        
         try:
-            from ..game import save_state
-            save_state(self.game.state, self.game.db)
+            game_api.save_state(self.game.state, self.game.db)
             self._auto_save_pending = False
         except Exception:
             pass  # Silent fail for auto-save
     
     def _get_help_text(self) -> str:
         """Get the help text."""
-        return """HELP
-
-COMMANDS:
-  look      - Examine surroundings
-  go <dir>  - Move (north, south, etc.)
-  talk <n>  - Speak with NPC
-  roll [s]  - Roll d20 (with stat)
-  inventory - Check items
-  stats     - View character
-  quests    - View quests
-  map       - Discovered locations
-  npcs      - Known NPCs
-  save      - Save game
-  help      - Show this help
-  quit      - Exit game
-
-KEYS:
-  C - Character sheet
-  I - Inventory
-  Q - Quest log
-  M - Map/locations
-  N - NPC relationships
-  ? - Help
-  Ctrl+Q - Quit
-
-Type actions naturally:
-  "search the room"
-  "pick up the sword"
-  "attack the goblin"
-"""
+        return HELP_TEXT
     
-    async def on_input_submitted(self, event: Input.Submitted) -> None:
+    def on_input_submitted(self, event: Input.Submitted) -> None:
         """Handle player input submission."""
+        # One turn at a time; the text stays in the box to send afterwards
+        if self._turn_running:
+            return
+        
         user_input = event.value.strip()
         event.input.value = ""
         
@@ -311,62 +341,74 @@ Type actions naturally:
             self.exit()
             return
         
-        # Process input through game
-        from ..game import process_input, check_triggers
-        
-        response = process_input(self.game, user_input)
-        self._add_narration(response)
+        # Process input through game in a worker thread, so this handler
+        # returns and the app keeps handling keys while the turn runs
+        self._turn_running = True
+        self.run_worker(
+            partial(self._run_turn, user_input),
+            name="turn",
+            group="turn",
+            exclusive=True,
+            thread=True,
+        )
+    
+    def _run_turn(self, user_input: str) -> None:
+        """Run one game turn; called in a worker thread."""
+        response = game_api.process_input(self.game, user_input)
         
         # Check for triggers
-        triggers = check_triggers(self.game)
-        for trigger in triggers:
-            self._add_narration(f">>> {trigger}")
+        triggers = game_api.check_triggers(self.game)
         
-        # Update UI
-        self._update_status_bar()
-        self._update_character_panel()
-        self._update_inventory_panel()
-        self._update_quest_panel()
-        self._update_map_panel()
-        self._update_npcs_panel()
+        self.call_from_thread(self._finish_turn, response, triggers)
+    
+    def _finish_turn(self, response: str, triggers: list[str]) -> None:
+        """Show a finished turn's results; called on the app thread."""
+        self._turn_running = False
+        
+        # Update UI in one repaint; hidden panels skip their update until toggled on
+        with self.batch_update():
+            self._add_narration(response)
+            for trigger in triggers:
+                self._add_narration(f">>> {trigger}")
+            
+            self._update_status_bar()
+            self._update_character_panel()
+            self._update_inventory_panel()
+            self._update_quest_panel()
+            self._update_map_panel()
+            self._update_npcs_panel()
         
         # Auto-save if enabled (debounced via set_timer)
         self._schedule_auto_save()
     
     def action_toggle_character(self) -> None:
         """Toggle character panel visibility."""
-        panel = self.query_one("#character-panel", Static)
+        self._char_panel.display = not self._char_panel.display
         self._update_character_panel()
-        panel.toggle_class("visible")
     
     def action_toggle_inventory(self) -> None:
         """Toggle inventory panel visibility."""
-        panel = self.query_one("#inventory-panel", Static)
+        self._inv_panel.display = not self._inv_panel.display
         self._update_inventory_panel()
-        panel.toggle_class("visible")
     
     def action_toggle_quests(self) -> None:
         """Toggle quest panel visibility."""
-        panel = self.query_one("#quest-panel", Static)
+        self._quest_panel.display = not self._quest_panel.display
         self._update_quest_panel()
-        panel.toggle_class("visible")
     
     def action_toggle_map(self) -> None:
         """Toggle map panel visibility."""
-        panel = self.query_one("#map-panel", Static)
+        self._map_panel.display = not self._map_panel.display
         self._update_map_panel()
-        panel.toggle_class("visible")
     
     def action_toggle_npcs(self) -> None:
         """Toggle NPCs panel visibility."""
-        panel = self.query_one("#npcs-panel", Static)
+        self._npcs_panel.display = not self._npcs_panel.display
         self._update_npcs_panel()
-        panel.toggle_class("visible")
     
     def action_toggle_help(self) -> None:
         """Toggle help panel visibility."""
-        panel = self.query_one("#help-panel", Static)
-        panel.toggle_class("visible")
+        self._help_panel.display = not self._help_panel.display
 
 
 def create_app(game: Optional["Game"] = None) -> ReverieApp:
@@ -1,5 +1,6 @@
 """Custom widgets and formatting for Reverie TUI."""
 
+from collections import deque
 from textual.widgets import Static, RichLog
 from textual.widget import Widget
 from rich.text import Text
@@ -12,6 +13,16 @@ from typing import Optional
 # Text Formatting Functions
 # =============================================================================
 
+# Styled prefixes, built once and copied by the formatters. The style is
+# a span on the prefix, not the Text's base style, so it stops at the prefix
+_SYSTEM_PREFIX = Text.assemble((">>> ", "bold yellow"))
+_PLAYER_PREFIX = Text.assemble(("> ", "bold green"))
+_COMBAT_PLAYER_PREFIX = Text.assemble(("⚔ ", "bold"))
+_COMBAT_ENEMY_PREFIX = Text.assemble(("⚔ ", "bold red"))
+_CRITICAL_PREFIX = Text.assemble(("!! ", "bold red"))
+_SUCCESS_PREFIX = Text.assemble(("✓ ", "bold green"))
+_FAILURE_PREFIX = Text.assemble(("✗ ", "bold red"))
+
 def format_narration(text: str) -> Text:
     """Format narration text for display.
     
@@ -71,8 +82,7 @@ def format_system(text: str) -> Text:
     Returns:
         Rich Text object with styling
     """
-    styled = Text()
-    styled.append(">>> ", style="bold yellow")
+    styled = _SYSTEM_PREFIX.copy()
     styled.append(text, style="yellow")
     return styled
 
@@ -88,8 +98,7 @@ def format_player_action(text: str) -> Text:
     Returns:
         Rich Text object with styling
     """
-    styled = Text()
-    styled.append("> ", style="bold green")
+    styled = _PLAYER_PREFIX.copy()
     styled.append(text, style="green")
     return styled
 
@@ -104,12 +113,11 @@ def format_combat(text: str, is_player: bool = True) -> Text:
     Returns:
         Rich Text object with styling
     """
-    styled = Text()
     if is_player:
-        styled.append("⚔ ", style="bold")
+        styled = _COMBAT_PLAYER_PREFIX.copy()
         styled.append(text, style="bold white")
     else:
-        styled.append("⚔ ", style="bold red")
+        styled = _COMBAT_ENEMY_PREFIX.copy()
         styled.append(text, style="red")
     return styled
 
@@ -124,11 +132,11 @@ def format_damage(text: str, is_critical: bool = False) -> Text:
     Returns:
         Rich Text object with styling
     """
-    styled = Text()
     if is_critical:
-        styled.append("!! ", style="bold red")
+        styled = _CRITICAL_PREFIX.copy()
         styled.append(text, style="bold red")
     else:
+        styled = Text()
         styled.append(text, style="red")
     return styled
 
@@ -142,8 +150,7 @@ def format_success(text: str) -> Text:
     Returns:
         Rich Text object with styling
     """
-    styled = Text()
-    styled.append("✓ ", style="bold green")
+    styled = _SUCCESS_PREFIX.copy()
     styled.append(text, style="green")
     return styled
 
@@ -157,8 +164,7 @@ def format_failure(text: str) -> Text:
     Returns:
         Rich Text object with styling
     """
-    styled = Text()
-    styled.append("✗ ", style="bold red")
+    styled = _FAILURE_PREFIX.copy()
     styled.append(text, style="red")
     return styled
 
@@ -181,47 +187,46 @@ class NarrationPanel(Static):
     def __init__(self, **kwargs):
         """Initialize the narration panel."""
         super().__init__(**kwargs)
-        self._entries: list[Text] = []
         self._max_entries: int = 100
+        self._entries: deque[Text] = deque(maxlen=self._max_entries)
+        # Every entry joined with blank lines, extended as entries arrive
+        self._combined = Text()
     
     def add_narration(self, text: str) -> None:
         """Add narration text."""
-        self._entries.append(format_narration(text))
-        self._trim_and_update()
+        self._append(format_narration(text))
     
     def add_dialogue(self, npc_name: str, text: str) -> None:
         """Add NPC dialogue."""
-        self._entries.append(format_npc_dialogue(npc_name, text))
-        self._trim_and_update()
+        self._append(format_npc_dialogue(npc_name, text))
     
     def add_system(self, text: str) -> None:
         """Add a system message."""
-        self._entries.append(format_system(text))
-        self._trim_and_update()
+        self._append(format_system(text))
     
     def add_player_action(self, text: str) -> None:
         """Add player action echo."""
-        self._entries.append(format_player_action(text))
-        self._trim_and_update()
+        self._append(format_player_action(text))
     
     def clear(self) -> None:
         """Clear all entries."""
         self._entries.clear()
+        self._combined = Text()
         self.update("")
     
-    def _trim_and_update(self) -> None:
-        """Trim old entries and update display."""
-        if len(self._entries) > self._max_entries:
-            self._entries = self._entries[-self._max_entries:]
+    def _append(self, entry: Text) -> None:
+        """Add an entry, dropping the oldest past the limit, and update display."""
+        if len(self._entries) == self._max_entries:
+            # Cut the oldest entry and its separator off the front
+            oldest = self._entries[0]
+            self._combined = self._combined[len(oldest) + 2:]
         
-        # Combine entries with newlines
-        combined = Text()
-        for i, entry in enumerate(self._entries):
-            if i > 0:
-                combined.append("\n\n")
-            combined.append(entry)
+        if self._combined:
+            self._combined.append("\n\n")
+        self._combined.append(entry)
+        self._entries.append(entry)
         
-        self.update(combined)
+        self.update(self._combined)
 
 
 class StatusBar(Static):
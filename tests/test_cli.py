@@ -111,6 +111,26 @@ class TestExportImport:
             result = runner.invoke(app, ["export", "Export Test", "-o", str(output_file)])
             assert result.exit_code == 0
             assert output_file.exists()
+            assert output_file.read_text().startswith('{\n  "campaign"')
+    
+    def test_export_compact(self, tmp_path):
+        """--compact streams the same document without indentation."""
+        db_path = tmp_path / "test.db"
+        db = Database.open(db_path)
+        campaign = Campaign.create("Export Test")
+        db.save_campaign(campaign)
+        db.close()
+        
+        indented = tmp_path / "indented.json"
+        compact = tmp_path / "compact.json"
+        
+        with patch("reverie.cli.get_db_path", return_value=db_path):
+            runner.invoke(app, ["export", "Export Test", "-o", str(indented)])
+            result = runner.invoke(app, ["export", "Export Test", "-o", str(compact), "--compact"])
+            assert result.exit_code == 0
+        
+        assert "\n" not in compact.read_text()
+        assert json.loads(compact.read_text()) == json.loads(indented.read_text())
     
     def test_import_campaign(self, tmp_path):
         """Test importing a campaign."""
@@ -15,6 +15,7 @@ from reverie.combat import (
     enemy_turn,
     check_combat_end,
     narrate_action,
+    roll_d20,
 )
 
 
@@ -364,3 +365,14 @@ class TestFullCombat:
         result = check_combat_end(state)
         assert result is not None
         assert result.status == CombatStatus.DEFEAT
+
+
+class TestRollD20:
+    """Tests for the d20 roller."""
+
+    def test_rolls_in_range(self):
+        """Rolls stay within 1-20 across pool refills."""
+        rolls = [roll_d20() for _ in range(10000)]
+        assert min(rolls) >= 1
+        assert max(rolls) <= 20
+        assert len(set(rolls)) == 20
@@ -0,0 +1,27 @@
+"""Tests for record ID generation."""
+
+from uuid import UUID
+
+from reverie.ids import new_id
+from reverie.npc import generate_npc
+from reverie.storage import Campaign, NPCDeath
+
+
+class TestNewId:
+    """Tests for new_id."""
+
+    def test_ids_are_uuid4_strings(self):
+        """IDs parse as version 4 UUIDs in canonical form."""
+        value = new_id()
+        assert str(UUID(value)) == value
+        assert UUID(value).version == 4
+
+    def test_records_use_new_id(self):
+        """Created records get distinct UUID4 IDs."""
+        ids = {
+            Campaign.create("Test").id,
+            NPCDeath.create("NPC", "Here", "Fell", "c1").id,
+            generate_npc().id,
+        }
+        assert len(ids) == 3
+        assert all(UUID(i).version == 4 for i in ids)
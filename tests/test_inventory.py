@@ -90,6 +90,14 @@ class TestItem:
         assert restored.name == original.name
         assert restored.effect.amount == 20
 
+    def test_item_without_effect_serialization(self):
+        """Items without an effect round-trip with a null effect."""
+        original = create_item("Rock", ItemType.MISC)
+        
+        data = original.to_dict()
+        assert data["effect"] is None
+        assert Item.from_dict(data).effect is None
+
 
 class TestInventory:
     """Tests for Inventory class."""
@@ -308,3 +316,23 @@ class TestSerialization:
         assert restored.max_slots == 5
         assert len(restored.key_items) == 1
         assert restored.get_equipped(EquipSlot.WEAPON) is not None
+
+    def test_empty_slots_not_serialized(self):
+        """Only occupied equipment slots are written."""
+        inv = Inventory()
+        sword = create_item("Sword", ItemType.WEAPON)
+        add_item(inv, sword)
+        equip_item(inv, sword.id)
+        
+        data = inv.to_dict()
+        assert list(data["equipped"]) == ["weapon"]
+        
+        restored = Inventory.from_dict(data)
+        assert restored.get_equipped(EquipSlot.ARMOR) is None
+        assert set(restored.equipped) == set(EquipSlot)
+
+    def test_legacy_null_slots_load(self):
+        """Saves with explicit null slots still load."""
+        data = {"equipped": {"weapon": None, "armor": None, "accessory": None}}
+        restored = Inventory.from_dict(data)
+        assert restored.get_equipped(EquipSlot.WEAPON) is None
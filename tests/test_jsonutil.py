@@ -0,0 +1,23 @@
+"""Tests for JSON helpers."""
+
+import pytest
+
+from reverie import jsonutil
+
+
+class TestJsonUtil:
+    """Tests for dumps/loads."""
+
+    def test_round_trip(self):
+        """Data survives dumps and loads as str and bytes."""
+        data = {"name": "Mira", "traits": ["calm", "sly"], "gold": 12, "secret": None}
+        
+        assert jsonutil.loads(jsonutil.dumps(data)) == data
+        assert jsonutil.loads(jsonutil.dumps_bytes(data)) == data
+        assert isinstance(jsonutil.dumps(data), str)
+        assert isinstance(jsonutil.dumps_bytes(data), bytes)
+
+    def test_decode_error(self):
+        """Invalid input raises JSONDecodeError regardless of backend."""
+        with pytest.raises(jsonutil.JSONDecodeError):
+            jsonutil.loads("{not json")
@@ -1,13 +1,16 @@
 """Tests for LLM integration."""
 
 import pytest
-from unittest.mock import patch, MagicMock
+import asyncio
+import json
+from unittest.mock import patch, MagicMock, AsyncMock
 from dataclasses import dataclass
 
 from reverie.llm import (
     LLMClient,
     LLMResponse,
     MockLLMClient,
+    CachingLLMClient,
     OllamaClient,
     OpenAIClient,
     create_client,
@@ -17,6 +20,15 @@ from reverie.llm import (
     build_generation_prompt,
     parse_generation_response,
 )
+from reverie.llm.http import asend_with_retry, close_shared_client
+
+
+@pytest.fixture(autouse=True)
+def fresh_shared_client():
+    """Give each test its own shared httpx client so patches take effect."""
+    close_shared_client()
+    yield
+    close_shared_client()
 
 
 class TestLLMResponse:
@@ -65,6 +77,13 @@ class TestMockLLMClient:
         assert len(client.prompts_received) == 2
         assert "First" in client.prompts_received[0]
 
+    async def test_agenerate_defaults_to_generate(self):
+        """Base agenerate runs the sync generate."""
+        client = MockLLMClient(responses=["Async"])
+        result = await client.agenerate("Prompt")
+        assert result.text == "Async"
+        assert client.prompts_received == ["Prompt"]
+
     def test_availability(self):
         """Mock availability can be toggled."""
         client = MockLLMClient()
@@ -77,6 +96,22 @@ class TestMockLLMClient:
 class TestOllamaClient:
     """Tests for OllamaClient (mocked)."""
 
+    def test_client_uses_pooled_connections(self):
+        """All clients share one pooled httpx client with a short connect timeout."""
+        with patch("reverie.llm.ollama.httpx.Client") as mock_client:
+            ollama = OllamaClient(timeout=60.0)
+            OllamaClient()
+            OpenAIClient(api_key="test-key")
+        
+        mock_client.assert_called_once()
+        kwargs = mock_client.call_args.kwargs
+        assert kwargs["limits"].max_keepalive_connections == 10
+        assert kwargs["timeout"].connect == 5.0
+        
+        ollama.generate("Test prompt")
+        timeout = mock_client.return_value.post.call_args.kwargs["timeout"]
+        assert timeout.read == 60.0
+
     def test_init_defaults(self):
         """Initialize with defaults."""
         client = OllamaClient()
@@ -97,10 +132,7 @@ class TestOllamaClient:
     def test_generate_success(self, mock_client_class):
         """Successful generation."""
         mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "response": "Generated text",
-            "eval_count": 50,
-        }
+        mock_response.content = b'{"response": "Generated text", "eval_count": 50}'
         mock_response.raise_for_status = MagicMock()
         
         mock_client = MagicMock()
@@ -113,10 +145,36 @@ class TestOllamaClient:
         assert result.success
         assert result.text == "Generated text"
         assert result.tokens_used == 50
+        sent = mock_client.post.call_args.kwargs
+        assert json.loads(sent["content"]) == {
+            "model": "llama2",
+            "prompt": "Test prompt",
+            "stream": False,
+        }
+        assert sent["headers"]["Content-Type"] == "application/json"
 
+    @patch("reverie.llm.ollama.time.monotonic")
     @patch("reverie.llm.ollama.httpx.Client")
-    def test_generate_timeout(self, mock_client_class):
-        """Handle timeout error."""
+    def test_is_available_cached(self, mock_client_class, mock_monotonic):
+        """Availability is probed at most once per TTL window."""
+        mock_client = mock_client_class.return_value
+        mock_client.get.return_value.status_code = 200
+        mock_monotonic.return_value = 100.0
+        
+        client = OllamaClient()
+        assert client.is_available()
+        assert client.is_available()
+        assert mock_client.get.call_count == 1
+        
+        mock_monotonic.return_value = 100.0 + OllamaClient.AVAILABILITY_TTL
+        mock_client.get.return_value.status_code = 503
+        assert not client.is_available()
+        assert mock_client.get.call_count == 2
+
+    @patch("reverie.llm.http.time.sleep")
+    @patch("reverie.llm.ollama.httpx.Client")
+    def test_generate_timeout(self, mock_client_class, mock_sleep):
+        """Handle timeout error once retries are exhausted."""
         import httpx
         
         mock_client = MagicMock()
@@ -128,6 +186,84 @@ class TestOllamaClient:
         
         assert not result.success
         assert "timed out" in result.error.lower()
+        assert mock_client.post.call_count == 3
+
+    @patch("reverie.llm.http.time.sleep")
+    @patch("reverie.llm.ollama.httpx.Client")
+    def test_generate_retries_transient_status(self, mock_client_class, mock_sleep):
+        """A 503 is retried, honoring Retry-After; other 4xx are not."""
+        busy = MagicMock(status_code=503, headers={"Retry-After": "2"})
+        ok = MagicMock(status_code=200, content=b'{"response": "Back up"}')
+        mock_client = mock_client_class.return_value
+        mock_client.post.side_effect = [busy, ok]
+        
+        client = OllamaClient()
+        assert client.generate("Test").text == "Back up"
+        mock_sleep.assert_called_once_with(2.0)
+        
+        bad = MagicMock(status_code=400)
+        bad.raise_for_status.side_effect = Exception("HTTP error: 400")
+        mock_client.post.side_effect = [bad]
+        assert not client.generate("Test").success
+        assert mock_client.post.call_count == 3
+
+    @patch("reverie.llm.ollama.httpx.Client")
+    def test_generate_stream(self, mock_client_class):
+        """Streamed chunks are yielded until the done marker."""
+        mock_response = MagicMock()
+        mock_response.iter_lines.return_value = iter([
+            '{"response": "The door ", "done": false}',
+            "",
+            '{"response": "creaks open.", "done": false}',
+            '{"response": "", "done": true, "eval_count": 4}',
+            '{"response": "ignored", "done": false}',
+        ])
+        mock_client = mock_client_class.return_value
+        mock_client.stream.return_value.__enter__.return_value = mock_response
+        
+        client = OllamaClient()
+        chunks = list(client.generate_stream("Open the door"))
+        
+        assert chunks == ["The door ", "creaks open."]
+        sent = json.loads(mock_client.stream.call_args.kwargs["content"])
+        assert sent["stream"] is True
+
+    @patch("reverie.llm.ollama.httpx.AsyncClient")
+    def test_generate_many_keeps_order(self, mock_client_class):
+        """generate_many returns responses in prompt order, across calls."""
+        async def post(url, content, headers):
+            prompt = json.loads(content)["prompt"]
+            response = MagicMock()
+            response.content = json.dumps({"response": prompt.upper()}).encode()
+            return response
+        
+        mock_client_class.return_value.post = post
+        mock_client_class.return_value.aclose = AsyncMock()
+        
+        client = OllamaClient()
+        assert [r.text for r in client.generate_many(["a", "b", "c"])] == ["A", "B", "C"]
+        assert [r.text for r in client.generate_many(["d"])] == ["D"]
+        # Each asyncio.run() gets a fresh async client, closed before its loop ends
+        assert mock_client_class.call_count == 2
+        assert mock_client_class.return_value.aclose.await_count == 2
+        assert client._async_client is None
+
+    @patch("reverie.llm.ollama.httpx.AsyncClient")
+    async def test_agenerate_concurrent(self, mock_client_class):
+        """Concurrent async generation shares one async client."""
+        mock_response = MagicMock()
+        mock_response.content = b'{"response": "Async text", "eval_count": 5}'
+        
+        mock_client = MagicMock()
+        mock_client.post = AsyncMock(return_value=mock_response)
+        mock_client_class.return_value = mock_client
+        
+        client = OllamaClient()
+        results = await asyncio.gather(*[client.agenerate(f"Prompt {i}") for i in range(3)])
+        
+        assert [r.text for r in results] == ["Async text"] * 3
+        assert mock_client.post.await_count == 3
+        mock_client_class.assert_called_once()
 
 
 class TestOpenAIClient:
@@ -145,10 +281,10 @@ class TestOpenAIClient:
     def test_generate_success(self, mock_client_class):
         """Successful generation."""
         mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "choices": [{"message": {"content": "AI response"}, "finish_reason": "stop"}],
-            "usage": {"total_tokens": 100},
-        }
+        mock_response.content = (
+            b'{"choices": [{"message": {"content": "AI response"}, "finish_reason": "stop"}],'
+            b' "usage": {"total_tokens": 100}}'
+        )
         mock_response.raise_for_status = MagicMock()
         
         mock_client = MagicMock()
@@ -163,6 +299,67 @@ class TestOpenAIClient:
         assert result.tokens_used == 100
 
 
+class TestCachingLLMClient:
+    """Tests for CachingLLMClient."""
+
+    def test_repeated_prompt_hits_cache(self):
+        """Identical deterministic prompts are only sent once."""
+        base = MockLLMClient(["first", "second"])
+        client = CachingLLMClient(base)
+        
+        assert client.generate("Look around").text == "first"
+        assert client.generate("Look around").text == "first"
+        assert base.call_count == 1
+        assert client.hits == 1
+
+    def test_sampled_requests_bypass_cache(self):
+        """Requests with a non-zero temperature are never cached."""
+        base = MockLLMClient(["first", "second"])
+        client = CachingLLMClient(base)
+        
+        client.generate("Look around", {"temperature": 0.8})
+        resp = client.generate("Look around", {"temperature": 0.8})
+        assert resp.text == "second"
+        assert base.call_count == 2
+
+    def test_options_are_part_of_key(self):
+        """A response is not reused for a request with other options."""
+        vectors = {"look around": [1.0, 0.0]}
+        base = MockLLMClient(["short", "long"])
+        client = CachingLLMClient(base, embed_fn=vectors.__getitem__)
+        
+        assert client.generate("look around", {"max_tokens": 10}).text == "short"
+        assert client.generate("look around", {"max_tokens": 500}).text == "long"
+        assert client.generate("look around", {"max_tokens": 10}).text == "short"
+        assert base.call_count == 2
+
+    def test_similar_prompt_hits_cache(self):
+        """With an embed_fn, near-duplicate prompts reuse a response."""
+        vectors = {"look around": [1.0, 0.0], "look  around": [0.99, 0.05], "attack": [0.0, 1.0]}
+        base = MockLLMClient(["first", "second"])
+        client = CachingLLMClient(base, embed_fn=vectors.__getitem__)
+        
+        client.generate("look around")
+        assert client.generate("look  around").text == "first"
+        assert client.generate("attack").text == "second"
+        assert base.call_count == 2
+
+    @patch("reverie.llm.ollama.httpx.AsyncClient")
+    def test_generate_many_closes_wrapped_client(self, mock_client_class):
+        """generate_many through the cache closes the wrapped async client."""
+        mock_response = MagicMock()
+        mock_response.content = b'{"response": "Async text"}'
+        mock_client_class.return_value.post = AsyncMock(return_value=mock_response)
+        mock_client_class.return_value.aclose = AsyncMock()
+        
+        base = OllamaClient()
+        client = CachingLLMClient(base)
+        
+        assert [r.text for r in client.generate_many(["a", "b"])] == ["Async text"] * 2
+        mock_client_class.return_value.aclose.assert_awaited_once()
+        assert base._async_client is None
+
+
 class TestCreateClient:
     """Tests for create_client factory."""
 
@@ -176,6 +373,17 @@ class TestCreateClient:
         client = create_client(Config(responses=["Test"]))
         assert isinstance(client, MockLLMClient)
 
+    def test_create_cached(self):
+        """A true cache setting wraps the client in CachingLLMClient."""
+        @dataclass
+        class Config:
+            provider: str = "mock"
+            cache: bool = True
+        
+        client = create_client(Config())
+        assert isinstance(client, CachingLLMClient)
+        assert isinstance(client.base, MockLLMClient)
+
     def test_create_ollama(self):
         """Create Ollama client."""
         @dataclass
@@ -270,6 +478,22 @@ class TestPromptBuilding:
         assert "Bartender" in prompt
         assert "rumors" in prompt
 
+    def test_scene_prompt_reuses_prefix(self):
+        """Turns in the same scene share the memoized location block."""
+        from reverie.llm.prompts import _scene_prefix
+        
+        @dataclass
+        class Location:
+            name: str = "Old Mill"
+            description: str = "The wheel creaks."
+        
+        first = build_scene_prompt(Location(), "look around")
+        hits = _scene_prefix.cache_info().hits
+        second = build_scene_prompt(Location(), "search the floor")
+        
+        assert _scene_prefix.cache_info().hits == hits + 1
+        assert first.split("Player Action")[0] == second.split("Player Action")[0]
+
     def test_build_dialogue_prompt(self):
         """Build NPC dialogue prompt."""
         @dataclass
@@ -330,9 +554,39 @@ class TestParseResponse:
         
         assert result["name"] == "CodeBlock"
 
+    def test_parse_nested_json_in_text(self):
+        """Parse nested JSON embedded in text, ignoring braces in strings."""
+        response = 'Sure! {"name": "Nested", "stats": {"hp": 3}, "motto": "}{"} Enjoy.'
+        result = parse_generation_response(response)
+        
+        assert result["stats"] == {"hp": 3}
+        assert result["motto"] == "}{"
+
     def test_parse_invalid_json(self):
         """Return empty dict for invalid JSON."""
         response = "This is not JSON at all."
         result = parse_generation_response(response)
         
         assert result == {}
+
+
+class TestAsyncRetry:
+    """Tests for asend_with_retry."""
+
+    async def test_limit_released_during_backoff(self):
+        """The concurrency slot is free while a throttled request waits."""
+        limit = asyncio.Semaphore(1)
+        throttled = MagicMock(status_code=429, headers={"Retry-After": "0"})
+        ok = MagicMock(status_code=200)
+        send = AsyncMock(side_effect=[throttled, ok])
+        held_while_sleeping = []
+        
+        async def sleep(delay):
+            held_while_sleeping.append(limit.locked())
+        
+        with patch("reverie.llm.http.asyncio.sleep", side_effect=sleep):
+            response = await asend_with_retry(send, limit=limit)
+        
+        assert response is ok
+        assert send.await_count == 2
+        assert held_while_sleeping == [False]
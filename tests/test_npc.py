@@ -57,6 +57,32 @@ class TestNPCMemory:
         unfulfilled = memory.get_unfulfilled_promises()
         assert len(unfulfilled) == 2
 
+    def test_unfulfilled_promises_track_fulfillment(self):
+        """Unfulfilled promises stay in order and survive a round trip."""
+        memory = NPCMemory()
+        for i in range(4):
+            memory.add_promise(f"Promise {i}")
+        memory.fulfill_promise(1)
+        
+        restored = NPCMemory.from_dict(memory.to_dict())
+        for m in (memory, restored):
+            assert [p.description for p in m.get_unfulfilled_promises()] == [
+                "Promise 0", "Promise 2", "Promise 3",
+            ]
+            assert m.get_unfulfilled_count() == 3
+
+    def test_summary_refreshes_after_mutation(self):
+        """Cached summary is rebuilt after memory changes."""
+        memory = NPCMemory()
+        assert memory.get_summary() == ""
+        
+        memory.add_promise("Find the ring")
+        assert memory.get_summary() == "Unfulfilled promises: 1"
+        
+        memory.fulfill_promise(0)
+        memory.add_gift("Bread", 2)
+        assert memory.get_summary() == "Gifts received: 1"
+
     def test_add_gift(self):
         """Record gifts."""
         memory = NPCMemory()
@@ -87,6 +113,7 @@ class TestNPCMemory:
         assert len(restored.promises) == 1
         assert len(restored.gifts) == 1
         assert restored.get_total_reputation() == 10
+        assert restored.get_gift_value_total() == 25
 
 
 class TestNPC:
@@ -107,6 +134,15 @@ class TestNPC:
         assert len(npc.traits) == 2
         assert npc.disposition == Disposition.NEUTRAL
 
+    def test_npc_records_have_no_instance_dict(self):
+        """NPC records use slots instead of a per-instance __dict__."""
+        npc = NPC(id="npc-1", name="Test", race="human", occupation="guard")
+        npc.memory.add_promise("Return the lantern")
+        
+        assert not hasattr(npc, "__dict__")
+        assert not hasattr(npc.memory, "__dict__")
+        assert not hasattr(npc.memory.promises[0], "__dict__")
+
     def test_update_disposition_positive(self):
         """Positive changes improve disposition."""
         npc = NPC(id="npc-1", name="Test", race="human", occupation="guard")
@@ -127,6 +163,19 @@ class TestNPC:
         npc.update_disposition(-5, "Attacked them")
         assert npc.disposition == Disposition.HOSTILE
 
+    def test_disposition_band_edges(self):
+        """Each reputation total maps to the right disposition band."""
+        expected = {
+            -11: Disposition.HOSTILE, -10: Disposition.HOSTILE,
+            -9: Disposition.UNFRIENDLY, -5: Disposition.UNFRIENDLY,
+            -4: Disposition.NEUTRAL, 4: Disposition.NEUTRAL,
+            5: Disposition.FRIENDLY, 9: Disposition.FRIENDLY,
+            10: Disposition.ALLIED, 11: Disposition.ALLIED,
+        }
+        for total, disposition in expected.items():
+            npc = NPC(id="npc-1", name="Test", race="human", occupation="guard")
+            assert npc.update_disposition(total, "test") == disposition
+
     def test_relationship_summary(self):
         """Get relationship summary."""
         npc = NPC(id="npc-1", name="Elara", race="elf", occupation="healer")
@@ -160,6 +209,13 @@ class TestNPC:
         assert restored.disposition == Disposition.FRIENDLY
         assert len(restored.memory.conversations) == 1
 
+    def test_from_dict_rejects_unknown_disposition(self):
+        """Unknown disposition values still raise ValueError."""
+        data = NPC(id="npc-1", name="Test", race="human", occupation="guard").to_dict()
+        data["disposition"] = "smitten"
+        with pytest.raises(ValueError):
+            NPC.from_dict(data)
+
 
 class TestGeneration:
     """Tests for generation functions."""
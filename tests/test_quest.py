@@ -1,6 +1,7 @@
 """Tests for quest system."""
 
 import pytest
+from uuid import UUID
 
 from reverie.quest import (
     QuestStatus,
@@ -14,6 +15,7 @@ from reverie.quest import (
     get_active_quests,
     get_completed_quests,
     get_failed_quests,
+    partition_quests_by_status,
 )
 
 
@@ -127,6 +129,42 @@ class TestQuest:
         assert quest.stages[0].completed
         assert not quest.stages[1].completed
 
+    def test_advance_updates_progress_and_current_stage(self):
+        """Advancing stages out of order keeps progress counters in step."""
+        quest = Quest(
+            id="quest-1",
+            title="Test",
+            hook="Hook",
+            objective="Objective",
+            stages=[QuestStage("Stage 1"), QuestStage("Stage 2"), QuestStage("Stage 3")],
+        )
+        quest.advance_stage(1)
+        assert quest.get_progress() == (1, 3)
+        assert quest.get_current_stage().description == "Stage 1"
+        
+        quest.advance_stage(1)
+        assert quest.get_progress() == (1, 3)
+        
+        quest.advance_stage(0)
+        assert quest.get_progress() == (2, 3)
+        assert quest.get_current_stage().description == "Stage 3"
+        
+        quest.advance_stage(2)
+        assert quest.get_current_stage() is None
+    
+    def test_progress_rebuilt_from_dict(self):
+        """Deserialized quests start with correct progress."""
+        quest = Quest(
+            id="quest-1",
+            title="Test",
+            hook="Hook",
+            objective="Objective",
+            stages=[QuestStage("Stage 1", completed=True), QuestStage("Stage 2")],
+        )
+        restored = Quest.from_dict(quest.to_dict())
+        assert restored.get_progress() == (1, 2)
+        assert restored.get_current_stage().description == "Stage 2"
+    
     def test_advance_invalid_stage(self):
         """Cannot advance invalid stage index."""
         quest = Quest(id="quest-1", title="Test", hook="Hook", objective="Obj")
@@ -170,6 +208,61 @@ class TestQuest:
         assert quest.abandon()
         assert quest.status == QuestStatus.ABANDONED
 
+    def test_from_dict_status(self):
+        """Status strings map to QuestStatus members; unknown values raise."""
+        data = Quest(id="quest-1", title="Test", hook="Hook", objective="Obj").to_dict()
+        data["status"] = "failed"
+        assert Quest.from_dict(data).status is QuestStatus.FAILED
+        
+        data["status"] = "misplaced"
+        with pytest.raises(ValueError):
+            Quest.from_dict(data)
+    
+    def test_to_dict_reflects_direct_changes(self):
+        """to_dict builds a fresh dict that sees fields set directly."""
+        quest = generate_quest()
+        first = quest.to_dict()
+        first["status"] = "tampered"
+        
+        quest.stages[0].completed = True
+        quest.status = QuestStatus.COMPLETED
+        second = quest.to_dict()
+        assert second is not first
+        assert second["stages"][0]["completed"]
+        assert second["status"] == "completed"
+    
+    def test_from_dict_round_trip(self):
+        """from_dict restores everything to_dict writes."""
+        quest = generate_quest(context={"title": "Round Trip"})
+        quest.advance_stage(0)
+        quest.fail("Lost the map")
+        
+        restored = Quest.from_dict(quest.to_dict())
+        assert restored == quest
+        assert restored.get_progress() == quest.get_progress()
+    
+    def test_from_dict_minimal_gets_own_lists(self):
+        """Quests deserialized without list fields don't share defaults."""
+        q1 = Quest.from_dict({"id": "1", "title": "A"})
+        q2 = Quest.from_dict({"id": "2", "title": "B"})
+        q1.complications.append("Storm")
+        q1.rewards.items.append("Coin")
+        assert q2.complications == []
+        assert q2.rewards.items == []
+    
+    def test_quest_records_have_no_instance_dict(self):
+        """Quest records use slots instead of a per-instance __dict__."""
+        quest = Quest(
+            id="quest-1",
+            title="Test",
+            hook="Hook",
+            objective="Objective",
+            stages=[QuestStage("Stage 1")],
+        )
+        assert not hasattr(quest, "__dict__")
+        assert not hasattr(quest.rewards, "__dict__")
+        assert not hasattr(quest.stages[0], "__dict__")
+    
     def test_quest_serialization(self):
         """Quest serializes and deserializes."""
         original = Quest(
@@ -203,6 +296,15 @@ class TestGeneration:
         assert quest.is_active()
         assert len(quest.stages) > 0
 
+    def test_generate_quest_id_is_uuid4(self):
+        """Generated quest IDs are unique, canonical UUID4 strings."""
+        ids = {generate_quest().id for _ in range(50)}
+        assert len(ids) == 50
+        for quest_id in ids:
+            parsed = UUID(quest_id)
+            assert parsed.version == 4
+            assert str(parsed) == quest_id
+
     def test_generate_quest_with_context(self):
         """Generate quest with custom context."""
         quest = generate_quest(context={
@@ -283,3 +385,17 @@ class TestHelperFunctions:
         failed = get_failed_quests(quests)
         assert len(failed) == 1
         assert failed[0].title == "Quest 2"
+
+    def test_partition_quests_by_status(self):
+        """Partition buckets every quest under its status."""
+        q1 = Quest(id="1", title="Q1", hook="H", objective="O")
+        q2 = Quest(id="2", title="Q2", hook="H", objective="O")
+        q3 = Quest(id="3", title="Q3", hook="H", objective="O")
+        q2.complete()
+        q3.fail("Too slow")
+        
+        buckets = partition_quests_by_status([q1, q2, q3])
+        assert buckets[QuestStatus.ACTIVE] == [q1]
+        assert buckets[QuestStatus.COMPLETED] == [q2]
+        assert buckets[QuestStatus.FAILED] == [q3]
+        assert buckets[QuestStatus.ABANDONED] == []
@@ -1,5 +1,7 @@
 """Tests for storage layer."""
 
+import io
+import json
 import pytest
 from datetime import datetime
 from uuid import uuid4
@@ -19,6 +21,7 @@ from reverie.storage import (
     delete_campaign,
     export_campaign,
     import_campaign,
+    reset_data,
 )
 
 
@@ -49,6 +52,11 @@ class TestCampaign:
         assert restored.id == original.id
         assert restored.name == original.name
 
+    def test_records_use_slots(self):
+        """Storage records use slots instead of a per-instance __dict__."""
+        assert not hasattr(Campaign.create("Test"), "__dict__")
+        assert not hasattr(EventRecord.create("c1", "note", "Desc"), "__dict__")
+
 
 class TestCharacterRecord:
     """Tests for CharacterRecord model."""
@@ -122,6 +130,27 @@ class TestDatabaseCampaign:
         campaigns = db.list_campaigns()
         assert len(campaigns) == 2
 
+    def test_open_file_uses_wal(self, tmp_path):
+        """File databases use WAL journaling; foreign keys are enforced."""
+        file_db = Database.open(tmp_path / "wal.db")
+        try:
+            assert file_db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert file_db.conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert file_db.conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        finally:
+            file_db.close()
+
+    def test_event_listing_uses_composite_index(self, db):
+        """Recent events are read from the (campaign_id, timestamp) index without sorting."""
+        plan = db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM events WHERE campaign_id = ? "
+            "ORDER BY timestamp DESC LIMIT ?",
+            ("c", 10),
+        ).fetchall()
+        details = " ".join(row[3] for row in plan)
+        assert "idx_events_campaign_timestamp" in details
+        assert "TEMP B-TREE" not in details
+
     def test_delete_campaign(self, db):
         """Delete a campaign."""
         campaign = Campaign.create("To Delete")
@@ -219,6 +248,26 @@ class TestDatabaseWorldElement:
         assert len(regions) == 1
         assert regions[0].name == "Region 1"
 
+    def test_load_world_elements_batch(self, db):
+        """Load many world elements at once, skipping unknown IDs."""
+        campaign = Campaign.create("Test")
+        db.save_campaign(campaign)
+        
+        ids = [str(uuid4()) for _ in range(600)]
+        for i, elem_id in enumerate(ids):
+            db.save_world_element(WorldElementRecord(
+                id=elem_id,
+                campaign_id=campaign.id,
+                element_type="location",
+                name=f"Place {i}",
+                data={},
+            ))
+        
+        loaded = db.load_world_elements(ids + ["missing"])
+        assert len(loaded) == 600
+        assert loaded[ids[599]].name == "Place 599"
+        assert "missing" not in loaded
+
 
 class TestDatabaseNPC:
     """Tests for NPC database operations."""
@@ -241,6 +290,23 @@ class TestDatabaseNPC:
         assert loaded is not None
         assert loaded.name == "Bartender"
 
+    def test_npc_data_stored_as_text(self, db):
+        """NPC data is stored as JSON text so SQL JSON functions can read it."""
+        campaign = Campaign.create("Test")
+        db.save_campaign(campaign)
+        db.save_npc(NPCRecord(
+            id="npc-1",
+            campaign_id=campaign.id,
+            name="Smith",
+            data={"occupation": "smith", "traits": ["loud"]},
+        ))
+        
+        row = db.conn.execute(
+            "SELECT typeof(data), json_extract(data, '$.traits[0]') FROM npcs"
+        ).fetchone()
+        assert tuple(row) == ("text", "loud")
+        assert db.load_npc("npc-1").data["traits"] == ["loud"]
+
     def test_list_npcs_by_location(self, db):
         """List NPCs filtered by location."""
         campaign = Campaign.create("Test")
@@ -265,6 +331,48 @@ class TestDatabaseNPC:
         assert len(gate_npcs) == 1
         assert gate_npcs[0].name == "Guard"
 
+    def test_list_npc_summaries(self, db):
+        """List NPC display fields without full records."""
+        campaign = Campaign.create("Test")
+        db.save_campaign(campaign)
+        
+        db.save_npc(NPCRecord(
+            id=str(uuid4()),
+            campaign_id=campaign.id,
+            name="Guard",
+            data={"occupation": "guard", "disposition": "hostile"},
+        ))
+        db.save_npc(NPCRecord(
+            id=str(uuid4()),
+            campaign_id=campaign.id,
+            name="Stranger",
+            data={"occupation": "drifter"},
+        ))
+        
+        summaries = sorted(db.list_npc_summaries(campaign.id))
+        assert summaries == [
+            ("Guard", "guard", "hostile"),
+            ("Stranger", "drifter", "neutral"),
+        ]
+
+
+class TestRecordLoads:
+    """Tests for loading records by ID."""
+
+    def test_unsaved_edits_do_not_leak(self, db):
+        """Each load returns a fresh record built from the stored row."""
+        campaign = Campaign.create("Test")
+        db.save_campaign(campaign)
+        npc = NPCRecord(id=str(uuid4()), campaign_id=campaign.id, name="Guard")
+        db.save_npc(npc)
+        
+        first = db.load_npc(npc.id)
+        first.name = "Impostor"
+        
+        second = db.load_npc(npc.id)
+        assert second is not first
+        assert second.name == "Guard"
+
 
 class TestDatabaseQuest:
     """Tests for quest database operations."""
@@ -337,6 +445,22 @@ class TestDatabaseEvent:
         events = db.list_events(campaign.id)
         assert len(events) == 2
 
+    def test_timestamps_load_as_datetimes(self, db):
+        """Stored timestamps come back as equal datetime objects."""
+        campaign = Campaign.create("Test")
+        db.save_campaign(campaign)
+        event = EventRecord.create(campaign.id, "action", "Looked around")
+        db.save_event(event)
+        
+        loaded = db.load_campaign(campaign.id)
+        assert loaded.created_at == campaign.created_at
+        assert loaded.updated_at == campaign.updated_at
+        assert db.list_campaigns()[0].updated_at == campaign.updated_at
+        
+        (listed,) = db.list_events(campaign.id)
+        assert isinstance(listed.timestamp, datetime)
+        assert listed.timestamp == event.timestamp
+
 
 class TestExportImport:
     """Tests for export/import functionality."""
@@ -368,6 +492,50 @@ class TestExportImport:
         assert exported["character"]["name"] == "Hero"
         assert len(exported["npcs"]) == 1
 
+    def test_export_stream_matches_export(self, db):
+        """Streamed export decodes to the same document as export_campaign."""
+        campaign = Campaign.create("Stream Test")
+        db.save_campaign(campaign)
+        db.save_npc(NPCRecord(
+            id=str(uuid4()),
+            campaign_id=campaign.id,
+            name="Guide",
+            data={"occupation": "guide", "traits": ["calm"]},
+        ))
+        db.save_quest(QuestRecord(
+            id=str(uuid4()),
+            campaign_id=campaign.id,
+            title="Find the Path",
+            data={"stages": []},
+        ))
+        db.save_event(EventRecord.create(campaign.id, "travel", "Set out", {"to": "forest"}))
+        
+        out = io.StringIO()
+        assert db.export_campaign_stream(campaign.id, out)
+        assert json.loads(out.getvalue()) == db.export_campaign(campaign.id)
+    
+    def test_export_reads_in_one_transaction(self, db):
+        """Export closes its read transaction but leaves an open one alone."""
+        campaign = Campaign.create("Snapshot Test")
+        db.save_campaign(campaign)
+        
+        db.export_campaign(campaign.id)
+        assert not db.conn.in_transaction
+        
+        npc = NPCRecord(id=str(uuid4()), campaign_id=campaign.id, name="Pending")
+        db.save_npc(npc, commit=False)
+        exported = db.export_campaign(campaign.id)
+        assert [n["name"] for n in exported["npcs"]] == ["Pending"]
+        assert db.conn.in_transaction
+        db.conn.commit()
+        assert db.load_npc(npc.id) is not None
+    
+    def test_export_stream_nonexistent_campaign(self, db):
+        """Streaming a missing campaign writes nothing."""
+        out = io.StringIO()
+        assert not db.export_campaign_stream("fake-id", out)
+        assert out.getvalue() == ""
+
     def test_export_nonexistent_campaign(self, db):
         """Export nonexistent campaign returns empty dict."""
         exported = db.export_campaign("fake-id")
@@ -404,6 +572,21 @@ class TestExportImport:
         loaded = db.load_campaign(campaign_id)
         assert loaded.name == "Imported Campaign"
 
+    def test_import_is_atomic(self, db):
+        """A malformed record rolls back the whole import."""
+        campaign = Campaign.create("Half Imported")
+        data = {
+            "campaign": campaign.to_dict(),
+            "npcs": [{"id": "npc-1", "campaign_id": campaign.id, "name": "Ok", "data": {}}],
+            "events": [{"id": "evt-1"}],  # Missing required fields
+        }
+        
+        with pytest.raises(KeyError):
+            db.import_campaign(data)
+        
+        assert db.load_campaign(campaign.id) is None
+        assert db.load_npc("npc-1") is None
+
     def test_import_invalid_data(self, db):
         """Import invalid data returns None."""
         campaign_id = db.import_campaign({})
@@ -449,3 +632,21 @@ class TestHelperFunctions:
         
         loaded = load_campaign(db, new_id)
         assert loaded.name == "Imported Copy"
+
+
+class TestResetData:
+    """Tests for wiping campaign data."""
+
+    def test_reset_data_keeps_schema(self, db):
+        """reset_data deletes every campaign row but leaves the tables."""
+        campaign = Campaign.create("Test")
+        db.save_campaign(campaign)
+        db.save_character(CharacterRecord(
+            id=str(uuid4()), campaign_id=campaign.id, name="Hero", data={"class": "fighter"}
+        ))
+        
+        reset_data(db.conn)
+        
+        assert db.list_campaigns() == []
+        assert db.conn.execute("SELECT COUNT(*) FROM characters").fetchone()[0] == 0
+        assert db.load_campaign(campaign.id) is None
@@ -1,16 +1,27 @@
 """Tests for TTS module."""
 
+import asyncio
+import json
+import os
+import socket
+import subprocess
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 import threading
 import time
+from pathlib import Path
 
 from reverie.tts import (
     TTSConfig,
     TTSEngine,
+    MpvPlayer,
     VOICES,
     get_voice_name,
     list_voices,
+    split_sentences,
+    evict_cache,
+    sweep_cache,
+    _partial_path,
     EDGE_TTS_AVAILABLE,
 )
 
@@ -108,6 +119,19 @@ class TestTTSEngine:
 
         mock_process.terminate.assert_called_once()
 
+    def test_stop_kills_unresponsive_process(self):
+        """stop() kills a player that doesn't exit after terminate()."""
+        mock_process = MagicMock()
+        mock_process.communicate.side_effect = subprocess.TimeoutExpired("play", 0.5)
+
+        engine = TTSEngine()
+        engine._current_process = mock_process
+        engine.stop()
+
+        mock_process.terminate.assert_called_once()
+        mock_process.kill.assert_called_once()
+        assert engine._current_process is None
+
 
 class TestVoices:
     """Tests for voice utilities."""
@@ -150,17 +174,19 @@ class TestTTSEngineAsync:
     @pytest.mark.skipif(not EDGE_TTS_AVAILABLE, reason="edge-tts not installed")
     @patch("reverie.tts.TTSEngine._play_audio")
     def test_speak_starts_thread(self, mock_play):
-        """speak() starts background thread."""
+        """speak() runs on the background loop thread."""
         config = TTSConfig(enabled=True)
         engine = TTSEngine(config)
 
         result = engine.speak("Hello")
         assert result is True
-        assert engine._playback_thread is not None
+        assert engine._future is not None
+        assert engine._loop_thread.is_alive()
 
-        # Wait for thread to start
+        # Wait for playback to start
         time.sleep(0.1)
-        engine.stop()
+        engine.close()
+        assert engine._loop is None
 
     @pytest.mark.skipif(not EDGE_TTS_AVAILABLE, reason="edge-tts not installed")
     def test_speak_with_callback(self):
@@ -179,3 +205,300 @@ class TestTTSEngineAsync:
             # Wait for callback
             callback_called.wait(timeout=2)
             assert callback_called.is_set()
+
+        engine.close()
+
+    @pytest.mark.skipif(not EDGE_TTS_AVAILABLE, reason="edge-tts not installed")
+    def test_loop_reused_across_utterances(self):
+        """Every utterance runs on the same background event loop."""
+        engine = TTSEngine(TTSConfig(enabled=True))
+        done = threading.Event()
+
+        with patch.object(engine, "_synthesize_and_play"):
+            engine.speak("One")
+            loop = engine._loop
+            engine.speak("Two", callback=done.set)
+            done.wait(timeout=2)
+
+        assert engine._loop is loop
+        engine.close()
+
+
+class FakeCommunicate:
+    """Stand-in for edge_tts.Communicate that yields fixed chunks."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def stream(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+class TestTTSStreaming:
+    """Tests for streaming audio into a player."""
+
+    def test_stream_audio_pipes_chunks(self, tmp_path):
+        """Audio chunks are written to the player's stdin in order and cached."""
+        engine = TTSEngine(TTSConfig(enabled=True))
+        engine._temp_dir = tmp_path
+        communicate = FakeCommunicate([
+            {"type": "audio", "data": b"abc"},
+            {"type": "WordBoundary", "offset": 0},
+            {"type": "audio", "data": b"def"},
+        ])
+        process = MagicMock()
+
+        with patch.object(engine, "_stream_command", return_value=["mpv", "-"]), \
+                patch.object(engine, "_communicate", return_value=communicate), \
+                patch("reverie.tts.subprocess.Popen", return_value=process) as mock_popen:
+            asyncio.run(engine._synthesize_and_play("Hello"))
+
+        assert mock_popen.call_args.kwargs["stdin"] == subprocess.PIPE
+        assert [c.args[0] for c in process.stdin.write.call_args_list] == [b"abc", b"def"]
+        process.stdin.close.assert_called()
+        process.wait.assert_called_once()
+        assert engine._current_process is None
+        assert engine._cache_path("Hello").read_bytes() == b"abcdef"
+
+    def test_cached_audio_skips_synthesis(self, tmp_path):
+        """Text spoken before is replayed from the cache."""
+        engine = TTSEngine(TTSConfig(enabled=True))
+        engine._temp_dir = tmp_path
+        engine._cache_path("Hello").write_bytes(b"cached")
+        process = MagicMock()
+
+        with patch.object(engine, "_stream_command", return_value=["mpv", "-"]), \
+                patch.object(engine, "_communicate") as mock_communicate, \
+                patch("reverie.tts.subprocess.Popen", return_value=process):
+            asyncio.run(engine._synthesize_and_play("Hello"))
+
+        mock_communicate.assert_not_called()
+        process.stdin.write.assert_called_once_with(b"cached")
+
+    def test_stream_command_prefers_installed_player(self):
+        """The first installed streaming player is used, or none at all."""
+        engine = TTSEngine(TTSConfig(enabled=True))
+        with patch("reverie.tts.shutil.which", return_value=None):
+            assert engine._stream_command() is None
+
+        engine = TTSEngine(TTSConfig(enabled=True))
+        with patch("reverie.tts.shutil.which", side_effect=lambda cmd: cmd == "ffplay") as mock_which:
+            assert engine._stream_command()[0] == "ffplay"
+            engine._stream_command()
+        assert mock_which.call_count == 2  # mpv, ffplay; the second call is cached
+
+    def test_file_player_resolved_once(self, tmp_path):
+        """The file player is looked up when the engine is created and its argv reused."""
+        audio_path = tmp_path / "speech.mp3"
+
+        with patch("reverie.tts.MpvPlayer.supported", return_value=False), \
+                patch("reverie.tts.find_file_player", return_value=["play", "{path}"]) as mock_find, \
+                patch("reverie.tts.subprocess.Popen") as mock_popen:
+            engine = TTSEngine(TTSConfig(enabled=True))
+            engine._play_audio(audio_path)
+            engine._play_audio(audio_path)
+
+        mock_find.assert_called_once()
+        assert mock_popen.call_args.args[0] == ["play", str(audio_path)]
+
+
+def fake_mpv_server(socket_path: Path, received: list):
+    """Answer mpv IPC commands on a socket the way an idle mpv would."""
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socket_path))
+    server.listen(1)
+
+    def serve():
+        conn, _ = server.accept()
+        with conn, conn.makefile("rb") as lines:
+            for line in lines:
+                command = json.loads(line)["command"]
+                received.append(command)
+                if command[0] == "loadfile":
+                    # A stale event from an earlier file comes first
+                    conn.sendall(b'{"event":"end-file"}\n{"event":"start-file"}\n{"event":"end-file"}\n')
+                elif command[0] == "quit":
+                    break
+        server.close()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    return thread
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+class TestMpvPlayer:
+    """Tests for the shared mpv player."""
+
+    def test_play_waits_for_its_file(self, tmp_path):
+        """play() sends loadfile and returns on that file's end-file event."""
+        socket_path = tmp_path / "mpv.sock"
+        received = []
+        threads = []
+        player = MpvPlayer(socket_path)
+
+        def start_mpv(*args, **kwargs):
+            threads.append(fake_mpv_server(socket_path, received))
+            return Mock(**{"poll.return_value": None})
+
+        with patch("reverie.tts.subprocess.Popen", side_effect=start_mpv) as mock_popen:
+            player.play(tmp_path / "a.mp3")
+            player.play(tmp_path / "b.mp3")
+            player.close()
+        threads[0].join(timeout=1)
+
+        mock_popen.assert_called_once()
+        assert received == [
+            ["loadfile", str(tmp_path / "a.mp3"), "replace"],
+            ["loadfile", str(tmp_path / "b.mp3"), "replace"],
+            ["quit"],
+        ]
+
+    def test_stopped_play_finishes_before_next_loads(self, tmp_path):
+        """A play() queued behind a stopped one gets its own end-file."""
+        socket_path = tmp_path / "mpv.sock"
+        received = []
+        first_loaded = threading.Event()
+        threads = []
+
+        def serve(server):
+            # Play the first file until stopped and the second to its end
+            conn, _ = server.accept()
+            entry = 0
+            with conn, conn.makefile("rb") as lines:
+                for line in lines:
+                    command = json.loads(line)["command"]
+                    received.append(command)
+                    if command[0] == "loadfile":
+                        entry += 1
+                        conn.sendall(b'{"event":"start-file","playlist_entry_id":%d}\n' % entry)
+                        if entry == 1:
+                            first_loaded.set()
+                        else:
+                            conn.sendall(b'{"event":"end-file","playlist_entry_id":%d}\n' % entry)
+                    elif command[0] == "stop":
+                        conn.sendall(b'{"event":"end-file","playlist_entry_id":%d}\n' % entry)
+                    elif command[0] == "quit":
+                        break
+            server.close()
+
+        def start_mpv(*args, **kwargs):
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(str(socket_path))
+            server.listen(1)
+            thread = threading.Thread(target=serve, args=(server,), daemon=True)
+            thread.start()
+            threads.append(thread)
+            return Mock(**{"poll.return_value": None})
+
+        player = MpvPlayer(socket_path)
+        with patch("reverie.tts.subprocess.Popen", side_effect=start_mpv):
+            first = threading.Thread(target=player.play, args=(tmp_path / "a.mp3",), daemon=True)
+            second = threading.Thread(target=player.play, args=(tmp_path / "b.mp3",), daemon=True)
+            first.start()
+            assert first_loaded.wait(timeout=1)
+            second.start()
+            time.sleep(0.05)
+            assert len(received) == 1
+            
+            player.stop()
+            first.join(timeout=1)
+            second.join(timeout=1)
+            alive = first.is_alive() or second.is_alive()
+            player.close()
+        threads[0].join(timeout=1)
+
+        assert not alive
+        assert received == [
+            ["loadfile", str(tmp_path / "a.mp3"), "replace"],
+            ["stop"],
+            ["loadfile", str(tmp_path / "b.mp3"), "replace"],
+            ["quit"],
+        ]
+
+    def test_engine_falls_back_when_mpv_fails(self, tmp_path):
+        """A player that can't start falls back to a process per file."""
+        audio_path = tmp_path / "speech.mp3"
+
+        with patch("reverie.tts.MpvPlayer.supported", return_value=True), \
+                patch("reverie.tts.MpvPlayer.play", side_effect=OSError), \
+                patch("reverie.tts.find_file_player", return_value=["play", "{path}"]), \
+                patch("reverie.tts.subprocess.Popen") as mock_popen:
+            engine = TTSEngine(TTSConfig(enabled=True))
+            engine._temp_dir = tmp_path
+            engine._play_audio(audio_path)
+
+        assert engine._mpv is None
+        assert mock_popen.call_args.args[0] == ["play", str(audio_path)]
+
+
+class FakeSaveCommunicate:
+    """Stand-in for edge_tts.Communicate that saves its text to a file."""
+
+    def __init__(self, text):
+        self.text = text
+
+    async def save(self, path):
+        Path(path).write_text(self.text)
+
+
+class TestSentencePipeline:
+    """Tests for sentence-by-sentence synthesis and playback."""
+
+    def test_split_sentences(self):
+        """Text splits after sentence-ending punctuation."""
+        assert split_sentences("The door creaks. Who goes there? Run!") == (
+            "The door creaks.", "Who goes there?", "Run!"
+        )
+        assert split_sentences("The door creaks. Run!") is split_sentences("The door creaks. Run!")
+
+    def test_sentences_play_in_order(self, tmp_path):
+        """Each sentence is synthesized once and played in order."""
+        engine = TTSEngine(TTSConfig(enabled=True))
+        engine._temp_dir = tmp_path
+        played = []
+
+        with patch.object(engine, "_communicate", side_effect=FakeSaveCommunicate) as mock_communicate, \
+                patch.object(engine, "_play_audio", side_effect=lambda p: played.append(p.read_text())):
+            asyncio.run(engine._play_sentences("One. Two. Three."))
+            asyncio.run(engine._play_sentences("One. Two. Three."))
+
+        assert played == ["One.", "Two.", "Three."] * 2
+        assert mock_communicate.call_count == 3
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_cache_names_are_stable(self, tmp_path):
+        """Cache files are named by content, with unique partial files."""
+        engine = TTSEngine(TTSConfig(enabled=True))
+        engine._temp_dir = tmp_path
+
+        assert engine._cache_path("Hello") == engine._cache_path("Hello")
+        assert engine._cache_path("Hello") != engine._cache_path("Goodbye")
+        engine.set_voice("en-GB-RyanNeural")
+        assert engine._cache_path("Hello").name != TTSEngine()._cache_path("Hello").name
+        assert _partial_path(tmp_path / "a.mp3") != _partial_path(tmp_path / "a.mp3")
+
+    def test_evict_cache_removes_oldest(self, tmp_path):
+        """Eviction deletes least recently used files until under the limit."""
+        for i, name in enumerate(["old", "mid", "new"]):
+            path = tmp_path / f"{name}.mp3"
+            path.write_bytes(b"x" * 10)
+            os.utime(path, (i, i))
+
+        evict_cache(tmp_path, 20)
+
+        assert sorted(p.stem for p in tmp_path.iterdir()) == ["mid", "new"]
+
+    def test_sweep_removes_abandoned_files(self, tmp_path):
+        """The startup sweep drops empty audio and old partials only."""
+        (tmp_path / "empty.mp3").write_bytes(b"")
+        (tmp_path / "good.mp3").write_bytes(b"x")
+        (tmp_path / "fresh.1.abc.tmp").write_bytes(b"x")
+        stale = tmp_path / "stale.1.abc.tmp"
+        stale.write_bytes(b"x")
+        os.utime(stale, (0, 0))
+
+        sweep_cache(tmp_path, 100)
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["fresh.1.abc.tmp", "good.mp3"]
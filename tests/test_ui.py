@@ -1,7 +1,11 @@
 """Tests for the Reverie UI components."""
 
+import threading
+from collections import deque
 import pytest
+from unittest.mock import patch
 from rich.text import Text
+from textual.widgets import RichLog
 
 from reverie.ui import (
     ReverieApp,
@@ -18,6 +22,7 @@ from reverie.ui import (
     NarrationPanel,
     StatusBar,
 )
+from reverie.ui.app import HELP_TEXT
 from reverie.character import Character, Stats, Equipment, PlayerClass, DangerLevel
 from reverie.game import GameState, Game, create_game_state
 from reverie.storage.database import Database
@@ -87,6 +92,118 @@ class TestReverieApp:
         assert "q" in binding_keys  # Quests
         assert "?" in binding_keys  # Help
 
+    def test_help_text_is_shared(self):
+        """Help text is built once at import and shared by every app."""
+        assert create_app()._get_help_text() is HELP_TEXT
+        assert "COMMANDS:" in HELP_TEXT
+    
+    async def test_narration_appends_to_log(self):
+        """Narration entries are appended to the log, separated by a blank line."""
+        app = create_app()
+        async with app.run_test() as pilot:
+            app._add_narration("You enter the hall.")
+            await pilot.pause()
+            
+            log = app.query_one("#narration-panel", RichLog)
+            assert [line.text for line in log.lines] == [
+                "Welcome to Reverie. No game loaded.", "", "You enter the hall."
+            ]
+    
+    async def test_widgets_bound_on_mount(self):
+        """Widgets used every turn are looked up once, on mount."""
+        app = create_app()
+        async with app.run_test():
+            assert app._narration is app.query_one("#narration-panel")
+            assert app._status is app.query_one("#status-bar")
+            assert app._input is app.query_one("#player-input")
+    
+    async def test_hidden_panels_skip_updates(self, sample_game):
+        """Side panels only format their contents while visible."""
+        app = create_app(sample_game)
+        async with app.run_test() as pilot:
+            with patch("reverie.game.handle_command", return_value="sheet") as mock_command:
+                app._update_character_panel()
+                mock_command.assert_not_called()
+                
+                app.action_toggle_character()
+                await pilot.pause()
+                mock_command.assert_called_once_with(sample_game, "stats")
+    
+    async def test_toggle_flips_display(self):
+        """Panel toggles flip the widget's display without class changes."""
+        app = create_app()
+        async with app.run_test() as pilot:
+            assert not app._help_panel.display
+            
+            app.action_toggle_help()
+            await pilot.pause()
+            assert app._help_panel.display
+            assert app._help_panel.region.width > 0
+            
+            app.action_toggle_help()
+            assert not app._help_panel.display
+            assert not app._help_panel.has_class("visible")
+    
+    async def test_turn_updates_batched(self, sample_game):
+        """A submitted turn redraws the narration and panels in one batch."""
+        app = create_app(sample_game)
+        async with app.run_test() as pilot:
+            batch_counts = []
+            with patch("reverie.game.process_input", return_value="You look around."), \
+                    patch.object(app, "_update_npcs_panel", side_effect=lambda: batch_counts.append(app._batch_count)):
+                await pilot.press("l", "o", "o", "k", "enter")
+                await app.workers.wait_for_complete()
+                await pilot.pause()
+            
+            assert batch_counts and batch_counts[0] > 0
+            assert app._narration.lines[-1].text == "You look around."
+    
+    async def test_turn_runs_off_ui_thread(self, sample_game):
+        """The game processes input in a worker thread, one turn at a time."""
+        app = create_app(sample_game)
+        threads = []
+        
+        def process(game, user_input):
+            threads.append(threading.current_thread())
+            assert app._turn_running
+            return "You wait."
+        
+        async with app.run_test() as pilot:
+            with patch("reverie.game.process_input", side_effect=process):
+                await pilot.press("w", "a", "i", "t", "enter")
+                await app.workers.wait_for_complete()
+                await pilot.pause()
+            
+            assert threads and threads[0] is not threading.main_thread()
+            assert not app._turn_running
+            assert app._narration.lines[-1].text == "You wait."
+    
+    async def test_typing_during_turn(self, sample_game):
+        """Keys reach the input while a turn is still running."""
+        app = create_app(sample_game)
+        release = threading.Event()
+        
+        def process(game, user_input):
+            release.wait(timeout=5)
+            return "You wait."
+        
+        async with app.run_test() as pilot:
+            with patch("reverie.game.process_input", side_effect=process) as mock_process:
+                await pilot.press("w", "a", "i", "t", "enter")
+                await pilot.press("x", "y", "enter")
+                await pilot.pause()
+                
+                assert app._turn_running
+                assert app._input.value == "xy"  # Held until the turn ends
+                
+                release.set()
+                await app.workers.wait_for_complete()
+                await pilot.pause()
+            
+            mock_process.assert_called_once()
+            assert not app._turn_running
+            assert app._narration.lines[-1].text == "You wait."
+
 
 class TestScreens:
     """Tests for screen classes."""
@@ -149,6 +266,16 @@ class TestFormatSystem:
         assert isinstance(result, Text)
         assert "Game saved." in result.plain
         assert ">>>" in result.plain
+    
+    def test_prefix_shared_safely(self):
+        """Formatting copies the shared prefix rather than extending it."""
+        first = format_system("Game saved.")
+        second = format_system("Level up!")
+        assert first.plain == ">>> Game saved."
+        assert second.plain == ">>> Level up!"
+        assert [(span.start, span.end, span.style) for span in second.spans] == [
+            (0, 4, "bold yellow"), (4, 13, "yellow")
+        ]
 
 
 class TestFormatPlayerAction:
@@ -169,7 +296,7 @@ class TestNarrationPanel:
         """Test narration panel can be created."""
         panel = NarrationPanel()
         assert panel is not None
-        assert panel._entries == []
+        assert len(panel._entries) == 0
     
     def test_add_entry_directly(self):
         """Test adding entries directly to internal list."""
@@ -182,6 +309,19 @@ class TestNarrationPanel:
         """Test that max entries is set."""
         panel = NarrationPanel()
         assert panel._max_entries == 100
+    
+    def test_oldest_entries_dropped(self):
+        """Past the limit the oldest entry leaves both the list and the display."""
+        panel = NarrationPanel()
+        panel._max_entries = 3
+        panel._entries = deque(maxlen=3)
+        with patch.object(panel, "update") as mock_update:
+            for i in range(5):
+                panel.add_narration(f"Line {i}")
+        
+        mock_update.assert_called_with(panel._combined)
+        assert [entry.plain for entry in panel._entries] == ["Line 2", "Line 3", "Line 4"]
+        assert panel._combined.plain == "Line 2\n\nLine 3\n\nLine 4"
 
 
 class TestStatusBar:
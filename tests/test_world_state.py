@@ -1,13 +1,20 @@
 """Tests for world state persistence."""
 
+import sqlite3
+import threading
+import time
+
 import pytest
 from datetime import datetime
+from unittest.mock import patch
 
 from reverie.storage.world_state import (
     WorldStateDB,
     FactionStanding,
     NPCDeath,
     WorldEvent,
+    open_world_state,
+    close_world_state,
 )
 
 
@@ -19,6 +26,200 @@ def db():
     db.close()
 
 
+class TestOpen:
+    """Tests for opening world state databases."""
+
+    def test_open_file_uses_wal(self, tmp_path):
+        """File databases use WAL journaling with synchronous=NORMAL."""
+        file_db = WorldStateDB.open(tmp_path / "world.db")
+        try:
+            assert file_db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert file_db.conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        finally:
+            file_db.close()
+
+    def test_campaign_columns_indexed(self, db):
+        """campaign_id lookups on deaths and events use an index."""
+        names = {
+            row[0] for row in db.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+        assert {"idx_npc_deaths_campaign", "idx_world_events_campaign"} <= names
+
+    def test_events_by_type_read_in_order(self, db):
+        """Filtering events by type reads the composite index without sorting."""
+        plan = db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM world_events WHERE event_type = ? "
+            "ORDER BY timestamp DESC LIMIT ?",
+            ("war", 10),
+        ).fetchall()
+        details = " ".join(row[3] for row in plan)
+        assert "idx_world_events_type_timestamp" in details
+        assert "TEMP B-TREE" not in details
+
+    def test_timestamps_load_as_datetimes(self, db):
+        """Stored timestamps come back as equal datetimes."""
+        death = NPCDeath.create("Goblin", "Cave", "Slain", "c1")
+        db.record_npc_death(death)
+        db.set_faction_standing(FactionStanding("guild", "Guild", 10))
+
+        assert db.get_npc_death("Goblin").timestamp == death.timestamp
+        assert isinstance(db.get_faction_standing("guild").updated_at, datetime)
+        assert isinstance(db.list_npc_deaths()[0].timestamp, datetime)
+
+    def test_new_database_analyzed(self, db):
+        """Schema creation runs ANALYZE so the planner has statistics."""
+        row = db.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone()
+        assert row is not None
+
+    def test_optimizes_after_interval(self, db):
+        """A commit after OPTIMIZE_INTERVAL runs PRAGMA optimize."""
+        db._last_optimize -= db.OPTIMIZE_INTERVAL
+        start = time.monotonic()
+        
+        db.record_npc_death(NPCDeath.create("Goblin", "Cave", "Slain", "c1"))
+        
+        assert db._last_optimize >= start
+
+    def test_close_twice(self, tmp_path):
+        """Closing an already closed database is harmless."""
+        file_db = WorldStateDB.open(tmp_path / "world.db")
+        file_db.close()
+        file_db.close()
+
+
+    def test_open_world_state_is_shared(self, tmp_path):
+        """open_world_state returns one instance until it is closed."""
+        path = tmp_path / "world.db"
+        first = open_world_state(path)
+        try:
+            assert open_world_state(path) is first
+        finally:
+            close_world_state()
+        
+        assert first.closed
+        reopened = open_world_state(path)
+        try:
+            assert reopened is not first
+            assert not reopened.closed
+        finally:
+            close_world_state()
+
+    def test_open_world_state_new_path_closes_old(self, tmp_path):
+        """Switching paths closes the previous shared instance."""
+        first = open_world_state(tmp_path / "a.db")
+        try:
+            second = open_world_state(tmp_path / "b.db")
+            assert first.closed
+            assert not second.closed
+        finally:
+            close_world_state()
+
+
+class TestTransaction:
+    """Tests for grouping writes with transaction()."""
+
+    def test_writes_commit_together(self, db):
+        """Writes inside the block commit once, on exit."""
+        with db.transaction():
+            db.record_npc_death(NPCDeath.create("Goblin", "Cave", "Slain", "c1"))
+            db.set_faction_standing(FactionStanding("guild", "Guild", 10))
+            assert db.conn.in_transaction
+        
+        assert not db.conn.in_transaction
+        assert db.is_npc_dead("Goblin")
+        assert db.get_faction_standing("guild") is not None
+
+    def test_error_rolls_back(self, db):
+        """An exception inside the block discards its writes."""
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.record_npc_death(NPCDeath.create("Goblin", "Cave", "Slain", "c1"))
+                raise RuntimeError("interrupted")
+        
+        assert not db.is_npc_dead("Goblin")
+
+
+class TestReaders:
+    """Tests for the file database reader pool."""
+
+    def test_reads_use_reader_connection(self, tmp_path):
+        """Committed writes are visible through pooled read-only connections."""
+        file_db = WorldStateDB.open(tmp_path / "world.db")
+        try:
+            file_db.record_npc_death(NPCDeath.create("Goblin", "Cave", "Slain", "c1"))
+            
+            assert file_db.is_npc_dead("Goblin")
+            assert len(file_db._reader_conns) == 1
+            reader = file_db._reader_conns[0]
+            assert reader.execute("PRAGMA query_only").fetchone()[0] == 1
+        finally:
+            file_db.close()
+
+    def test_transaction_reads_see_pending_writes(self, tmp_path):
+        """Reads inside transaction() see its uncommitted writes."""
+        file_db = WorldStateDB.open(tmp_path / "world.db")
+        try:
+            with file_db.transaction():
+                file_db.adjust_faction_standing("guild", "Guild", 10)
+                file_db.adjust_faction_standing("guild", "Guild", 10)
+            
+            assert file_db.get_faction_standing("guild").standing == 20
+        finally:
+            file_db.close()
+
+    def test_write_from_another_thread(self, tmp_path):
+        """Other threads write through the shared writer connection."""
+        file_db = WorldStateDB.open(tmp_path / "world.db")
+        try:
+            worker = threading.Thread(
+                target=file_db.record_npc_death,
+                args=(NPCDeath.create("Goblin", "Cave", "Slain", "c1"),),
+            )
+            worker.start()
+            worker.join()
+            
+            assert file_db.is_npc_dead("Goblin")
+        finally:
+            file_db.close()
+
+    def test_short_lived_threads_open_no_writers(self, tmp_path):
+        """Transactions from many one-off threads reuse the one writer."""
+        file_db = WorldStateDB.open(tmp_path / "world.db")
+
+        def record(i):
+            with file_db.transaction():
+                file_db.record_npc_death(NPCDeath.create(f"Goblin {i}", "Cave", "Slain", "c1"))
+                file_db.adjust_faction_standing("guild", "Guild", 1)
+
+        try:
+            with patch("sqlite3.connect", wraps=sqlite3.connect) as mock_connect:
+                workers = [threading.Thread(target=record, args=(i,)) for i in range(50)]
+                for worker in workers:
+                    worker.start()
+                for worker in workers:
+                    worker.join()
+            
+            assert mock_connect.call_count == 0
+            assert len(file_db.list_npc_deaths()) == 50
+            assert file_db.get_faction_standing("guild").standing == 50
+        finally:
+            file_db.close()
+
+    def test_close_from_another_thread(self, tmp_path):
+        """close() can run on a thread other than the one that opened it."""
+        file_db = WorldStateDB.open(tmp_path / "world.db")
+        file_db.record_npc_death(NPCDeath.create("Goblin", "Cave", "Slain", "c1"))
+        worker = threading.Thread(target=file_db.close)
+        worker.start()
+        worker.join()
+        
+        assert file_db.closed
+        with pytest.raises(sqlite3.ProgrammingError):
+            file_db.conn.execute("SELECT 1")
+
+
 class TestFactionStanding:
     """Tests for faction standing persistence."""
     
@@ -41,6 +242,14 @@ class TestFactionStanding:
         result = db.get_faction_standing("nonexistent")
         assert result is None
     
+    def test_set_faction_stamps_updated_at(self, db):
+        """Saving a standing updates its timestamp to the stored value."""
+        standing = FactionStanding("guild", "Guild", 10, updated_at=datetime(2000, 1, 1))
+        db.set_faction_standing(standing)
+        
+        assert standing.updated_at.year > 2000
+        assert db.get_faction_standing("guild").updated_at == standing.updated_at
+    
     def test_adjust_faction_creates_new(self, db):
         """Adjusting nonexistent faction creates it."""
         result = db.adjust_faction_standing("thieves_guild", "Thieves Guild", 15)
@@ -59,6 +268,15 @@ class TestFactionStanding:
         result = db.adjust_faction_standing("mages_guild", "Mages Guild", -30)
         assert result.standing == 20
     
+    def test_adjust_faction_keeps_stored_name(self, db):
+        """Adjusting returns the stored record and keeps its name."""
+        db.set_faction_standing(FactionStanding("guild", "Merchants Guild", 10))
+        
+        result = db.adjust_faction_standing("guild", "Guild", 5)
+        assert result == db.get_faction_standing("guild")
+        assert result.faction_name == "Merchants Guild"
+        assert isinstance(result.updated_at, datetime)
+    
     def test_standing_clamps_to_bounds(self, db):
         """Standing is clamped to -100 to +100."""
         db.adjust_faction_standing("test", "Test Faction", 150)
@@ -162,6 +380,11 @@ class TestWorldEvent:
         plague_events = db.list_world_events(event_type="plague")
         assert len(plague_events) == 1
     
+    def test_records_use_slots(self):
+        """World state records use slots instead of a per-instance __dict__."""
+        assert not hasattr(WorldEvent.create("war", "War", "Desc", "c1"), "__dict__")
+        assert not hasattr(NPCDeath.create("NPC", "Location", "Cause", "c1"), "__dict__")
+    
     def test_event_with_data(self, db):
         """Events can store additional data."""
         event = WorldEvent.create(
@@ -177,6 +400,16 @@ class TestWorldEvent:
         assert result.data["artifacts_found"] == 3
         assert result.data["danger_level"] == "high"
 
+    
+    def test_list_events_without_data(self, db):
+        """include_data=False leaves each event's data empty."""
+        db.record_world_event(WorldEvent.create("war", "War", "Desc", "c1", data={"fronts": 2}))
+        
+        events = db.list_world_events(include_data=False)
+        assert events[0].title == "War"
+        assert events[0].data == {}
+        assert db.list_world_events(event_type="war", include_data=False)[0].data == {}
+
 
 class TestWorldHistory:
     """Tests for world history summary."""
@@ -196,6 +429,18 @@ class TestWorldHistory:
         assert "New King Crowned" in summary
         assert "King Harold III" in summary
     
+    def test_history_summary_shows_five_latest_events(self, db):
+        """Summary lists only the five most recent events."""
+        for i in range(7):
+            event = WorldEvent.create("omen", f"Omen {i}", "Strange lights.", "c1")
+            event.timestamp = datetime(2026, 1, 1 + i)
+            db.record_world_event(event)
+        
+        summary = db.get_world_history_summary()
+        assert summary.count("Omen") == 5
+        assert "Omen 6" in summary
+        assert "Omen 1" not in summary
+    
     def test_history_summary_includes_deaths(self, db):
         """Summary includes NPC deaths."""
         db.record_npc_death(NPCDeath.create(
@@ -229,6 +474,20 @@ class TestExportImport:
         assert len(data["npc_deaths"]) == 1
         assert len(data["world_events"]) == 1
     
+    def test_export_matches_to_dict(self, db):
+        """Exported records match each record's to_dict()."""
+        standing = FactionStanding("guild", "Guild", 50)
+        death = NPCDeath.create("NPC", "Location", "Cause", "c1")
+        event = WorldEvent.create("war", "War", "Desc", "c1", data={"fronts": ["north"]})
+        db.set_faction_standing(standing)
+        db.record_npc_death(death)
+        db.record_world_event(event)
+        
+        data = db.export_all()
+        assert [FactionStanding.from_dict(f) for f in data["factions"]] == [standing]
+        assert data["npc_deaths"] == [death.to_dict()]
+        assert data["world_events"] == [event.to_dict()]
+    
     def test_import_world_state(self, db):
         """Can import world state."""
         data = {
@@ -243,3 +502,53 @@ class TestExportImport:
         faction = db.get_faction_standing("test")
         assert faction is not None
         assert faction.standing == 30
+    
+    def test_import_skips_known_deaths(self, db):
+        """Import keeps one death per NPC, including duplicates in the data."""
+        db.record_npc_death(NPCDeath.create("Aldric", "Tower", "Fell", "c1"))
+        data = {
+            "npc_deaths": [
+                NPCDeath.create("Aldric", "Road", "Bandits", "c2").to_dict(),
+                NPCDeath.create("Mira", "Docks", "Drowned", "c2").to_dict(),
+                NPCDeath.create("Mira", "Docks", "Drowned again", "c2").to_dict(),
+            ],
+            "world_events": [WorldEvent.create("war", "War", "Desc", "c2").to_dict()],
+        }
+        
+        db.import_all(data)
+        
+        assert db.get_npc_death("Aldric").cause == "Fell"
+        assert [d.npc_name for d in db.list_npc_deaths()].count("Mira") == 1
+        assert len(db.list_world_events()) == 1
+    
+    def test_reimport_skips_known_events(self, db):
+        """Importing the same export twice keeps one copy of each event."""
+        db.record_world_event(WorldEvent.create("war", "War", "Desc", "c1", data={"fronts": 2}))
+        data = db.export_all()
+        
+        db.import_all(data)
+        
+        events = db.list_world_events()
+        assert len(events) == 1
+        assert events[0].data == {"fronts": 2}
+    
+    def test_import_is_atomic(self, db):
+        """A bad record rolls back the whole import."""
+        data = {
+            "factions": [FactionStanding("guild", "Guild", 10).to_dict()],
+            "world_events": [{"id": "broken"}],
+        }
+        
+        with pytest.raises(KeyError):
+            db.import_all(data)
+        assert db.get_faction_standing("guild") is None
+    
+    def test_import_joins_outer_transaction(self, db):
+        """Inside transaction(), a failure after import_all rolls the import back too."""
+        data = {"factions": [FactionStanding("guild", "Guild", 10).to_dict()]}
+        
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.import_all(data)
+                raise RuntimeError("later step failed")
+        assert db.get_faction_standing("guild") is None